@@ -0,0 +1,47 @@
+"""add document full-text search vector
+
+Revision ID: 9c2e4f7a1b3d
+Revises: 46164b3a819e
+Create Date: 2026-10-18 10:12:41.203118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2e4f7a1b3d'
+down_revision: Union[str, Sequence[str], None] = '46164b3a819e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Stored generated column: Postgres keeps it in sync on every INSERT/UPDATE
+    op.add_column('documents', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english', coalesce(filename, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(content, '')), 'B')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index(
+        'ix_documents_search_vector',
+        'documents',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_documents_search_vector', table_name='documents', postgresql_using='gin')
+    op.drop_column('documents', 'search_vector')
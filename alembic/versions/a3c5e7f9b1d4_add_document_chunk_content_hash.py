@@ -0,0 +1,29 @@
+"""add content hash to document chunks
+
+Revision ID: a3c5e7f9b1d4
+Revises: e5f9a1c3b7d2
+Create Date: 2026-10-18 15:42:08.113527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f9b1d4'
+down_revision: Union[str, Sequence[str], None] = 'e5f9a1c3b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL for chunks ingested before re-uploads were diffed - they are re-embedded once
+    op.add_column('document_chunks', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('document_chunks', 'content_hash')
@@ -0,0 +1,42 @@
+"""add indexes for user and conversation lookups
+
+Revision ID: b7d1e3f5a902
+Revises: 9c2e4f7a1b3d
+Create Date: 2026-10-18 11:02:17.846530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d1e3f5a902'
+down_revision: Union[str, Sequence[str], None] = '9c2e4f7a1b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # list_by_user / count_by_user
+    op.create_index('ix_documents_user_id_created_at', 'documents', ['user_id', 'created_at'], unique=False)
+    # get_by_filename
+    op.create_index('ix_documents_user_id_filename', 'documents', ['user_id', 'filename'], unique=False)
+    op.create_index('ix_conversations_user_id_created_at', 'conversations', ['user_id', 'created_at'], unique=False)
+    # get_messages / get_recent_messages: filter + ORDER BY created_at straight from the index
+    op.create_index(
+        'ix_chat_messages_conversation_id_created_at',
+        'chat_messages',
+        ['conversation_id', 'created_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chat_messages_conversation_id_created_at', table_name='chat_messages')
+    op.drop_index('ix_conversations_user_id_created_at', table_name='conversations')
+    op.drop_index('ix_documents_user_id_filename', table_name='documents')
+    op.drop_index('ix_documents_user_id_created_at', table_name='documents')
@@ -0,0 +1,31 @@
+"""add running summary to conversations
+
+Revision ID: c8e2a4f6d0b3
+Revises: a3c5e7f9b1d4
+Create Date: 2026-10-18 18:05:31.402716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e2a4f6d0b3'
+down_revision: Union[str, Sequence[str], None] = 'a3c5e7f9b1d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Condensed history of every message up to summarized_until_id (NULL = nothing summarized yet)
+    op.add_column('conversations', sa.Column('summary', sa.Text(), nullable=True))
+    op.add_column('conversations', sa.Column('summarized_until_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('conversations', 'summarized_until_id')
+    op.drop_column('conversations', 'summary')
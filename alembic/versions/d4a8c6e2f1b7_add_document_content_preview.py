@@ -0,0 +1,30 @@
+"""add document content preview
+
+Revision ID: d4a8c6e2f1b7
+Revises: b7d1e3f5a902
+Create Date: 2026-10-18 12:20:45.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a8c6e2f1b7'
+down_revision: Union[str, Sequence[str], None] = 'b7d1e3f5a902'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('documents', sa.Column('content_preview', sa.String(length=200), nullable=True))
+    # Backfill existing rows (new rows get it from the repository)
+    op.execute("UPDATE documents SET content_preview = substr(content, 1, 200)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('documents', 'content_preview')
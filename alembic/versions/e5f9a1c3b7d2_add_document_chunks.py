@@ -0,0 +1,44 @@
+"""add document chunk registry
+
+Revision ID: e5f9a1c3b7d2
+Revises: d4a8c6e2f1b7
+Create Date: 2026-10-18 13:05:12.640915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f9a1c3b7d2'
+down_revision: Union[str, Sequence[str], None] = 'd4a8c6e2f1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('document_chunks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('document_id', sa.String(length=64), nullable=False),
+    sa.Column('user_id', sa.String(length=64), nullable=False),
+    sa.Column('chunk_id', sa.String(length=128), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('chunk_id')
+    )
+    op.create_index('ix_document_chunks_document_id', 'document_chunks', ['document_id'], unique=False)
+    # Compaction scans deleted / stale pending rows
+    op.create_index('ix_document_chunks_status_updated_at', 'document_chunks', ['status', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_document_chunks_status_updated_at', table_name='document_chunks')
+    op.drop_index('ix_document_chunks_document_id', table_name='document_chunks')
+    op.drop_table('document_chunks')
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List , Optional
+from typing import List , Literal , Optional
 from app.domain.entities.chat_message import MessageRole 
 
 from pydantic import BaseModel , Field , ConfigDict
@@ -37,6 +37,7 @@ class ChatMessageRequest(BaseModel):
     """For incoming chat request"""
     message:str = Field(...,min_length=1 , max_length=10000)
     conversation_id : Optional[str] = None
+    retrieval_mode : Optional[Literal["vector", "keyword", "hybrid"]] = None  # None = server default
 
 
 class ChatResponse(BaseModel):
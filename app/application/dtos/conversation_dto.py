@@ -42,6 +42,7 @@ class ConversationListResponse(BaseModel):
     conversations: List[ConversationResponse]
     total: int
     limit: int
-    offset: int
+    offset: int = 0
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to get the next page (null on the last page)")
 
 
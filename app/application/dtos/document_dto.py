@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 
 from pydantic import BaseModel , Field , ConfigDict
@@ -20,8 +20,10 @@ class DocumentResponse(BaseModel):
     @classmethod
     def from_entity(cls, document) -> "DocumentResponse":
         """Create DocumentResponse from Document entity"""
-        content = document.content or ""
-        preview = content[:200] if len(content) > 200 else content
+        preview = getattr(document, "content_preview", None)
+        if preview is None:
+            content = document.content or ""
+            preview = content[:200] if len(content) > 200 else content
         
         return cls(
             id=document.id,
@@ -38,8 +40,26 @@ class DocumentListResponse(BaseModel):
     documents : List[DocumentResponse]
     total:int
     limit : int
-    offset : int
+    offset : int = 0
+    next_cursor : Optional[str] = Field(
+        None, description="Pass as cursor to get the next page (null on the last page)"
+    )
 
 class DocumentSearchRequest(BaseModel):
     query: str = Field(..., min_length=1)
     limit: int = Field(default=10, ge=1, le=100)
+
+
+class BulkIngestionItem(BaseModel):
+    """Outcome of one file in a bulk ingestion"""
+    filename: str
+    success: bool
+    document_id: Optional[str] = None
+    chunk_count: int = 0
+    error: Optional[str] = None
+
+
+class BulkIngestionResponse(BaseModel):
+    results: List[BulkIngestionItem]
+    succeeded: int
+    failed: int
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+from app.domain.entities.embedding import Embedding
+
+
+class IAnswerCache(ABC):
+    """Interface for caching generated answers by question similarity"""
+
+    @abstractmethod
+    async def get(self, user_id: str, question_embedding: Embedding) -> Optional[str]:
+        """Answer of a similar enough earlier question from this user, or None"""
+        pass
+
+    @abstractmethod
+    async def put(
+        self,
+        user_id: str,
+        question_embedding: Embedding,
+        answer: str,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Cache an answer. generation is the value of generation(user_id) read
+        before retrieval - a stale answer (documents changed meanwhile) is dropped
+        """
+        pass
+
+    @abstractmethod
+    async def invalidate_user(self, user_id: str) -> None:
+        """Forget every answer of a user (their documents changed)"""
+        pass
+
+    @abstractmethod
+    def generation(self, user_id: str) -> int:
+        """Counter bumped on every invalidation of the user"""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring"""
+        pass
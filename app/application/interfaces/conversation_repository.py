@@ -2,6 +2,7 @@ from abc import ABC , abstractmethod
 from typing import List , Optional
 from app.domain.entities.conversation import Conversation
 from app.domain.entities.chat_message import ChatMessage
+from app.domain.pagination import Page
 
 
 class IConversationRepository(ABC):
@@ -32,6 +33,11 @@ class IConversationRepository(ABC):
         """List conversations for a user with pagination (without messages)"""
         pass
 
+    @abstractmethod
+    async def list_page_by_user(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> Page[Conversation]:
+        """List conversations for a user with keyset pagination (newest first); ValueError if limit < 1"""
+        pass
+
     @abstractmethod
     async def count_by_user(self, user_id: str) -> int:
         """Count total conversations for a user"""
@@ -42,11 +48,26 @@ class IConversationRepository(ABC):
         """Add a single message to a conversation"""
         pass
 
+    @abstractmethod
+    async def add_messages(self, conversation_id: str, messages: List[ChatMessage]) -> List[ChatMessage]:
+        """Add several messages to a conversation in one transaction (all or none)"""
+        pass
+
+    @abstractmethod
+    async def update_summary(self, conversation_id: str, summary: str, summarized_until_id: str) -> None:
+        """Store the running summary of every message up to summarized_until_id"""
+        pass
+
     @abstractmethod
     async def get_messages(self, conversation_id: str, limit: int = 100, offset: int = 0) -> List[ChatMessage]:
         """Get messages for a conversation with pagination"""
         pass
 
+    @abstractmethod
+    async def get_messages_page(self, conversation_id: str, limit: int = 100, cursor: Optional[str] = None) -> Page[ChatMessage]:
+        """Get messages for a conversation with keyset pagination (oldest first); ValueError if limit < 1"""
+        pass
+
     @abstractmethod
     async def get_recent_messages(self, conversation_id: str, limit: int = 50) -> List[ChatMessage]:
         """Get the most recent N messages from a conversation"""
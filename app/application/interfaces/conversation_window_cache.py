@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from app.domain.entities.chat_message import ChatMessage
+from app.domain.entities.conversation import ConversationWindow
+
+
+class IConversationWindowCache(ABC):
+    """Interface for caching the recent messages and summary of conversations"""
+
+    @abstractmethod
+    async def get(self, conversation_id: str) -> Optional[ConversationWindow]:
+        """Cached window of a conversation, or None when not cached"""
+        pass
+
+    @abstractmethod
+    async def put(self, conversation_id: str, window: ConversationWindow) -> None:
+        """Cache the window of a conversation loaded from the database"""
+        pass
+
+    @abstractmethod
+    async def append(self, conversation_id: str, messages: List[ChatMessage]) -> None:
+        """Add newly persisted messages to a cached window (no-op when not cached)"""
+        pass
+
+    @abstractmethod
+    async def set_summary(self, conversation_id: str, summary: str, summarized_until_id: str) -> None:
+        """Replace the summary of a cached window (no-op when not cached)"""
+        pass
+
+    @abstractmethod
+    async def invalidate(self, conversation_id: str) -> None:
+        """Forget a conversation's window"""
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring"""
+        pass
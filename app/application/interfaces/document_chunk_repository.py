@@ -0,0 +1,67 @@
+from abc import ABC , abstractmethod
+from typing import Dict, List, Optional
+
+
+class IDocumentChunkRepository(ABC):
+    """
+    Repository interface for the chunk registry - which vector ids were
+    written for which document. Chunks move pending -> active -> deleted;
+    deleted (and stale pending) chunks are reclaimed from the vector store
+    """
+
+    @abstractmethod
+    async def add_pending(self, chunks: List[Dict]) -> None:
+        """
+        Record chunk vectors about to be written for a document still being ingested
+        Items are the vector records ({"id", "metadata"} with document_id, user_id,
+        chunk_index, content_hash). Stale (deleted / pending) rows of the same ids are replaced
+        """
+        pass
+
+    @abstractmethod
+    async def activate(self, document_id: str) -> None:
+        """Mark a document's pending chunks active (the document was saved)"""
+        pass
+
+    @abstractmethod
+    async def mark_deleted(self, document_id: str) -> None:
+        """Mark every chunk of a document for deletion"""
+        pass
+
+    @abstractmethod
+    async def mark_chunks_deleted(self, chunk_ids: List[str]) -> None:
+        """Mark single chunks for deletion (they vanished from a new version of the document)"""
+        pass
+
+    @abstractmethod
+    async def discard_pending(self, document_id: str) -> List[str]:
+        """Mark only the pending chunks of a document for deletion and return their ids"""
+        pass
+
+    @abstractmethod
+    async def get_chunk_hashes(self, document_id: str) -> Dict[str, Optional[str]]:
+        """chunk id -> content hash of a document's active chunks (None if ingested without one)"""
+        pass
+
+    @abstractmethod
+    async def get_chunk_ids(self, document_id: str) -> List[str]:
+        """Vector ids of a document's chunks (any status)"""
+        pass
+
+    @abstractmethod
+    async def count_by_document(self, document_id: str) -> int:
+        """Number of chunks registered for a document"""
+        pass
+
+    @abstractmethod
+    async def list_reclaimable(self, pending_grace_seconds: float, limit: int = 1000) -> List[str]:
+        """
+        Vector ids to delete: deleted chunks, and pending chunks not updated for
+        pending_grace_seconds (measured by the database clock that wrote updated_at)
+        """
+        pass
+
+    @abstractmethod
+    async def purge(self, chunk_ids: List[str]) -> None:
+        """Forget chunks whose vectors were deleted"""
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC , abstractmethod
 from typing import List , Optional
 from app.domain.entities.document import Document
+from app.domain.pagination import Page
 
 
 class IDocumentRepositroy(ABC):
@@ -9,19 +10,29 @@ class IDocumentRepositroy(ABC):
 
     @abstractmethod
     async def save(self,document:Document) -> Document:
-        """save or update a document"""
+        """
+        save or update a document
+        id None inserts it and the returned document carries the database id;
+        otherwise the row with that id is updated (DocumentNotFoundError if missing)
+        """
         pass
 
     @abstractmethod
-    async def get_by_id(self , document_id:str)->Optional[Document]:
-        """Get document by ID"""
+    async def save_many(self, documents:List[Document]) -> List[Document]:
+        """Insert many new documents (id None) in a single transaction, returned with their ids"""
+        pass
+
+    @abstractmethod
+    async def get_by_id(self , document_id:str , load_content:bool = True)->Optional[Document]:
+        """Get document by ID (load_content=False leaves Document.content as None)"""
         pass
 
     @abstractmethod
     async def get_by_filename(
         self,
         filename:str,
-        user_id:str
+        user_id:str,
+        load_content:bool = True
     ) -> Optional[Document]:
         """Get document by filename for a specific user"""
         pass 
@@ -30,8 +41,23 @@ class IDocumentRepositroy(ABC):
     async def list_by_user(self,
                            user_id:str ,
                            limit:int = 50 ,
-                           offset:int = 0) -> List[Document]: 
-        """List documents for a user"""
+                           offset:int = 0,
+                           load_content:bool = False) -> List[Document]: 
+        """List documents for a user (metadata + content_preview unless load_content)"""
+        pass
+
+    @abstractmethod
+    async def list_page_by_user(self,
+                                user_id:str ,
+                                limit:int = 50 ,
+                                cursor:Optional[str] = None,
+                                load_content:bool = False) -> Page[Document]:
+        """List documents for a user with keyset pagination (newest first); ValueError if limit < 1"""
+        pass
+
+    @abstractmethod
+    async def list_after(self, after_id:Optional[str] = None, limit:int = 100) -> List[Document]:
+        """Documents of every user in id order (with content), starting after after_id - for batch jobs"""
         pass
 
     @abstractmethod
@@ -53,6 +79,7 @@ class IDocumentRepositroy(ABC):
     async def search_by_user(self,
                              user_id:str,
                              query:str,
-                             limit:int =10) -> List[Document]:
+                             limit:int =10,
+                             load_content:bool = False) -> List[Document]:
         """Search documents by content for a user"""
         pass
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+
+class IKeywordIndex(ABC):
+    """Interface for keyword (lexical) search over document chunks"""
+
+    @abstractmethod
+    async def add_many(self, chunks: List[Dict]) -> None:
+        """
+        Index chunks - each item is {"id": str, "metadata": Dict}, the same
+        records written to the vector store (metadata carries text, user_id, document_id)
+        """
+        pass
+
+    @abstractmethod
+    async def search(self, query: str, user_id: str, top_k: int = 5) -> List[Dict]:
+        """Best matches as {"id", "score", "metadata"}, like IvectorStore.search"""
+        pass
+
+    @abstractmethod
+    async def is_complete(self, user_id: str) -> bool:
+        """
+        Whether every indexed chunk of the user is searchable - False while an
+        in-memory index is being reloaded after a restart
+        """
+        pass
+
+    @abstractmethod
+    def start_loading(self) -> None:
+        """Mark the index incomplete: its chunks are being reloaded from the database"""
+        pass
+
+    @abstractmethod
+    def finish_loading(self) -> None:
+        """Mark the index complete again"""
+        pass
+
+    @abstractmethod
+    async def delete_document(self, document_id: str) -> None:
+        """Drop every chunk of a document"""
+        pass
+
+    @abstractmethod
+    async def delete_chunks(self, chunk_ids: List[str]) -> None:
+        """Drop single chunks; unknown ids are ignored"""
+        pass
@@ -0,0 +1,23 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+from app.core.metrics import StageTimer
+from app.domain.entities.embedding import Embedding
+
+
+class IReranker(ABC):
+    """Interface for re-ranking retrieved chunks before they reach the LLM"""
+
+    @abstractmethod
+    async def rerank(
+        self,
+        question: str,
+        question_embedding: Optional[Embedding],
+        candidates: List[Dict],
+        top_k: int,
+        timer: Optional[StageTimer] = None
+    ) -> List[Dict]:
+        """
+        Best top_k of the candidates ({"id", "score", "metadata"} and, when the
+        vector store returned it, "vector"), best first
+        """
+        pass
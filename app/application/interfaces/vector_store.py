@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import List, Dict, Optional
 from app.domain.entities.embedding import Embedding
 
 class IvectorStore(ABC):
@@ -13,14 +13,45 @@ class IvectorStore(ABC):
     ) ->None:
         pass
 
+    @abstractmethod
+    async def upsert_many(
+        self,
+        vectors:List[Dict],
+        batch_size:Optional[int] = None
+    ) -> None:
+        """
+        Bulk upsert - each item is {"id": str, "embedding": Embedding, "metadata": Dict}
+        Implementations send one request per batch instead of one per vector
+        """
+        pass
+
     @abstractmethod
     async def search(
         self , query_embedding:Embedding,
         top_k:int = 5,
-        filter:Dict={}
+        filter:Dict={},
+        include_vectors:bool = False
     ) -> List[Dict]:
+        """
+        Best matches as {"id", "score", "metadata"}
+        include_vectors adds the stored vector of every match as "vector" (float32 array)
+        """
         pass
 
     @abstractmethod
     async def delete(self , id:str) -> None:
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def delete_many(
+        self,
+        ids:List[str],
+        batch_size:Optional[int] = None
+    ) -> None:
+        """Bulk delete - one request per batch of ids; unknown ids are ignored"""
+        pass
+
+    @abstractmethod
+    async def delete_by_filter(self , filter:Dict) -> None:
+        """Delete every vector whose metadata matches a Pinecone-style filter"""
+        pass
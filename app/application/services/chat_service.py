@@ -1,8 +1,21 @@
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional
 from app.application.interfaces.llm_services import ILLMService
 from app.application.interfaces.embedding_service import IEmbeddingService
 from app.application.interfaces.vector_store import IvectorStore
+from app.application.interfaces.keyword_index import IKeywordIndex
+from app.application.interfaces.answer_cache import IAnswerCache
+from app.application.interfaces.reranker import IReranker
+from app.application.interfaces.conversation_repository import IConversationRepository
+from app.application.interfaces.conversation_window_cache import IConversationWindowCache
+from app.application.services.hybrid_retriever import HybridRetriever
+from app.application.services.query_expansion import QueryExpander
+from app.application.services.conversation_summarizer import ConversationSummarizer
+from app.application.services.context_builder import BuiltContext, ContextBuilder
 from app.domain.entities.chat_message import ChatMessage, MessageRole
+from app.domain.entities.conversation import ConversationWindow
+from app.domain.exceptions import ConversationNotFoundError, EmptyAnswerError
+from app.domain.entities.embedding import Embedding
+from app.core.metrics import LatencyRecorder, StageTimer
 
 
 class ChatService:
@@ -14,46 +27,257 @@ class ChatService:
         self,
         llm_service: ILLMService,
         embedding_service: IEmbeddingService,
-        vector_store: IvectorStore
+        vector_store: IvectorStore,
+        metrics: Optional[LatencyRecorder] = None,
+        keyword_index: Optional[IKeywordIndex] = None,
+        retrieval_mode: str = "hybrid",
+        rrf_k: int = 60,
+        answer_cache: Optional[IAnswerCache] = None,
+        context_builder: Optional[ContextBuilder] = None,
+        reranker: Optional[IReranker] = None,
+        rerank_candidates: int = 50,
+        query_expander: Optional[QueryExpander] = None,
+        fanout_timeout_seconds: float = 1.0,
+        conversation_repo: Optional[IConversationRepository] = None,
+        window_cache: Optional[IConversationWindowCache] = None,
+        history_window_messages: int = 20,
+        summarizer: Optional[ConversationSummarizer] = None
                                     ):
         self.llm_serve = llm_service
         self.embedding_service = embedding_service
         self.vector_store = vector_store
+        self.metrics = metrics
+        self.answer_cache = answer_cache
+        # Token budgets, dedup and merging of the prompt context and history
+        self.context_builder = context_builder or ContextBuilder()
+        # Multi-query retrieval: variants are searched next to the question
+        self.query_expander = query_expander
+        self.fanout_timeout_seconds = fanout_timeout_seconds
+        # Conversation-aware chat: only the recent window of history is loaded
+        self.conversation_repo = conversation_repo
+        self.window_cache = window_cache
+        self.history_window_messages = history_window_messages
+        # Older messages are condensed into a running summary in the background
+        self.summarizer = summarizer
+        # Without a keyword index every mode falls back to vector search
+        self.retriever = HybridRetriever(
+            embedding_service=embedding_service,
+            vector_store=vector_store,
+            keyword_index=keyword_index,
+            default_mode=retrieval_mode,
+            rrf_k=rrf_k,
+            reranker=reranker,
+            rerank_candidates=rerank_candidates
+        )
 
 
     async def ask_question(self, question:str , user_id:str,
-                conversation_history: List[ChatMessage] = []) ->str:
+                conversation_history: Optional[List[ChatMessage]] = None,
+                retrieval_mode: Optional[str] = None) ->str:
         """
         RAG Pipeline:
+        0. Semantic cache lookup (single-turn questions in the default retrieval mode only)
         1. Create question embedding
-        2. Search vector store
-        3. Build context
+        2. Search vector store (and/or the BM25 index, see retrieval_mode)
+        3. Build context (deduplicated, merged, within the token budget)
         4. Generate reponse with LLM
         """
-        # 1. Embed the question
-        question_embeddings = await self.embedding_service.create_embedding(question)
+        timer = StageTimer()
 
-        # 2. search vector store
-        search_results = await self.vector_store.search(query_embedding=question_embeddings,
-                                                        top_k=5,
-                                                        filter={"user_id":user_id})
-        # 3. build context form results
-        context = self._build_context(search_results)
+        # 0. A cached answer is only valid when no conversation shapes the reply and it
+        # was retrieved the same way; keyword searches never need the question embedded
+        mode = self.retriever.resolve_mode(retrieval_mode)
+        use_cache = (
+            self.answer_cache is not None
+            and not conversation_history
+            and mode == self.retriever.resolve_mode()
+            and mode != "keyword"
+        )
+        question_embedding = None
+        if use_cache:
+            generation = self.answer_cache.generation(user_id)
+            with timer.stage("embed"):
+                question_embedding = await self.embedding_service.create_embedding(question)
+            with timer.stage("cache_lookup"):
+                cached = await self.answer_cache.get(user_id, question_embedding)
+            if cached is not None:
+                self._record(timer)
+                return cached
 
+        # 1-2. embed and search
+        search_results = await self._retrieve_context(question, user_id, timer, retrieval_mode,
+                                                      question_embedding, conversation_history)
+
+        # 3. build context and trim the history to the token budget
+        built = self._build_context(search_results, conversation_history, timer)
 
         # 4. prepare messages
-        messages = conversation_history or []
+        messages = list(built.history)
         messages.append(ChatMessage(role=MessageRole.USER , content=question))
 
         # 5. Generate response
-        response = await self.llm_serve.generate_response(messages ,context=context)
+        with timer.stage("generate"):
+            response = await self.llm_serve.generate_response(messages ,context=built.context)
+        if not response or not response.strip():
+            # Nothing to cache or store (a refusal or a content filter can end the completion empty)
+            self._record(timer)
+            raise EmptyAnswerError("The language model returned an empty answer")
+
+        if use_cache:
+            await self.answer_cache.put(user_id, question_embedding, response, generation=generation)
 
+        self._record(timer)
         return response
 
-    def _build_context(self , search_results:List[Dict]) -> str:
-        """Build context from search results"""
-        context_parts = []
-        for result in search_results:
-            context_parts.append(result['metadata']['text'])
-        return "\n\n".join(context_parts)
+    async def ask_in_conversation(self, conversation_id:str, question:str, user_id:str,
+                retrieval_mode: Optional[str] = None) -> ChatMessage:
+        """
+        Answer a question inside a stored conversation:
+        1. Load the summary and the last history_window_messages messages (window cache, else the database)
+        2. Run the RAG pipeline on summary + messages not yet summarized - trimmed to the token budget
+        3. Persist the question and the answer in one transaction
+        4. Schedule a background summarization when too many messages are unsummarized
+        Returns the stored assistant message
+        """
+        if self.conversation_repo is None:
+            raise RuntimeError("ChatService was created without a conversation repository")
+
+        # 1. summary and recent messages
+        window = await self._load_window(conversation_id, user_id)
+        history = window.unsummarized_messages()
+        if window.summary:
+            history.insert(0, ChatMessage(
+                role=MessageRole.SYSTEM,
+                content=f"Summary of the earlier conversation:\n{window.summary}"
+            ))
+
+        # 2. RAG pipeline
+        question_message = ChatMessage(role=MessageRole.USER, content=question)
+        answer = await self.ask_question(question, user_id,
+                                         conversation_history=history,
+                                         retrieval_mode=retrieval_mode)
+
+        # 3. both messages or neither
+        try:
+            stored = await self.conversation_repo.add_messages(
+                conversation_id,
+                [question_message, ChatMessage(role=MessageRole.ASSISTANT, content=answer)]
+            )
+        except Exception:
+            if self.window_cache is not None:
+                await self.window_cache.invalidate(conversation_id)
+            raise
+
+        if self.window_cache is not None:
+            await self.window_cache.append(conversation_id, stored)
+
+        # 4. after the answer - the summary is used from the next turn on
+        window.messages.extend(stored)
+        if self.summarizer is not None and self.summarizer.needs_summary(window):
+            self.summarizer.schedule(conversation_id)
+        return stored[-1]
+
+    async def _load_window(self, conversation_id:str, user_id:str) -> ConversationWindow:
+        """
+        Summary and recent messages of a conversation owned by user_id
+        Another user's conversation is reported as not found, cached or not
+        """
+        window = None
+        if self.window_cache is not None:
+            window = await self.window_cache.get(conversation_id)
+
+        if window is None:
+            conversation = await self.conversation_repo.get_by_id(conversation_id, include_messages=False)
+            if conversation is None:
+                raise ConversationNotFoundError()
+            window = ConversationWindow(
+                messages=await self.conversation_repo.get_recent_messages(conversation_id,
+                                                                          limit=self.history_window_messages),
+                summary=conversation.summary,
+                summarized_until_id=conversation.summarized_until_id,
+                user_id=conversation.user_id
+            )
+            if self.window_cache is not None:
+                await self.window_cache.put(conversation_id, window)
+
+        if window.user_id != str(user_id):
+            raise ConversationNotFoundError()
+        return window
+
+    async def ask_question_stream(self, question:str , user_id:str,
+                conversation_history: Optional[List[ChatMessage]] = None,
+                retrieval_mode: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Streaming RAG pipeline - same stages as ask_question, but tokens are
+        yielded as soon as the LLM produces them instead of after the full completion.
+        Records time-to-first-token next to the per-stage latencies.
+        """
+        timer = StageTimer()
+        try:
+            search_results = await self._retrieve_context(question, user_id, timer, retrieval_mode,
+                                                          conversation_history=conversation_history)
+            built = self._build_context(search_results, conversation_history, timer)
+
+            messages = list(built.history)
+            messages.append(ChatMessage(role=MessageRole.USER , content=question))
+
+            with timer.stage("generate"):
+                async for token in self.llm_serve.generate_streaming_response(messages, context=built.context):
+                    timer.mark_first_token()
+                    yield token
+        finally:
+            # Also runs when the client disconnects mid-stream
+            self._record(timer)
+
+    async def _retrieve_context(self, question:str, user_id:str, timer:StageTimer,
+                                retrieval_mode:Optional[str] = None,
+                                question_embedding:Optional[Embedding] = None,
+                                conversation_history:Optional[List[ChatMessage]] = None) -> List[Dict]:
+        """Retrieve the user's most relevant chunks"""
+        if self.query_expander is None:
+            # embed + vector search and/or BM25 search
+            return await self.retriever.retrieve(question, user_id,
+                                                 top_k=5,
+                                                 mode=retrieval_mode,
+                                                 timer=timer,
+                                                 query_embedding=question_embedding)
+
+        # 1. query variants (history-aware rewrite, sub-questions) - bounded by its own deadline
+        with timer.stage("expand"):
+            variants = await self.query_expander.expand(question, conversation_history)
+        queries = [question] + variants
+
+        # 2. every query still missing an embedding in one batch
+        embeddings: Optional[List[Embedding]] = None
+        if (retrieval_mode or self.retriever.default_mode) != "keyword":
+            with timer.stage("embed"):
+                pending = queries if question_embedding is None else variants
+                embeddings = await self.embedding_service.create_embeddings_batch(pending) if pending else []
+            if question_embedding is not None:
+                embeddings.insert(0, question_embedding)
+
+        # 3. concurrent searches, merged and deduplicated
+        return await self.retriever.retrieve_many(queries, user_id,
+                                                  top_k=5,
+                                                  mode=retrieval_mode,
+                                                  timer=timer,
+                                                  query_embeddings=embeddings,
+                                                  timeout_seconds=self.fanout_timeout_seconds)
+
+    def _record(self, timer:StageTimer) -> None:
+        if self.metrics is not None:
+            self.metrics.record(timer.finish())
+
+    def _build_context(self , search_results:List[Dict],
+                       conversation_history:Optional[List[ChatMessage]],
+                       timer:StageTimer) -> BuiltContext:
+        """Build context from search results and trim the history, recording the tokens saved"""
+        with timer.stage("context"):
+            built = self.context_builder.build(search_results, conversation_history)
+
+        stats = built.stats
+        timer.count("context_tokens", stats.context_tokens)
+        timer.count("history_tokens", stats.history_tokens)
+        timer.count("tokens_saved", stats.tokens_saved)
+        return built
 
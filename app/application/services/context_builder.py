@@ -0,0 +1,241 @@
+import re
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import numpy as np
+
+from app.application.services.token_counter import TokenCounter
+from app.domain.entities.chat_message import ChatMessage, MessageRole
+
+
+_WORD = re.compile(r"\w+")
+_SEPARATOR = "\n\n"
+# Shorter overlaps can match by chance
+_MIN_MERGE_OVERLAP = 20
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles - the fraction of equal signature
+    positions estimates the Jaccard similarity of two texts' shingle sets
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.shingle_size = shingle_size
+        # Random affine hash functions (a * x + b, wrapping at 2**64)
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        words = _WORD.findall(text.lower())
+        k = self.shingle_size
+        shingles = {" ".join(words[i:i + k]) for i in range(max(1, len(words) - k + 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        return (hashes[:, None] * self._a + self._b).min(axis=0)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        return float(np.mean(first == second))
+
+
+@dataclass
+class ContextStats:
+    """Token accounting of one assembled prompt"""
+    chunks_retrieved: int = 0
+    duplicates_removed: int = 0
+    chunks_merged: int = 0
+    passages_dropped: int = 0
+    messages_dropped: int = 0
+    context_tokens: int = 0
+    history_tokens: int = 0
+    # What the prompt would have cost without the builder
+    raw_context_tokens: int = 0
+    raw_history_tokens: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return (
+            self.raw_context_tokens + self.raw_history_tokens
+            - self.context_tokens - self.history_tokens
+        )
+
+
+@dataclass
+class BuiltContext:
+    context: str
+    history: List[ChatMessage]
+    stats: ContextStats = field(default_factory=ContextStats)
+
+
+@dataclass
+class _Passage:
+    document_id: Optional[str]
+    start: Optional[int]
+    end: Optional[int]
+    text: str
+    rank: int
+    # Chunks a merged passage was built from
+    parts: List["_Passage"] = field(default_factory=list)
+
+
+class ContextBuilder:
+    """
+    Assembles the prompt context of a RAG request:
+    1. Drop near-duplicate chunks (MinHash over word shingles)
+    2. Merge overlapping chunks of the same document
+    3. Keep passages in rank order while they fit max_context_tokens
+    4. Keep the most recent history messages that fit max_history_tokens
+       (after a leading summary, which is always kept)
+    """
+
+    def __init__(
+        self,
+        token_counter: Optional[TokenCounter] = None,
+        max_context_tokens: int = 6000,
+        max_history_tokens: int = 2000,
+        dedup_threshold: float = 0.8,
+        minhasher: Optional[MinHasher] = None
+    ):
+        self.token_counter = token_counter or TokenCounter()
+        self.max_context_tokens = max_context_tokens
+        self.max_history_tokens = max_history_tokens
+        self.dedup_threshold = dedup_threshold
+        self.minhasher = minhasher or MinHasher()
+
+    def build(
+        self,
+        search_results: List[Dict],
+        conversation_history: Optional[List[ChatMessage]] = None
+    ) -> BuiltContext:
+        stats = ContextStats()
+        context = self.build_context(search_results, stats)
+        history = self.trim_history(conversation_history or [], stats)
+        return BuiltContext(context=context, history=history, stats=stats)
+
+    def build_context(self, search_results: List[Dict], stats: Optional[ContextStats] = None) -> str:
+        stats = stats if stats is not None else ContextStats()
+        texts = [result["metadata"]["text"] for result in search_results]
+        stats.chunks_retrieved = len(texts)
+        stats.raw_context_tokens = self.token_counter.count(_SEPARATOR.join(texts))
+
+        # 1. near-duplicates - the better ranked chunk wins
+        passages: List[_Passage] = []
+        signatures: List[np.ndarray] = []
+        for rank, result in enumerate(search_results):
+            metadata = result["metadata"]
+            signature = self.minhasher.signature(metadata["text"])
+            if any(
+                self.minhasher.similarity(signature, kept) >= self.dedup_threshold
+                for kept in signatures
+            ):
+                stats.duplicates_removed += 1
+                continue
+            signatures.append(signature)
+            passages.append(_Passage(
+                document_id=metadata.get("document_id"),
+                start=metadata.get("start"),
+                end=metadata.get("end"),
+                text=metadata["text"],
+                rank=rank
+            ))
+
+        # 2. overlapping chunks of one document
+        merged = self._merge_adjacent(passages)
+        stats.chunks_merged = len(passages) - len(merged)
+
+        # 3. token budget, best ranked first
+        parts: List[str] = []
+        used = 0
+        for passage in merged:
+            # A merged passage that does not fit is tried chunk by chunk
+            candidates = [passage]
+            if self.token_counter.count(passage.text) + used > self.max_context_tokens and passage.parts:
+                candidates = sorted(passage.parts, key=lambda part: part.rank)
+
+            for candidate in candidates:
+                tokens = self.token_counter.count(candidate.text)
+                if used + tokens > self.max_context_tokens:
+                    stats.passages_dropped += 1
+                    continue
+                parts.append(candidate.text)
+                used += tokens
+
+        context = _SEPARATOR.join(parts)
+        stats.context_tokens = self.token_counter.count(context)
+        return context
+
+    def trim_history(
+        self,
+        conversation_history: List[ChatMessage],
+        stats: Optional[ContextStats] = None
+    ) -> List[ChatMessage]:
+        """
+        Most recent messages that fit max_history_tokens, oldest first.
+        Leading system messages (a conversation summary) are always kept -
+        their tokens are reserved from the budget before the messages are trimmed
+        """
+        stats = stats if stats is not None else ContextStats()
+        counts = [self.token_counter.count_message(message) for message in conversation_history]
+        stats.raw_history_tokens = sum(counts)
+
+        pinned = 0
+        while pinned < len(conversation_history) and conversation_history[pinned].role == MessageRole.SYSTEM:
+            pinned += 1
+        used = sum(counts[:pinned])
+
+        # Walk back from the newest message; older messages only make sense
+        # together with the newer ones, so stop at the first that does not fit
+        kept = 0
+        for tokens in reversed(counts[pinned:]):
+            if used + tokens > self.max_history_tokens:
+                break
+            kept += 1
+            used += tokens
+
+        stats.messages_dropped = len(conversation_history) - pinned - kept
+        stats.history_tokens = used
+        return conversation_history[:pinned] + conversation_history[len(conversation_history) - kept:]
+
+    @staticmethod
+    def _merge_adjacent(passages: List[_Passage]) -> List[_Passage]:
+        """
+        Join chunks of a document whose character ranges overlap, when the
+        overlapping text matches. Ranges alone are not enough: a chunk reused
+        from an earlier version of the document keeps that version's offsets,
+        so touching ranges (nothing to compare) are never merged.
+        A merged passage takes the rank of its best ranked chunk
+        """
+        mergeable: Dict[str, List[_Passage]] = {}
+        result: List[_Passage] = []
+        for passage in passages:
+            if passage.document_id is None or passage.start is None or passage.end is None:
+                result.append(passage)
+            else:
+                mergeable.setdefault(passage.document_id, []).append(passage)
+
+        for document_passages in mergeable.values():
+            document_passages.sort(key=lambda passage: passage.start)
+            current = document_passages[0]
+            for passage in document_passages[1:]:
+                overlap = current.end - passage.start
+                if overlap >= _MIN_MERGE_OVERLAP and current.text.endswith(passage.text[:overlap]):
+                    current = _Passage(
+                        document_id=current.document_id,
+                        start=current.start,
+                        end=max(current.end, passage.end),
+                        text=current.text + passage.text[overlap:],
+                        rank=min(current.rank, passage.rank),
+                        parts=(current.parts or [current]) + [passage]
+                    )
+                else:
+                    result.append(current)
+                    current = passage
+            result.append(current)
+
+        result.sort(key=lambda passage: passage.rank)
+        return result
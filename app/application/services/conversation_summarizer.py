@@ -0,0 +1,120 @@
+import asyncio
+from typing import AsyncContextManager, Callable, List, Optional, Set
+from app.application.interfaces.conversation_repository import IConversationRepository
+from app.application.interfaces.conversation_window_cache import IConversationWindowCache
+from app.application.interfaces.llm_services import ILLMService
+from app.domain.entities.chat_message import ChatMessage, MessageRole
+from app.domain.entities.conversation import ConversationWindow
+
+
+_SUMMARY_PROMPT = (
+    "Update the summary of a conversation between a user and an assistant with the new messages below.\n"
+    "Keep facts, names, numbers, decisions and open questions; drop greetings and repetition.\n"
+    "Answer with the updated summary only, in at most {max_words} words.\n\n"
+    "Current summary:\n{summary}\n\n"
+    "New messages:\n{messages}"
+)
+
+
+class ConversationSummarizer:
+    """
+    Running summary of long conversations: once more than trigger_messages
+    messages are not covered by the summary, all but the keep_recent_messages
+    newest are folded into it with one LLM call.
+    Runs in the background after the answer is returned - schedule() never blocks a turn
+    """
+
+    def __init__(
+        self,
+        llm_service: ILLMService,
+        repository_factory: Callable[[], AsyncContextManager[IConversationRepository]],
+        window_cache: Optional[IConversationWindowCache] = None,
+        trigger_messages: int = 12,
+        keep_recent_messages: int = 6,
+        max_summary_words: int = 200,
+        max_batch_messages: int = 50
+    ):
+        """
+        repository_factory: opens a conversation repository with its own database
+        session (the request's session is closed once the response is sent)
+        max_batch_messages: messages read per run - in a conversation that was never
+        summarized, older messages than that are left out of the summary
+        """
+        if keep_recent_messages >= trigger_messages:
+            raise ValueError("keep_recent_messages must be smaller than trigger_messages")
+        self.llm_service = llm_service
+        self.repository_factory = repository_factory
+        self.window_cache = window_cache
+        self.trigger_messages = trigger_messages
+        self.keep_recent_messages = keep_recent_messages
+        self.max_summary_words = max_summary_words
+        self.max_batch_messages = max(max_batch_messages, trigger_messages)
+        # Conversations being summarized - at most one run per conversation
+        self._running: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Counters
+        self.runs = 0
+        self.failures = 0
+
+    def needs_summary(self, window: ConversationWindow) -> bool:
+        return len(window.unsummarized_messages()) > self.trigger_messages
+
+    def schedule(self, conversation_id: str) -> None:
+        """Summarize in the background (no-op while a run for the conversation is in progress)"""
+        if conversation_id in self._running:
+            return
+        self._running.add(conversation_id)
+        task = asyncio.create_task(self._run(conversation_id))
+        # The event loop only keeps weak references to tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def summarize(self, conversation_id: str) -> bool:
+        """Fold the older unsummarized messages into the summary; False when there was nothing to do"""
+        async with self.repository_factory() as repository:
+            conversation = await repository.get_by_id(conversation_id, include_messages=False)
+            if conversation is None:
+                return False
+            window = ConversationWindow(
+                messages=await repository.get_recent_messages(conversation_id, limit=self.max_batch_messages),
+                summary=conversation.summary,
+                summarized_until_id=conversation.summarized_until_id
+            )
+        unsummarized = window.unsummarized_messages()
+        if len(unsummarized) <= self.trigger_messages:
+            return False
+
+        # No database session is held during the LLM call
+        folded = unsummarized[:-self.keep_recent_messages]
+        summary = await self._condense(window.summary, folded)
+        if not summary:
+            return False
+        async with self.repository_factory() as repository:
+            await repository.update_summary(conversation_id, summary, folded[-1].id)
+
+        if self.window_cache is not None:
+            await self.window_cache.set_summary(conversation_id, summary, folded[-1].id)
+        self.runs += 1
+        return True
+
+    async def _run(self, conversation_id: str) -> None:
+        try:
+            await self.summarize(conversation_id)
+        except Exception as e:
+            self.failures += 1
+            print(f"Warning: summarizing conversation {conversation_id} failed: {e}")
+        finally:
+            self._running.discard(conversation_id)
+
+    async def _condense(self, summary: Optional[str], messages: List[ChatMessage]) -> str:
+        prompt = _SUMMARY_PROMPT.format(
+            max_words=self.max_summary_words,
+            summary=summary or "(none)",
+            messages="\n".join(f"{message.role.value}: {message.content}" for message in messages)
+        )
+        response = await self.llm_service.generate_response(
+            [ChatMessage(role=MessageRole.USER, content=prompt)],
+            context=""
+        )
+        return (response or "").strip()
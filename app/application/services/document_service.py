@@ -1,25 +1,74 @@
-from typing import List , Optional
-import uuid 
-from datetime import datetime
-import PyPDF2
+from typing import AsyncIterator, Dict, List , Optional, Tuple
+import asyncio
 import io
-import docx
+import os
+import zipfile
+from concurrent.futures import Executor
+from datetime import datetime
 from app.application.interfaces.document_repository import IDocumentRepositroy
 from app.application.interfaces.embedding_service import IEmbeddingService
 from app.application.interfaces.vector_store import IvectorStore
 from app.application.interfaces.storage_service import IStorageService
+from app.application.interfaces.keyword_index import IKeywordIndex
+from app.application.interfaces.answer_cache import IAnswerCache
+from app.application.interfaces.document_chunk_repository import IDocumentChunkRepository
 from app.domain.entities.document import Document
+from app.domain.chunking import ChunkingStrategy, RecursiveChunker, TextChunk
 from app.domain.exceptions import InvalidDocumentFormatError , DocumentNotFoundError
+from app.domain.pagination import Page
+from app.application.services import text_extraction
+from app.application.services.ingestion_pipeline import IngestionPipeline, chunk_vector_record
+from app.application.dtos.document_dto import BulkIngestionItem, BulkIngestionResponse
+
+def unique_chunks(chunker:ChunkingStrategy , text:str) -> List[TextChunk]:
+    """
+    Chunks of a text without repeats - repeated text maps to the same
+    (content addressed) vector id. Module level so it can run in a process pool
+    """
+    seen = set()
+    chunks = []
+    for chunk in chunker.iter_chunks(text):
+        if chunk.content_hash not in seen:
+            seen.add(chunk.content_hash)
+            chunks.append(chunk)
+    return chunks
+
 
 class DocumentService:
     def __init__(self  ,document_repo : IDocumentRepositroy,
                  embedding_service:IEmbeddingService,
                  vector_store : IvectorStore,
-                 storage_service:IStorageService):
+                 storage_service:IStorageService,
+                 chunker:Optional[ChunkingStrategy] = None,
+                 extraction_executor:Optional[Executor] = None,
+                 pdf_pages_per_task:int = 16,
+                 embed_batch_size:int = 64,
+                 ingestion_queue_size:int = 4,
+                 embed_concurrency:int = 2,
+                 keyword_index:Optional[IKeywordIndex] = None,
+                 answer_cache:Optional[IAnswerCache] = None,
+                 chunk_registry:Optional[IDocumentChunkRepository] = None,
+                 vector_delete_batch_size:int = 1000):
         self.document_repo = document_repo
         self.embedding_service = embedding_service
         self.vector_store = vector_store
         self.storage_service = storage_service
+        self.chunker = chunker or RecursiveChunker(chunk_size=1000, chunk_overlap=200)
+        # Text extraction is CPU bound - run it in a (process) pool, not on the event loop.
+        # None falls back to the loop's default thread pool
+        self.extraction_executor = extraction_executor
+        self.pdf_pages_per_task = pdf_pages_per_task
+        # Backpressure settings for the streaming ingestion pipeline
+        self.embed_batch_size = embed_batch_size
+        self.ingestion_queue_size = ingestion_queue_size
+        self.embed_concurrency = embed_concurrency
+        # BM25 chunk index for hybrid retrieval, fed with the same chunks as the vector store
+        self.keyword_index = keyword_index
+        # Cached chat answers of a user go stale whenever their documents change
+        self.answer_cache = answer_cache
+        # Which vector ids belong to which document - needed to delete them again
+        self.chunk_registry = chunk_registry
+        self.vector_delete_batch_size = vector_delete_batch_size
 
     async def process_document(
             self,
@@ -29,68 +78,272 @@ class DocumentService:
     ) -> Document:
         """
         Complete document processing pipeline:
+        0. Insert the document row - its database id keys vectors, chunk registry and storage
         1. Extract text
-        2. Create document entity
-        3. Chunk text
-        4. Generate embeddings
-        5. Store in vector database
+        2. Chunk text
+        3. Generate embeddings
+        4. Store in vector database
+        5. Create document entity
         6. Store original file
         7. Save metadata to database
+        8. Drop chunks that vanished from a re-uploaded document
+
+        Steps 1-4 run as a streaming pipeline: pages are chunked as soon as
+        they are extracted and embedded/upserted batch by batch.
+        Re-uploading a filename updates that document (same id): only chunks
+        whose text changed are embedded, the rest keep their vectors
         """
-        
-        # 1. Extract text
-        text_content = await self._extract_text(content,filename)
+        existing = await self.document_repo.get_by_filename(filename, user_id, load_content=False)
+        created_at = existing.created_at if existing else datetime.utcnow()
 
-        if not text_content.strip():
-            raise InvalidDocumentFormatError("Document is empty or could not be read")
-        
-        # 2. Create document entity
-        document = Document(
-            id = str(uuid.uuid4()),
-            filename=filename,
-            content = text_content,
-            created_at=datetime.utcnow(),
-            user_id=user_id
-        )
+        # 0. New documents get their id from the database up front
+        if existing is not None:
+            document_id = existing.id
+        else:
+            reserved = await self.document_repo.save(Document(
+                id=None,
+                filename=filename,
+                content="",
+                created_at=created_at,
+                user_id=user_id
+            ))
+            document_id = reserved.id
+
+        # chunk id -> content hash of the current version
+        previous: Dict[str, Optional[str]] = {}
+        if existing is not None:
+            if self.chunk_registry is not None:
+                previous = await self.chunk_registry.get_chunk_hashes(document_id)
+            else:
+                # Nothing records which vectors the old version has - re-index from scratch
+                await self._delete_vectors(document_id)
+                if self.keyword_index is not None:
+                    await self.keyword_index.delete_document(document_id)
+
+        storage_key = self._storage_key(user_id, document_id, filename)
+        uploaded = False
+        try:
+            # 1-4. extract -> chunk -> embed -> upsert, overlapped
+            result = await self._build_pipeline().run(
+                self.iter_text(content, filename),
+                document_id=document_id,
+                user_id=user_id,
+                filename=filename,
+                known_hashes={content_hash for content_hash in previous.values() if content_hash}
+            )
+            text_content = result.text
+
+            if not text_content.strip():
+                raise InvalidDocumentFormatError("Document is empty or could not be read")
+            
+            # 5. Create document entity
+            document = Document(
+                id = document_id,
+                filename=filename,
+                content = text_content,
+                created_at=created_at,
+                user_id=user_id
+            )
 
-        # 3. split into chunks (business logic in entity) - Need more optimization later
-        chunks = document.split_into_chunks(chunk_size=1000)
+            # 6. Store original file in object storage
+            await self.storage_service.upload(
+                key = storage_key,
+                content=content
+            )
+            uploaded = existing is None
+
+            # 7. Save document metadata to database
+            await self.document_repo.save(document)
+        except Exception:
+            # Vectors already written belong to no document - leave them to compaction
+            await self._discard_chunks(document_id, keep_active=existing is not None)
+            if existing is None:
+                await self._discard_document(document_id, storage_key if uploaded else None)
+            raise
+
+        if self.chunk_registry is not None:
+            await self.chunk_registry.activate(document_id)
+
+        # 8. Chunks of the previous version that are not in the new one
+        vanished = [
+            chunk_id for chunk_id, content_hash in previous.items()
+            if content_hash not in result.chunk_hashes
+        ]
+        if vanished:
+            await self._delete_chunks(vanished)
+
+        await self._invalidate_answers(user_id)
 
-        # 4. create embeddings for all chunks
-        embeddings = await self.embedding_service.create_embeddings_batch(chunks)
+        return document
+    
 
-        # 5. Store chunks with embeddings in vector database
-        for i , (chunk , embedding) in enumerate(zip(chunks , embeddings)):
-            await self.vector_store.upsert(
-                id=f"{document.id}_chunk_{i}",
-                embedding=embedding,
-                metadata={
-                    "document_id":document.id,
-                    "chunk_index" : i ,
-                    "text" : chunk,
-                    "user_id" :user_id,
-                    "filename":filename
+    async def process_documents_bulk(
+            self,
+            files:List[Tuple[str, bytes]],
+            user_id : str
+    ) -> BulkIngestionResponse:
+        """
+        Ingest many (filename, content) files at once:
+        1. Extract text of every file concurrently
+        2. Insert all document rows in one transaction - the database ids key
+           vectors, chunk registry and storage
+        3. Chunk every document (in the extraction executor)
+        4. Embed chunks of all documents together in full batches
+        5. Bulk-write vectors batch by batch
+        6. Store original files
+        Failures are reported per file instead of aborting the whole upload;
+        a failed document's row, stored file and chunks are removed again
+        """
+        errors: Dict[int, str] = {}
 
-                }
+        # 1. Extract text
+        texts = await asyncio.gather(
+            *(self._extract_text(content, filename) for filename, content in files),
+            return_exceptions=True
+        )
 
+        documents: Dict[int, Document] = {}
+        for i, ((filename, _), text) in enumerate(zip(files, texts)):
+            if isinstance(text, Exception):
+                errors[i] = str(text)
+            elif not text.strip():
+                errors[i] = "Document is empty or could not be read"
+            else:
+                documents[i] = Document(
+                    id = None,
+                    filename=filename,
+                    content = text,
+                    created_at=datetime.utcnow(),
+                    user_id=user_id
+                )
+
+        # 2. Save all document rows in one transaction
+        if documents:
+            try:
+                saved = await self.document_repo.save_many(list(documents.values()))
+            except Exception as e:
+                for i in documents:
+                    errors[i] = f"Could not save document: {e}"
+                documents = {}
+            else:
+                documents = dict(zip(documents, saved))
+
+        # 3. Chunk - CPU bound, one executor task per document
+        loop = asyncio.get_running_loop()
+        chunked = await asyncio.gather(*(
+            loop.run_in_executor(self.extraction_executor, unique_chunks, self.chunker, document.content)
+            for document in documents.values()
+        ))
+
+        # Batches mix chunks from different documents so every embedding
+        # request (except the last) is full
+        chunk_counts: Dict[int, int] = {}
+        batches: List[List[Tuple[int, TextChunk]]] = [[]]
+        for i, chunks in zip(documents, chunked):
+            chunk_counts[i] = len(chunks)
+            for chunk in chunks:
+                if len(batches[-1]) == self.embed_batch_size:
+                    batches.append([])
+                batches[-1].append((i, chunk))
+
+        # Register every chunk before any vector is written (one INSERT)
+        if self.chunk_registry is not None:
+            await self.chunk_registry.add_pending([
+                chunk_vector_record(chunk, None, documents[i].id, user_id, documents[i].filename)
+                for batch in batches for i, chunk in batch
+            ])
+
+        # 4-5. Embed and write vectors, embed_concurrency batches at a time
+        semaphore = asyncio.Semaphore(self.embed_concurrency)
+
+        async def write_batch(batch: List[Tuple[int, TextChunk]]) -> None:
+            async with semaphore:
+                try:
+                    embeddings = await self.embedding_service.create_embeddings_batch(
+                        [chunk.text for _, chunk in batch]
+                    )
+                    records = [
+                        chunk_vector_record(chunk, embedding, documents[i].id, user_id, documents[i].filename)
+                        for (i, chunk), embedding in zip(batch, embeddings)
+                    ]
+                    await self.vector_store.upsert_many(records)
+                    if self.keyword_index is not None:
+                        await self.keyword_index.add_many(records)
+                except Exception as e:
+                    for i, _ in batch:
+                        errors.setdefault(i, f"Could not index document: {e}")
+
+        await asyncio.gather(*(write_batch(batch) for batch in batches if batch))
+
+        # 6. Store original files
+        ready = [i for i in documents if i not in errors]
+        uploads = await asyncio.gather(
+            *(
+                self.storage_service.upload(
+                    key=self._storage_key(user_id, documents[i].id, documents[i].filename),
+                    content=files[i][1]
+                )
+                for i in ready
+            ),
+            return_exceptions=True
+        )
+        uploaded = set()
+        for i, upload in zip(ready, uploads):
+            if isinstance(upload, Exception):
+                errors[i] = f"Could not store file: {upload}"
+            else:
+                uploaded.add(i)
+
+        # Activate the chunks of complete documents, remove everything of the rest
+        for i, document in documents.items():
+            if i in errors:
+                await self._discard_chunks(document.id)
+                storage_key = self._storage_key(user_id, document.id, document.filename)
+                await self._discard_document(document.id, storage_key if i in uploaded else None)
+            elif self.chunk_registry is not None:
+                await self.chunk_registry.activate(document.id)
+        if any(i not in errors for i in documents):
+            await self._invalidate_answers(user_id)
+
+        results = [
+            BulkIngestionItem(
+                filename=filename,
+                success=i not in errors,
+                document_id=documents[i].id if i not in errors else None,
+                chunk_count=chunk_counts.get(i, 0) if i not in errors else 0,
+                error=errors.get(i)
             )
-
-        # 6. Store original file in object storage
-        storage_key = f"documents/{user_id}/{document.id}/{filename}"
-        await self.storage_service.upload(
-            key = storage_key,
-            content=content
+            for i, (filename, _) in enumerate(files)
+        ]
+        return BulkIngestionResponse(
+            results=results,
+            succeeded=sum(1 for item in results if item.success),
+            failed=sum(1 for item in results if not item.success)
         )
 
-        # 7. Save document metadata to database
-        await self.document_repo.save(document)
-
-        return document
-    
-
-    async def get_document(self,document_id :str , user_id:str) -> Document:
+    async def process_archive(self , archive:bytes , user_id:str) -> BulkIngestionResponse:
+        """Bulk-ingest every file inside a zip archive"""
+        loop = asyncio.get_running_loop()
+        try:
+            files = await loop.run_in_executor(None, self._read_archive, archive)
+        except zipfile.BadZipFile as e:
+            raise InvalidDocumentFormatError(f"Could not read archive: {str(e)}")
+
+        return await self.process_documents_bulk(files, user_id)
+
+    @staticmethod
+    def _read_archive(archive:bytes) -> List[Tuple[str, bytes]]:
+        """(filename, content) for every regular file in a zip"""
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            return [
+                (os.path.basename(info.filename), zip_file.read(info))
+                for info in zip_file.infolist()
+                if not info.is_dir() and not info.filename.startswith("__MACOSX/")
+            ]
+
+    async def get_document(self,document_id :str , user_id:str , load_content:bool = True) -> Document:
         """Get a document by ID"""
-        document = await self.document_repo.get_by_id(document_id)
+        document = await self.document_repo.get_by_id(document_id, load_content=load_content)
 
         if not document :
             raise DocumentNotFoundError(f"Document {document_id} not found")
@@ -108,6 +361,14 @@ class DocumentService:
             limit=limit ,
             offset=offset
         )
+
+    async def list_documents_page(self , user_id:str , limit:int = 50 , cursor:Optional[str] = None) -> Page[Document]:
+        """List user's documents with keyset pagination - deep pages cost the same as the first"""
+        return await self.document_repo.list_page_by_user(
+            user_id=user_id,
+            limit=limit,
+            cursor=cursor
+        )
     
     async def search_documents(
             self, user_id:str , query:str , limit:int = 10
@@ -126,41 +387,159 @@ class DocumentService:
         3. Delete from database
         """
 
-        document = await self.get_document(document_id , user_id)
+        document = await self.get_document(document_id , user_id , load_content=False)
 
         # 1. Delete from vector store
         try:
-            # Delete vector embeddings
-            pass
+            await self._delete_vectors(document_id)
         except Exception as e:
+            # Chunks stay marked deleted in the registry - compaction retries
             print(f"Waring: Could not delete vectors for {document_id}: {e}")
 
+        if self.keyword_index is not None:
+            await self.keyword_index.delete_document(document_id)
+
         # 2. Delete from object storage
-        storage_key = f"documents/{user_id}/{document_id}/{document.filename}"
         try:
-            await self.storage_service.delete(key=storage_key)
+            await self.storage_service.delete(key=self._storage_key(user_id, document_id, document.filename))
         except Exception as e :
             print("Warning : could not delete file from storage")
 
         # 3. Delete from database
         await self.document_repo.delete(document_id)
+        await self._invalidate_answers(user_id)
 
     async def get_document_count(self , user_id :str) -> int:
         """Get total document count for user"""
         return await self.document_repo.count_by_user(user_id)
     
 
+    async def _delete_vectors(self , document_id:str) -> None:
+        """Delete a document's vectors by the ids in the chunk registry"""
+        if self.chunk_registry is None:
+            await self._delete_untracked_vectors(document_id)
+            return
+
+        await self.chunk_registry.mark_deleted(document_id)
+        chunk_ids = await self.chunk_registry.get_chunk_ids(document_id)
+        if not chunk_ids:
+            # Ingested before the registry existed
+            await self._delete_untracked_vectors(document_id)
+            return
+
+        await self.vector_store.delete_many(chunk_ids, batch_size=self.vector_delete_batch_size)
+        await self.chunk_registry.purge(chunk_ids)
+
+    async def _delete_untracked_vectors(self , document_id:str) -> None:
+        """
+        Delete the vectors of a document the chunk registry has no ids for
+        Not every store deletes by metadata filter (Pinecone serverless) - then the
+        content addressed ids are derived again from the stored text
+        """
+        try:
+            await self.vector_store.delete_by_filter({"document_id": document_id})
+            return
+        except Exception:
+            pass
+
+        document = await self.document_repo.get_by_id(document_id)
+        if document is None or not document.content:
+            return
+        loop = asyncio.get_running_loop()
+        chunks = await loop.run_in_executor(self.extraction_executor, unique_chunks, self.chunker, document.content)
+        chunk_ids = [
+            chunk_vector_record(chunk, None, document_id, document.user_id, document.filename)["id"]
+            for chunk in chunks
+        ]
+        await self.vector_store.delete_many(chunk_ids, batch_size=self.vector_delete_batch_size)
+
+    async def _delete_chunks(self , chunk_ids:List[str]) -> None:
+        """Delete single chunks of a document that is kept"""
+        if self.keyword_index is not None:
+            await self.keyword_index.delete_chunks(chunk_ids)
+        await self.chunk_registry.mark_chunks_deleted(chunk_ids)
+        try:
+            await self.vector_store.delete_many(chunk_ids, batch_size=self.vector_delete_batch_size)
+        except Exception as e:
+            # Still marked deleted in the registry - compaction retries
+            print(f"Warning: Could not delete {len(chunk_ids)} vanished chunks: {e}")
+            return
+        await self.chunk_registry.purge(chunk_ids)
+
+    async def _discard_chunks(self , document_id:str , keep_active:bool = False) -> None:
+        """
+        Mark the chunks of a failed ingestion for the compaction job
+        keep_active: the document already existed - only this run's (pending) chunks are discarded
+        """
+        if self.chunk_registry is None:
+            if self.keyword_index is not None:
+                await self.keyword_index.delete_document(document_id)
+            return
+        if not keep_active and self.keyword_index is not None:
+            await self.keyword_index.delete_document(document_id)
+        try:
+            if keep_active:
+                chunk_ids = await self.chunk_registry.discard_pending(document_id)
+                if self.keyword_index is not None:
+                    await self.keyword_index.delete_chunks(chunk_ids)
+            else:
+                await self.chunk_registry.mark_deleted(document_id)
+        except Exception as e:
+            # Still pending - reclaimed once the grace period is over
+            print(f"Warning: Could not mark chunks of {document_id} for deletion: {e}")
+
+    async def _discard_document(self , document_id:str , storage_key:Optional[str] = None) -> None:
+        """Remove the row (and stored file) of a new document whose ingestion failed"""
+        if storage_key is not None:
+            try:
+                await self.storage_service.delete(key=storage_key)
+            except Exception as e:
+                print(f"Warning: Could not delete {storage_key} from storage: {e}")
+        try:
+            await self.document_repo.delete(document_id)
+        except Exception as e:
+            print(f"Warning: Could not delete document {document_id}: {e}")
+
+    @staticmethod
+    def _storage_key(user_id:str , document_id:str , filename:str) -> str:
+        return f"documents/{user_id}/{document_id}/{filename}"
+
+    async def _invalidate_answers(self , user_id:str) -> None:
+        if self.answer_cache is not None:
+            await self.answer_cache.invalidate_user(user_id)
+
+    def _build_pipeline(self) -> IngestionPipeline:
+        return IngestionPipeline(
+            embedding_service=self.embedding_service,
+            vector_store=self.vector_store,
+            chunker=self.chunker,
+            embed_batch_size=self.embed_batch_size,
+            queue_size=self.ingestion_queue_size,
+            embed_concurrency=self.embed_concurrency,
+            keyword_index=self.keyword_index,
+            chunk_registry=self.chunk_registry
+        )
+
     async def _extract_text(self , content:bytes , filename:str) ->str:
         
         """Extract text from different file format"""
+        parts = [part async for part in self.iter_text(content, filename)]
+        return "".join(parts)
+
+    async def iter_text(self , content:bytes , filename:str) -> AsyncIterator[str]:
+        """
+        Generator mode: yield the text incrementally (page ranges for PDFs)
+        so chunking and embedding can start before the whole file is parsed
+        """
         file_extention = filename.split('.')[-1].lower()
 
         if file_extention == "pdf":
-            return await self._extract_pdf_text(content)
+            async for part in self._iter_pdf_text(content):
+                yield part
         elif file_extention == "docx":
-            return await self._extract_docx_text(content)
+            yield await self._extract_docx_text(content)
         elif file_extention in ["txt" , "md"] :
-            return content.decode('utf-8')
+            yield content.decode('utf-8')
         else:
             raise InvalidDocumentFormatError(
                 f"Unsupported file format:{file_extention}"
@@ -168,44 +547,51 @@ class DocumentService:
 
     async def _extract_pdf_text(self , content:bytes) ->str:
         """Extract text from pdf"""
-        try:
-            pdf_file = io.BytesIO(content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+        parts = [part async for part in self._iter_pdf_text(content)]
+        return "".join(parts)
 
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-
-            return text
+    async def _iter_pdf_text(self , content:bytes) -> AsyncIterator[str]:
+        """
+        Extract a PDF in page ranges of pdf_pages_per_task.
+        Every range is submitted up front so large PDFs are parsed in parallel,
+        and results are yielded in page order as soon as each range is ready
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            page_count = await loop.run_in_executor(
+                self.extraction_executor, text_extraction.pdf_page_count, content
+            )
+            tasks = [
+                loop.run_in_executor(
+                    self.extraction_executor,
+                    text_extraction.extract_pdf_pages,
+                    content,
+                    start,
+                    min(start + self.pdf_pages_per_task, page_count)
+                )
+                for start in range(0, page_count, self.pdf_pages_per_task)
+            ]
         except Exception as e :
             raise InvalidDocumentFormatError(f"Could not read PDF: {str(e)}")
 
+        try:
+            for task in tasks:
+                try:
+                    text = await task
+                except Exception as e :
+                    raise InvalidDocumentFormatError(f"Could not read PDF: {str(e)}")
+                yield text
+        finally:
+            # Consumer stopped early or a range failed - drop the remaining work
+            for task in tasks:
+                task.cancel()
+
     async def _extract_docx_text(self, content: bytes) -> str:
         """Extract text from DOCX"""
+        loop = asyncio.get_running_loop()
         try:
-            docx_file = io.BytesIO(content)
-            doc = docx.Document(docx_file)
-
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-
-            return text
+            return await loop.run_in_executor(
+                self.extraction_executor, text_extraction.extract_docx_text, content
+            )
         except Exception as e:
             raise InvalidDocumentFormatError(f"Could not read DOCX: {str(e)}")
-
-
-
-        
-
-        
-        
-
-
-        
-
-
-        
-
-
-
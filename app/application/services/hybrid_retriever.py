@@ -0,0 +1,232 @@
+import asyncio
+from typing import Dict, List, Optional
+from app.application.interfaces.embedding_service import IEmbeddingService
+from app.application.interfaces.keyword_index import IKeywordIndex
+from app.application.interfaces.reranker import IReranker
+from app.application.interfaces.vector_store import IvectorStore
+from app.core.metrics import StageTimer
+from app.domain.entities.embedding import Embedding
+
+
+RETRIEVAL_MODES = ("vector", "keyword", "hybrid")
+
+
+def reciprocal_rank_fusion(result_lists: List[List[Dict]], k: int = 60, top_k: int = 5) -> List[Dict]:
+    """
+    Merge ranked result lists: score(d) = sum over lists of 1 / (k + rank(d))
+    Only ranks matter, so BM25 and cosine scores never need to be normalised
+    """
+    scores: Dict[str, float] = {}
+    results: Dict[str, Dict] = {}
+    for ranked in result_lists:
+        for rank, result in enumerate(ranked, start=1):
+            scores[result["id"]] = scores.get(result["id"], 0.0) + 1.0 / (k + rank)
+            results.setdefault(result["id"], result)
+
+    fused = sorted(scores, key=scores.get, reverse=True)[:top_k]
+    return [{**results[result_id], "score": scores[result_id]} for result_id in fused]
+
+
+class HybridRetriever:
+    """
+    Chunk retrieval for the RAG pipeline
+    - vector : embedding similarity only
+    - keyword: BM25 only (exact terms - IDs, error codes, names)
+    - hybrid : both searches run concurrently, fused with reciprocal rank fusion
+    With a reranker, rerank_candidates chunks are retrieved and the reranker
+    picks the top_k of them
+    """
+
+    def __init__(
+        self,
+        embedding_service: IEmbeddingService,
+        vector_store: IvectorStore,
+        keyword_index: Optional[IKeywordIndex] = None,
+        default_mode: str = "hybrid",
+        rrf_k: int = 60,
+        candidate_multiplier: int = 4,
+        reranker: Optional[IReranker] = None,
+        rerank_candidates: int = 50
+    ):
+        if default_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {default_mode}")
+        self.embedding_service = embedding_service
+        self.vector_store = vector_store
+        self.keyword_index = keyword_index
+        self.default_mode = default_mode
+        self.rrf_k = rrf_k
+        # Each side fetches more than top_k so fusion has candidates to re-rank
+        self.candidate_multiplier = candidate_multiplier
+        self.reranker = reranker
+        self.rerank_candidates = rerank_candidates
+
+    async def retrieve(
+        self,
+        question: str,
+        user_id: str,
+        top_k: int = 5,
+        mode: Optional[str] = None,
+        timer: Optional[StageTimer] = None,
+        query_embedding: Optional[Embedding] = None
+    ) -> List[Dict]:
+        """
+        Top chunks for a question as {"id", "score", "metadata"}
+        Pass query_embedding when the question was already embedded
+        """
+        mode = self.resolve_mode(mode)
+        mode = await self._available_mode(mode, user_id)
+        timer = timer or StageTimer()
+
+        if self.reranker is None:
+            return await self._search(question, user_id, top_k, mode, timer, query_embedding)
+
+        # The reranker needs the question embedding too - embed it once here
+        if query_embedding is None and mode != "keyword":
+            with timer.stage("embed"):
+                query_embedding = await self.embedding_service.create_embedding(question)
+
+        candidates = await self._search(question, user_id, max(top_k, self.rerank_candidates),
+                                        mode, timer, query_embedding, include_vectors=True)
+        return await self._rerank(question, query_embedding, candidates, top_k, timer)
+
+    async def retrieve_many(
+        self,
+        queries: List[str],
+        user_id: str,
+        top_k: int = 5,
+        mode: Optional[str] = None,
+        timer: Optional[StageTimer] = None,
+        query_embeddings: Optional[List[Embedding]] = None,
+        timeout_seconds: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Fan-out retrieval: the searches of all queries run concurrently and
+        their hits are fused with reciprocal rank fusion (deduplicated by id)
+        queries[0] is the original question - it is always waited for and is
+        what the reranker scores against. The other queries are dropped when
+        they have not finished after timeout_seconds
+        Pass query_embeddings (one per query) to skip embedding here
+        """
+        mode = self.resolve_mode(mode)
+        mode = await self._available_mode(mode, user_id)
+        timer = timer or StageTimer()
+        if query_embeddings is None and mode != "keyword":
+            with timer.stage("embed"):
+                query_embeddings = await self.embedding_service.create_embeddings_batch(queries)
+        embeddings = query_embeddings or [None] * len(queries)
+
+        include_vectors = self.reranker is not None
+        per_query = max(top_k, self.rerank_candidates) if include_vectors else top_k * self.candidate_multiplier
+        # Only the original query's stages go to the request timer - the
+        # concurrent variants would otherwise add up to more than wall time
+        tasks = [
+            asyncio.create_task(self._search(query, user_id, per_query, mode,
+                                             timer if i == 0 else StageTimer(),
+                                             embedding, include_vectors))
+            for i, (query, embedding) in enumerate(zip(queries, embeddings))
+        ]
+
+        with timer.stage("fanout"):
+            done, _ = await asyncio.wait(tasks, timeout=timeout_seconds)
+            for task in tasks[1:]:
+                if task not in done:
+                    task.cancel()
+            result_lists = [await tasks[0]]
+
+        timed_out = 0
+        for task in tasks[1:]:
+            if task not in done:
+                timed_out += 1
+            elif task.exception() is not None:
+                print(f"Warning: query variant search failed: {task.exception()}")
+            else:
+                result_lists.append(task.result())
+        timer.count("queries", len(result_lists))
+        timer.count("fanout_timeouts", timed_out)
+
+        with timer.stage("fuse"):
+            fused_k = per_query if include_vectors else top_k
+            candidates = reciprocal_rank_fusion(result_lists, k=self.rrf_k, top_k=fused_k)
+        if self.reranker is None:
+            return candidates
+        return await self._rerank(queries[0], embeddings[0], candidates, top_k, timer)
+
+    def resolve_mode(self, mode: Optional[str] = None) -> str:
+        """The mode a search actually runs in (vector when there is no keyword index)"""
+        mode = mode or self.default_mode
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+        if self.keyword_index is None:
+            mode = "vector"
+        return mode
+
+    async def _available_mode(self, mode: str, user_id: str) -> str:
+        """
+        The keyword index lives in memory and is reloaded after a restart - until
+        it holds all of the user's chunks, search by vector instead of a partial index
+        """
+        if mode != "vector" and not await self.keyword_index.is_complete(user_id):
+            return "vector"
+        return mode
+
+    async def _rerank(
+        self,
+        question: str,
+        question_embedding: Optional[Embedding],
+        candidates: List[Dict],
+        top_k: int,
+        timer: StageTimer
+    ) -> List[Dict]:
+        with timer.stage("rerank"):
+            results = await self.reranker.rerank(question, question_embedding, candidates, top_k, timer)
+        for result in results:
+            result.pop("vector", None)
+        return results
+
+    async def _search(
+        self,
+        question: str,
+        user_id: str,
+        top_k: int,
+        mode: str,
+        timer: StageTimer,
+        query_embedding: Optional[Embedding] = None,
+        include_vectors: bool = False
+    ) -> List[Dict]:
+        if mode == "vector":
+            return await self._vector_search(question, user_id, top_k, timer, query_embedding, include_vectors)
+        if mode == "keyword":
+            return await self._keyword_search(question, user_id, top_k, timer)
+
+        candidates = top_k * self.candidate_multiplier
+        vector_results, keyword_results = await asyncio.gather(
+            self._vector_search(question, user_id, candidates, timer, query_embedding, include_vectors),
+            self._keyword_search(question, user_id, candidates, timer)
+        )
+        with timer.stage("fuse"):
+            return reciprocal_rank_fusion([vector_results, keyword_results], k=self.rrf_k, top_k=top_k)
+
+    async def _vector_search(
+        self,
+        question: str,
+        user_id: str,
+        top_k: int,
+        timer: StageTimer,
+        question_embedding: Optional[Embedding] = None,
+        include_vectors: bool = False
+    ) -> List[Dict]:
+        # 1. Embed the question
+        if question_embedding is None:
+            with timer.stage("embed"):
+                question_embedding = await self.embedding_service.create_embedding(question)
+
+        # 2. search vector store
+        with timer.stage("search"):
+            return await self.vector_store.search(query_embedding=question_embedding,
+                                                  top_k=top_k,
+                                                  filter={"user_id": user_id},
+                                                  include_vectors=include_vectors)
+
+    async def _keyword_search(self, question: str, user_id: str, top_k: int, timer: StageTimer) -> List[Dict]:
+        with timer.stage("keyword_search"):
+            return await self.keyword_index.search(question, user_id=user_id, top_k=top_k)
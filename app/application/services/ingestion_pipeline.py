@@ -0,0 +1,237 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Dict, List, Optional, Set
+from app.application.interfaces.embedding_service import IEmbeddingService
+from app.application.interfaces.vector_store import IvectorStore
+from app.application.interfaces.keyword_index import IKeywordIndex
+from app.application.interfaces.document_chunk_repository import IDocumentChunkRepository
+from app.domain.chunking import ChunkingStrategy, RecursiveChunker, TextChunk
+from app.domain.entities.embedding import Embedding
+
+
+# Marks the end of a queue's stream
+_DONE = object()
+
+
+def chunk_vector_record(
+    chunk: TextChunk,
+    embedding: Embedding,
+    document_id: str,
+    user_id: str,
+    filename: str
+) -> Dict:
+    """
+    Vector store record (id, embedding, metadata) for one document chunk
+    The id is content addressed, so an unchanged chunk keeps its vector
+    across versions of the document
+    """
+    content_hash = chunk.content_hash
+    return {
+        "id": f"{document_id}_chunk_{content_hash[:16]}",
+        "embedding": embedding,
+        "metadata": {
+            "document_id": document_id,
+            "chunk_index": chunk.index,
+            "start": chunk.start,
+            "end": chunk.end,
+            "content_hash": content_hash,
+            "text": chunk.text,
+            "user_id": user_id,
+            "filename": filename
+        }
+    }
+
+
+@dataclass
+class IngestionResult:
+    """Outcome of one pipeline run"""
+    text: str
+    chunk_count: int
+    batch_count: int
+    # Hashes of every chunk of the new text, and how many were already indexed
+    chunk_hashes: Set[str] = field(default_factory=set)
+    reused_count: int = 0
+
+
+class IngestionPipeline:
+    """
+    Streaming ingestion for a single document
+
+        extract -> chunk -> embed (batches) -> upsert (batches)
+
+    Stages are connected by bounded asyncio queues, so a slow stage applies
+    backpressure to the ones before it and only a few batches of chunks and
+    embeddings are ever held in memory. The embedding API and the vector store
+    are kept busy at the same time instead of one after the other.
+    """
+
+    def __init__(
+        self,
+        embedding_service: IEmbeddingService,
+        vector_store: IvectorStore,
+        chunker: Optional[ChunkingStrategy] = None,
+        embed_batch_size: int = 64,
+        queue_size: int = 4,
+        embed_concurrency: int = 2,
+        keyword_index: Optional[IKeywordIndex] = None,
+        chunk_registry: Optional[IDocumentChunkRepository] = None
+    ):
+        self.embedding_service = embedding_service
+        self.vector_store = vector_store
+        self.keyword_index = keyword_index
+        self.chunk_registry = chunk_registry
+        self.chunker = chunker or RecursiveChunker(chunk_size=1000)
+        self.embed_batch_size = embed_batch_size
+        self.queue_size = queue_size
+        self.embed_concurrency = embed_concurrency
+
+    async def run(
+        self,
+        text_parts: AsyncIterator[str],
+        document_id: str,
+        user_id: str,
+        filename: str,
+        known_hashes: Optional[Set[str]] = None
+    ) -> IngestionResult:
+        """
+        Run every stage concurrently until the text stream is exhausted
+        Chunks whose hash is in known_hashes (already indexed for this
+        document) and repeated chunks are not embedded again
+        """
+        known_hashes = known_hashes or set()
+        text_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        # The full text is still needed for the documents table
+        collected: List[str] = []
+        counters = {"chunks": 0, "batches": 0, "reused": 0}
+        chunk_hashes: Set[str] = set()
+
+        async def extract() -> None:
+            async for part in text_parts:
+                collected.append(part)
+                await text_queue.put(part)
+            await text_queue.put(_DONE)
+
+        async def chunk() -> None:
+            batch: List[TextChunk] = []
+            carry = ""
+            offset = 0  # position of carry[0] in the full document text
+            index = 0
+
+            async def emit(chunks: List[TextChunk], base: int) -> None:
+                nonlocal batch, index
+                reused: List[Dict] = []
+                for piece in chunks:
+                    index += 1
+                    content_hash = piece.content_hash
+                    if content_hash in chunk_hashes:
+                        continue  # repeated text within this document
+                    chunk_hashes.add(content_hash)
+                    located = TextChunk(
+                        text=piece.text,
+                        start=base + piece.start,
+                        end=base + piece.end,
+                        index=index - 1
+                    )
+                    if content_hash in known_hashes:
+                        counters["reused"] += 1  # vector from the previous version
+                        # The in-memory keyword index may not hold it (process restarted)
+                        if self.keyword_index is not None:
+                            reused.append(chunk_vector_record(located, None, document_id, user_id, filename))
+                        continue
+
+                    batch.append(located)
+                    if len(batch) == self.embed_batch_size:
+                        await chunk_queue.put(batch)
+                        batch = []
+
+                if reused:
+                    await self.keyword_index.add_many(reused)
+
+            while True:
+                part = await text_queue.get()
+                if part is _DONE:
+                    break
+
+                text = carry + part
+                chunks = self.chunker.split(text)
+                if not chunks:
+                    carry, offset = "", offset + len(text)
+                    continue
+
+                # The last chunk may continue in the next part: re-chunk it
+                # from its start once more text has arrived
+                last = chunks.pop()
+                await emit(chunks, offset)
+                carry, offset = text[last.start:], offset + last.start
+
+            await emit(self.chunker.split(carry), offset)
+            if batch:
+                await chunk_queue.put(batch)
+
+            counters["chunks"] = index
+            for _ in range(self.embed_concurrency):
+                await chunk_queue.put(_DONE)
+
+        async def embed() -> None:
+            while True:
+                batch = await chunk_queue.get()
+                if batch is _DONE:
+                    break
+                embeddings = await self.embedding_service.create_embeddings_batch(
+                    [piece.text for piece in batch]
+                )
+                await upsert_queue.put((batch, embeddings))
+            await upsert_queue.put(_DONE)
+
+        async def upsert() -> None:
+            finished_workers = 0
+            while finished_workers < self.embed_concurrency:
+                item = await upsert_queue.get()
+                if item is _DONE:
+                    finished_workers += 1
+                    continue
+
+                batch, embeddings = item
+                records = [
+                    chunk_vector_record(piece, embedding, document_id, user_id, filename)
+                    for piece, embedding in zip(batch, embeddings)
+                ]
+                if self.chunk_registry is not None:
+                    # Registered before the write, so a failed ingestion leaves
+                    # pending rows for the compaction job instead of untracked vectors
+                    await self.chunk_registry.add_pending(records)
+                await self.vector_store.upsert_many(records)
+                if self.keyword_index is not None:
+                    await self.keyword_index.add_many(records)
+                counters["batches"] += 1
+
+        await self._run_stages([
+            extract(),
+            chunk(),
+            *(embed() for _ in range(self.embed_concurrency)),
+            upsert(),
+        ])
+
+        return IngestionResult(
+            text="".join(collected),
+            chunk_count=counters["chunks"],
+            batch_count=counters["batches"],
+            chunk_hashes=chunk_hashes,
+            reused_count=counters["reused"]
+        )
+
+    async def _run_stages(self, stages: List[Awaitable[None]]) -> None:
+        """Run stages together; the first failure cancels the rest and is re-raised"""
+        tasks = [asyncio.ensure_future(stage) for stage in stages]
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
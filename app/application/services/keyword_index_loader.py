@@ -0,0 +1,95 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncContextManager, Callable, Dict, Optional, Set
+from app.application.interfaces.document_chunk_repository import IDocumentChunkRepository
+from app.application.interfaces.document_repository import IDocumentRepositroy
+from app.application.interfaces.keyword_index import IKeywordIndex
+from app.application.services.document_service import unique_chunks
+from app.application.services.ingestion_pipeline import chunk_vector_record
+from app.domain.chunking import ChunkingStrategy
+
+
+class KeywordIndexLoader:
+    """
+    Reloads an in-memory keyword index from the documents table on startup
+    Every stored document is chunked again; with a chunk registry only chunks
+    whose ids are active (so they have a vector) are indexed, which keeps keyword
+    and vector hits on the same ids. Searches fall back to vectors until it is done.
+
+    Call start() on application startup.
+    """
+
+    def __init__(
+        self,
+        keyword_index: IKeywordIndex,
+        chunker: ChunkingStrategy,
+        document_repo_factory: Callable[[], AsyncContextManager[IDocumentRepositroy]],
+        registry_factory: Optional[Callable[[], AsyncContextManager[IDocumentChunkRepository]]] = None,
+        executor: Optional[Executor] = None,
+        batch_size: int = 100
+    ):
+        """
+        document_repo_factory / registry_factory: open a repository with its own database session
+        executor: where documents are chunked (CPU bound), the default thread pool if None
+        """
+        self.keyword_index = keyword_index
+        self.chunker = chunker
+        self.document_repo_factory = document_repo_factory
+        self.registry_factory = registry_factory
+        self.executor = executor
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.documents = 0
+        self.chunks = 0
+
+    async def load(self) -> int:
+        """Index the chunks of every stored document; returns how many were indexed"""
+        self.keyword_index.start_loading()
+        loop = asyncio.get_running_loop()
+        after_id = None
+        while True:
+            async with self.document_repo_factory() as document_repo:
+                documents = await document_repo.list_after(after_id, limit=self.batch_size)
+            if not documents:
+                break
+            after_id = documents[-1].id
+
+            for document in documents:
+                chunks = await loop.run_in_executor(self.executor, unique_chunks, self.chunker, document.content)
+                records = [
+                    chunk_vector_record(chunk, None, document.id, document.user_id, document.filename)
+                    for chunk in chunks
+                ]
+                active = await self._active_chunk_ids(document.id)
+                if active is not None:
+                    records = [record for record in records if record["id"] in active]
+                await self.keyword_index.add_many(records)
+                self.documents += 1
+                self.chunks += len(records)
+
+        self.keyword_index.finish_loading()
+        return self.chunks
+
+    def start(self) -> None:
+        if self._task is None:
+            # Incomplete from now on, not only once the task gets to run
+            self.keyword_index.start_loading()
+            self._task = asyncio.create_task(self._run())
+
+    def stats(self) -> Dict:
+        return {"documents": self.documents, "chunks": self.chunks}
+
+    async def _active_chunk_ids(self, document_id: str) -> Optional[Set[str]]:
+        if self.registry_factory is None:
+            return None
+        async with self.registry_factory() as registry:
+            return set(await registry.get_chunk_hashes(document_id))
+
+    async def _run(self) -> None:
+        try:
+            await self.load()
+        except Exception as e:
+            # The index stays incomplete - keyword searches keep falling back to vectors
+            print(f"Warning: loading the keyword index failed: {e}")
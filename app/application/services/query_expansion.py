@@ -0,0 +1,82 @@
+import asyncio
+import re
+from typing import List, Optional
+from app.application.interfaces.llm_services import ILLMService
+from app.domain.entities.chat_message import ChatMessage, MessageRole
+
+
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+
+_EXPANSION_PROMPT = (
+    "Rewrite the question below into at most {count} search queries for a document search engine.\n"
+    "- Resolve references to the conversation (it, that, the previous one) into explicit terms\n"
+    "- Split a question that asks several things into one query per sub-question\n"
+    "Return only the queries, one per line.\n\n"
+    "{history}Question: {question}"
+)
+
+
+class QueryExpander:
+    """
+    Turns a question into search query variants with one LLM call:
+    a history-aware rewrite and sub-questions. The call runs under a
+    deadline - when it is slow or fails the question is searched alone
+    """
+
+    def __init__(
+        self,
+        llm_service: ILLMService,
+        max_variants: int = 3,
+        timeout_seconds: float = 1.5,
+        max_history_messages: int = 4
+    ):
+        self.llm_service = llm_service
+        self.max_variants = max_variants
+        self.timeout_seconds = timeout_seconds
+        self.max_history_messages = max_history_messages
+
+    async def expand(
+        self,
+        question: str,
+        conversation_history: Optional[List[ChatMessage]] = None
+    ) -> List[str]:
+        """Query variants (the question itself excluded), empty when the deadline passes"""
+        if self.max_variants <= 0:
+            return []
+
+        history = ""
+        recent = (conversation_history or [])[-self.max_history_messages:]
+        if recent:
+            history = "Conversation:\n" + "\n".join(
+                f"{message.role.value}: {message.content}" for message in recent
+            ) + "\n\n"
+        prompt = _EXPANSION_PROMPT.format(count=self.max_variants, history=history, question=question)
+
+        try:
+            response = await asyncio.wait_for(
+                self.llm_service.generate_response(
+                    [ChatMessage(role=MessageRole.USER, content=prompt)],
+                    context=""
+                ),
+                timeout=self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            return []
+        except Exception as e:
+            print(f"Warning: query expansion failed: {e}")
+            return []
+
+        return self._parse(response or "", question)
+
+    def _parse(self, response: str, question: str) -> List[str]:
+        seen = {question.strip().lower()}
+        variants = []
+        for line in response.splitlines():
+            query = _LIST_MARKER.sub("", line).strip().strip('"')
+            if not query or query.lower() in seen:
+                continue
+            seen.add(query.lower())
+            variants.append(query)
+            if len(variants) == self.max_variants:
+                break
+        return variants
@@ -0,0 +1,119 @@
+from typing import Dict, List, Optional
+import numpy as np
+
+from app.application.interfaces.embedding_service import IEmbeddingService
+from app.application.interfaces.reranker import IReranker
+from app.core.metrics import StageTimer
+from app.domain.entities.embedding import Embedding
+
+
+RERANKERS = ("none", "mmr", "cross_encoder", "cross_encoder_mmr")
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def maximal_marginal_relevance(
+    query: np.ndarray,
+    vectors: np.ndarray,
+    top_k: int,
+    lambda_mult: float = 0.5
+) -> List[int]:
+    """
+    Indices of top_k rows picked greedily by
+        lambda * sim(query, d) - (1 - lambda) * max(sim(d, already picked))
+    lambda_mult=1 is plain similarity ranking, lower values favour diversity
+    """
+    if vectors.shape[0] == 0 or top_k <= 0:
+        return []
+
+    vectors = _normalize(np.asarray(vectors, dtype=np.float32))
+    query = _normalize(np.asarray(query, dtype=np.float32).reshape(-1))
+    relevance = vectors @ query
+    # Pairwise similarities once - candidate sets are small (tens of rows)
+    similarity = vectors @ vectors.T
+
+    first = int(np.argmax(relevance))
+    selected = [first]
+    redundancy = similarity[first].copy()
+    available = np.ones(vectors.shape[0], dtype=bool)
+    available[first] = False
+
+    while len(selected) < min(top_k, vectors.shape[0]):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        picked = int(np.argmax(scores))
+        selected.append(picked)
+        available[picked] = False
+        np.maximum(redundancy, similarity[picked], out=redundancy)
+
+    return selected
+
+
+class MMRReranker(IReranker):
+    """
+    Maximal Marginal Relevance over the candidates' stored vectors - keeps
+    the most relevant chunks while skipping ones that repeat each other.
+    Candidates without a "vector" (e.g. BM25 hits) are embedded in one batch
+    """
+
+    def __init__(self, embedding_service: IEmbeddingService, lambda_mult: float = 0.5):
+        self.embedding_service = embedding_service
+        self.lambda_mult = lambda_mult
+
+    async def rerank(
+        self,
+        question: str,
+        question_embedding: Optional[Embedding],
+        candidates: List[Dict],
+        top_k: int,
+        timer: Optional[StageTimer] = None
+    ) -> List[Dict]:
+        if len(candidates) <= 1:
+            return candidates[:top_k]
+        timer = timer or StageTimer()
+
+        missing = [candidate for candidate in candidates if candidate.get("vector") is None]
+        if question_embedding is None or missing:
+            with timer.stage("mmr_embed"):
+                texts = [candidate["metadata"]["text"] for candidate in missing]
+                if question_embedding is None:
+                    texts.append(question)
+                embeddings = await self.embedding_service.create_embeddings_batch(texts)
+            if question_embedding is None:
+                question_embedding = embeddings.pop()
+            for candidate, embedding in zip(missing, embeddings):
+                candidate["vector"] = embedding.vector
+
+        with timer.stage("mmr"):
+            vectors = np.stack([np.asarray(candidate["vector"], dtype=np.float32) for candidate in candidates])
+            order = maximal_marginal_relevance(question_embedding.vector, vectors, top_k, self.lambda_mult)
+        return [candidates[i] for i in order]
+
+
+class ChainReranker(IReranker):
+    """
+    Runs rerankers one after the other, e.g. a cross-encoder narrowing the
+    candidates to intermediate_multiplier * top_k, then MMR picking top_k of them
+    """
+
+    def __init__(self, rerankers: List[IReranker], intermediate_multiplier: int = 3):
+        self.rerankers = rerankers
+        self.intermediate_multiplier = intermediate_multiplier
+
+    async def rerank(
+        self,
+        question: str,
+        question_embedding: Optional[Embedding],
+        candidates: List[Dict],
+        top_k: int,
+        timer: Optional[StageTimer] = None
+    ) -> List[Dict]:
+        for i, reranker in enumerate(self.rerankers):
+            last = i == len(self.rerankers) - 1
+            stage_k = top_k if last else top_k * self.intermediate_multiplier
+            candidates = await reranker.rerank(question, question_embedding, candidates, stage_k, timer)
+        return candidates
@@ -0,0 +1,34 @@
+# Blocking text extraction helpers.
+# Plain module-level functions so they can be shipped to a ProcessPoolExecutor
+# (they must be picklable and must never touch the event loop).
+import io
+from typing import List
+import PyPDF2
+import docx
+
+
+def pdf_page_count(content: bytes) -> int:
+    """Number of pages in a PDF"""
+    return len(PyPDF2.PdfReader(io.BytesIO(content)).pages)
+
+
+def extract_pdf_pages(content: bytes, start: int, end: int) -> str:
+    """Extract pages [start, end) of a PDF, one page per line block"""
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
+
+    parts: List[str] = []
+    for page in pdf_reader.pages[start:end]:
+        parts.append(page.extract_text())
+        parts.append("\n")
+    return "".join(parts)
+
+
+def extract_docx_text(content: bytes) -> str:
+    """Extract all paragraphs of a DOCX"""
+    doc = docx.Document(io.BytesIO(content))
+
+    parts: List[str] = []
+    for paragraph in doc.paragraphs:
+        parts.append(paragraph.text)
+        parts.append("\n")
+    return "".join(parts)
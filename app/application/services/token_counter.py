@@ -0,0 +1,49 @@
+import re
+from typing import List
+from app.domain.entities.chat_message import ChatMessage
+
+try:
+    import tiktoken
+except ImportError:  # optional - counts fall back to an estimate
+    tiktoken = None
+
+
+# Words split into pieces of at most 6 characters plus single punctuation
+# marks - within ~10% of BPE token counts for English prose
+_TOKEN_ESTIMATE = re.compile(r"\w{1,6}|[^\w\s]")
+
+# Role and separator tokens the chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+class TokenCounter:
+    """
+    Counts prompt tokens with the model's tiktoken encoding when tiktoken is
+    installed, otherwise with a fast regex estimate
+    """
+
+    def __init__(self, model: str = "gpt-4o"):
+        self.model = model
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self._encoding = tiktoken.get_encoding("cl100k_base")
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(_TOKEN_ESTIMATE.findall(text))
+
+    def count_message(self, message: ChatMessage) -> int:
+        return self.count(message.content) + MESSAGE_OVERHEAD_TOKENS
+
+    def count_messages(self, messages: List[ChatMessage]) -> int:
+        return sum(self.count_message(message) for message in messages)
@@ -0,0 +1,82 @@
+import asyncio
+from typing import AsyncContextManager, Callable, Dict, Optional
+from app.application.interfaces.document_chunk_repository import IDocumentChunkRepository
+from app.application.interfaces.vector_store import IvectorStore
+
+
+class VectorCompactionJob:
+    """
+    Background job reclaiming orphaned vectors
+    - chunks of deleted documents whose vector delete failed
+    - chunks of ingestions that failed or never finished (pending for longer
+      than pending_grace_seconds)
+
+    Call start() on application startup and stop() on shutdown.
+    """
+
+    def __init__(
+        self,
+        registry_factory: Callable[[], AsyncContextManager[IDocumentChunkRepository]],
+        vector_store: IvectorStore,
+        interval_seconds: float = 300,
+        batch_size: int = 1000,
+        pending_grace_seconds: float = 3600
+    ):
+        """
+        registry_factory: opens a chunk registry (with its own database session) per run
+        """
+        self.registry_factory = registry_factory
+        self.vector_store = vector_store
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.pending_grace_seconds = pending_grace_seconds
+        self._task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.runs = 0
+        self.reclaimed = 0
+        self.failures = 0
+
+    async def run_once(self) -> int:
+        """Reclaim every orphaned vector, batch by batch; returns how many were deleted"""
+        reclaimed = 0
+
+        async with self.registry_factory() as registry:
+            while True:
+                chunk_ids = await registry.list_reclaimable(self.pending_grace_seconds, limit=self.batch_size)
+                if not chunk_ids:
+                    break
+
+                await self.vector_store.delete_many(chunk_ids, batch_size=self.batch_size)
+                await registry.purge(chunk_ids)
+                reclaimed += len(chunk_ids)
+
+        self.runs += 1
+        self.reclaimed += reclaimed
+        return reclaimed
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> Dict:
+        return {"runs": self.runs, "reclaimed": self.reclaimed, "failures": self.failures}
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.failures += 1
+                print(f"Warning: vector compaction failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
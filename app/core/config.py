@@ -62,9 +62,80 @@ class Settings(BaseSettings):
     
     # Local Embeddings
     LOCAL_EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_THREAD_POOL_SIZE: int = 2  # concurrent local model encode() calls
+    EMBEDDING_DTYPE: str = "float32"  # float32, float16 (half the memory per vector)
+
+    # Embedding Cache (keyed by model + sha256 of the text)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MEMORY_SIZE: int = 10000  # entries kept in the in-memory LRU
+    EMBEDDING_CACHE_PATH: str = "./storage/embedding_cache.sqlite3"  # empty = memory only
     
     # ==================== Vector Store Settings ====================
-    VECTOR_STORE_PROVIDER: str = "pinecone"  # pinecone, weaviate, qdrant
+    VECTOR_STORE_PROVIDER: str = "pinecone"  # pinecone, local
+    VECTOR_UPSERT_BATCH_SIZE: int = 100  # vectors per bulk upsert request
+    VECTOR_DELETE_BATCH_SIZE: int = 1000  # ids per bulk delete request (Pinecone max 1000)
+    VECTOR_COMPACTION_INTERVAL_SECONDS: int = 300  # how often orphaned vectors are reclaimed
+    VECTOR_COMPACTION_GRACE_SECONDS: int = 3600  # unfinished ingestions older than this are reclaimed
+
+    # Pinecone Settings
+    PINECONE_API_KEY: str = ""
+    PINECONE_ENVIRONMENT: str = "us-east-1"
+    PINECONE_INDEX_NAME: str = "documents"
+    PINECONE_UPSERT_CONCURRENCY: int = 4  # upsert requests in flight per upsert_many call
+    PINECONE_THREAD_POOL_SIZE: int = 8  # threads running blocking Pinecone SDK calls
+
+    # Local (in-process) Vector Store Settings
+    LOCAL_VECTOR_METRIC: str = "cosine"  # cosine, dot
+    LOCAL_VECTOR_INDEX_TYPE: str = "flat"  # flat, ivf
+    LOCAL_VECTOR_IVF_NLIST: int = 256  # k-means centroids per tenant
+    LOCAL_VECTOR_IVF_NPROBE: int = 8  # lists scanned per query
+    LOCAL_VECTOR_QUANTIZATION: str = "none"  # none, sq8 (int8, 4x smaller), pq (product quantization)
+    LOCAL_VECTOR_PQ_M: int = 16  # PQ sub-quantizers = bytes per vector (must divide the dimension)
+    LOCAL_VECTOR_QUANTIZATION_TRAIN_SIZE: int = 20000  # vectors stored as float32 until the quantizer is trained
+    LOCAL_VECTOR_RERANK_PATH: str = ""  # full-precision vectors on disk for exact re-ranking; empty = off
+    LOCAL_VECTOR_RERANK_FACTOR: int = 4  # candidates re-ranked = factor * top_k
+
+    # ==================== Retrieval Settings ====================
+    RETRIEVAL_MODE: str = "hybrid"  # vector, keyword (BM25), hybrid (both, fused)
+    RRF_K: int = 60  # reciprocal rank fusion constant - larger flattens rank differences
+
+    # Semantic answer cache (per user, keyed by question embedding)
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = 0.95  # cosine similarity needed for a hit
+    ANSWER_CACHE_TTL_SECONDS: int = 3600
+    ANSWER_CACHE_MAX_ENTRIES_PER_USER: int = 256
+    ANSWER_CACHE_MAX_USERS: int = 10000
+
+    # Prompt assembly: retrieved context + conversation history per request
+    PROMPT_TOKEN_BUDGET: int = 0  # tokens; 0 = 4 x OPENAI_MAX_TOKENS
+    PROMPT_HISTORY_SHARE: float = 0.25  # part of the budget kept for conversation history
+    CONTEXT_DEDUP_THRESHOLD: float = 0.8  # estimated Jaccard similarity at which chunks are duplicates
+
+    # Re-ranking of over-fetched candidates
+    RERANKER: str = "none"  # none, mmr, cross_encoder, cross_encoder_mmr
+    RERANK_CANDIDATES: int = 50  # chunks retrieved before re-ranking down to top_k
+    MMR_LAMBDA: float = 0.5  # 1 = relevance only, lower = more diverse
+    CROSS_ENCODER_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    CROSS_ENCODER_THREAD_POOL_SIZE: int = 1  # concurrent predict() calls
+    CROSS_ENCODER_BATCH_SIZE: int = 32
+
+    # Multi-query fan-out: LLM query variants searched concurrently with the question
+    QUERY_EXPANSION_ENABLED: bool = False
+    QUERY_EXPANSION_MAX_VARIANTS: int = 3  # variants searched next to the question
+    QUERY_EXPANSION_TIMEOUT_SECONDS: float = 1.5  # deadline of the variant generation call
+    QUERY_FANOUT_TIMEOUT_SECONDS: float = 1.0  # variant searches still running after this are dropped
+
+    # Conversation history: recent window loaded per turn, then trimmed to PROMPT_HISTORY_SHARE
+    CONVERSATION_HISTORY_MESSAGES: int = 20
+    CONVERSATION_WINDOW_CACHE_ENABLED: bool = True
+    CONVERSATION_WINDOW_CACHE_MAX_CONVERSATIONS: int = 10000
+    CONVERSATION_WINDOW_CACHE_TTL_SECONDS: int = 300  # bounds staleness across worker processes
+
+    # Running summary: older messages condensed in the background (one LLM call per run)
+    CONVERSATION_SUMMARY_ENABLED: bool = False
+    CONVERSATION_SUMMARY_TRIGGER_MESSAGES: int = 12  # unsummarized messages that start a run (< CONVERSATION_HISTORY_MESSAGES)
+    CONVERSATION_SUMMARY_KEEP_RECENT_MESSAGES: int = 6  # newest messages kept verbatim by a run
+    CONVERSATION_SUMMARY_MAX_WORDS: int = 200
 
     # ==================== Storage Settings ====================
     STORAGE_PROVIDER: str = "local"  # s3, gcs, azure, local
@@ -81,8 +152,16 @@ class Settings(BaseSettings):
     # ==================== Document Processing Settings ====================
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10 MB
     ALLOWED_FILE_EXTENSIONS: list = ["pdf", "docx", "txt", "md"]
+    CHUNKING_STRATEGY: str = "recursive"  # recursive (sizes in characters), fixed_token (sizes in tokens)
     CHUNK_SIZE: int = 1000
     CHUNK_OVERLAP: int = 200
+    EXTRACTION_WORKERS: int = 2  # processes parsing PDF/DOCX files
+    PDF_PAGES_PER_TASK: int = 16  # PDF pages handed to one worker at a time
+
+    # Streaming ingestion pipeline (extract -> chunk -> embed -> upsert)
+    EMBEDDING_BATCH_SIZE: int = 64  # chunks per embedding request
+    INGESTION_QUEUE_SIZE: int = 4  # batches buffered between stages (backpressure)
+    INGESTION_EMBED_CONCURRENCY: int = 2  # embedding requests in flight per document
     
     # ==================== Rate Limiting Settings ====================
     RATE_LIMIT_ENABLED: bool = True
@@ -102,6 +181,7 @@ class Settings(BaseSettings):
     # ==================== Monitoring Settings ====================
     ENABLE_METRICS: bool = True
     METRICS_PORT: int = 9090
+    LATENCY_WINDOW_SIZE: int = 1000  # recent requests kept for latency percentiles
     
     # ==================== Worker Settings ====================
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
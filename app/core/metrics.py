@@ -0,0 +1,133 @@
+# app/core/metrics.py
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Deque, Dict, Iterator, Optional
+import numpy as np
+
+
+@dataclass
+class RequestTimings:
+    """Latency breakdown of a single request (all values in seconds)"""
+    stages: Dict[str, float] = field(default_factory=dict)
+    time_to_first_token: Optional[float] = None
+    total: float = 0.0
+    # Per-request quantities that are not durations (e.g. prompt tokens)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+class StageTimer:
+    """
+    Collects per-stage durations for one request
+
+    timer = StageTimer()
+    with timer.stage("embed"):
+        ...
+    timings = timer.finish()
+    """
+
+    def __init__(self):
+        self._start = perf_counter()
+        self._first_token: Optional[float] = None
+        self.stages: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + perf_counter() - started
+
+    def count(self, name: str, value: int) -> None:
+        """Record a per-request quantity next to the stage durations"""
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def mark_first_token(self) -> None:
+        """Record time-to-first-token (only the first call counts)"""
+        if self._first_token is None:
+            self._first_token = perf_counter() - self._start
+
+    def finish(self) -> RequestTimings:
+        return RequestTimings(
+            stages=dict(self.stages),
+            time_to_first_token=self._first_token,
+            total=perf_counter() - self._start,
+            counts=dict(self.counts)
+        )
+
+
+class LatencyRecorder:
+    """
+    Keeps the last `window` request timings and reports percentiles
+    per stage, for time-to-first-token and for the total
+    """
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, Deque[float]] = {}
+        self._count_totals: Dict[str, int] = {}
+        self.window = window
+        self.count = 0
+
+    def record(self, timings: RequestTimings) -> None:
+        with self._lock:
+            self.count += 1
+            for name, seconds in timings.stages.items():
+                self._series(name).append(seconds)
+            if timings.time_to_first_token is not None:
+                self._series("time_to_first_token").append(timings.time_to_first_token)
+            self._series("total").append(timings.total)
+            for name, value in timings.counts.items():
+                self._series(name, self._counts).append(value)
+                self._count_totals[name] = self._count_totals.get(name, 0) + value
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """p50/p95/p99 (milliseconds) for every recorded series"""
+        with self._lock:
+            snapshot = {name: np.fromiter(values, dtype=np.float64) for name, values in self._samples.items()}
+
+        report = {}
+        for name, values in snapshot.items():
+            if values.size == 0:
+                continue
+            p50, p95, p99 = np.percentile(values, [50, 95, 99]) * 1000.0
+            report[name] = {
+                "count": int(values.size),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+            }
+        return report
+
+    def count_summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean / p50 / p95 over the window and the running total of every recorded count"""
+        with self._lock:
+            snapshot = {name: np.fromiter(values, dtype=np.float64) for name, values in self._counts.items()}
+            totals = dict(self._count_totals)
+
+        report = {}
+        for name, values in snapshot.items():
+            if values.size == 0:
+                continue
+            p50, p95 = np.percentile(values, [50, 95])
+            report[name] = {
+                "count": int(values.size),
+                "mean": float(values.mean()),
+                "p50": float(p50),
+                "p95": float(p95),
+                "total": totals[name],
+            }
+        return report
+
+    def _series(self, name: str, samples: Optional[Dict[str, Deque[float]]] = None) -> Deque[float]:
+        samples = self._samples if samples is None else samples
+        series = samples.get(name)
+        if series is None:
+            series = deque(maxlen=self.window)
+            samples[name] = series
+        return series
@@ -0,0 +1,161 @@
+import hashlib
+import re
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Iterator, List, Tuple
+
+
+_TOKEN = re.compile(r"\S+")
+_SENTENCE_ENDS = (". ", "! ", "? ", ".\n", "!\n", "?\n")
+
+
+@dataclass(frozen=True)
+class TextChunk:
+    """
+    A chunk of a document plus its provenance
+    start/end are character offsets into the source text: text == source[start:end]
+    """
+    text: str
+    start: int
+    end: int
+    index: int = 0
+
+    @property
+    def content_hash(self) -> str:
+        """sha256 of the text - identical text across document versions hashes the same"""
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+
+class ChunkingStrategy(ABC):
+    """
+    Pluggable chunking engine
+    Strategies walk the source text once by character offsets - they never
+    build a list of every word in the document
+    """
+
+    def __init__(self, chunk_size: int, chunk_overlap: int = 0):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= chunk_overlap < chunk_size:
+            raise ValueError("chunk_overlap must be >= 0 and smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    @abstractmethod
+    def iter_chunks(self, text: str) -> Iterator[TextChunk]:
+        """Yield chunks in document order"""
+        pass
+
+    def split(self, text: str) -> List[TextChunk]:
+        return list(self.iter_chunks(text))
+
+
+class FixedTokenChunker(ChunkingStrategy):
+    """
+    Fixed-size windows of chunk_size tokens, consecutive windows sharing
+    chunk_overlap tokens. A token is a run of non-whitespace characters.
+    """
+
+    def iter_chunks(self, text: str) -> Iterator[TextChunk]:
+        # Only the (start, end) spans of the current window are kept
+        window: Deque[Tuple[int, int]] = deque()
+        fresh = 0  # tokens in the window not yet emitted in a previous chunk
+        index = 0
+
+        for match in _TOKEN.finditer(text):
+            window.append(match.span())
+            fresh += 1
+            if len(window) == self.chunk_size:
+                start, end = window[0][0], window[-1][1]
+                yield TextChunk(text=text[start:end], start=start, end=end, index=index)
+                index += 1
+                while len(window) > self.chunk_overlap:
+                    window.popleft()
+                fresh = 0
+
+        if fresh:
+            start, end = window[0][0], window[-1][1]
+            yield TextChunk(text=text[start:end], start=start, end=end, index=index)
+
+
+class RecursiveChunker(ChunkingStrategy):
+    """
+    Chunks of at most chunk_size characters, cut at the best boundary found
+    in the second half of the window: paragraph, then sentence, then word.
+    Consecutive chunks share roughly chunk_overlap characters (word aligned).
+    """
+
+    def iter_chunks(self, text: str) -> Iterator[TextChunk]:
+        length = len(text)
+        pos = self._skip_whitespace(text, 0)
+        index = 0
+
+        while pos < length:
+            limit = pos + self.chunk_size
+            if limit >= length:
+                end = length
+            else:
+                end = self._find_break(text, pos, limit)
+
+            # Trim trailing whitespace without copying the window
+            chunk_end = end
+            while chunk_end > pos and text[chunk_end - 1].isspace():
+                chunk_end -= 1
+
+            yield TextChunk(text=text[pos:chunk_end], start=pos, end=chunk_end, index=index)
+            index += 1
+
+            if end >= length:
+                break
+            pos = self._next_start(text, pos, end)
+
+    def _find_break(self, text: str, pos: int, limit: int) -> int:
+        """Best cut position in (pos + chunk_size / 2, limit]"""
+        low = pos + self.chunk_size // 2
+
+        paragraph = text.rfind("\n\n", low, limit)
+        if paragraph != -1:
+            return paragraph + 2
+
+        sentence = max(text.rfind(marker, low, limit) for marker in _SENTENCE_ENDS)
+        if sentence != -1:
+            return sentence + 2
+
+        word = max(text.rfind(space, low, limit) for space in (" ", "\n", "\t"))
+        if word != -1:
+            return word + 1
+
+        # No whitespace at all (e.g. a very long token) - hard cut
+        return limit
+
+    def _next_start(self, text: str, pos: int, end: int) -> int:
+        """Start of the next chunk: chunk_overlap characters back, on a word boundary"""
+        if self.chunk_overlap:
+            start = max(end - self.chunk_overlap, pos + 1)
+            # Move forward to the beginning of the next word
+            while start < end and not text[start - 1].isspace():
+                start += 1
+            if start < end:
+                return self._skip_whitespace(text, start)
+        return self._skip_whitespace(text, end)
+
+    @staticmethod
+    def _skip_whitespace(text: str, pos: int) -> int:
+        match = _TOKEN.search(text, pos)
+        return match.start() if match else len(text)
+
+
+CHUNKING_STRATEGIES = {
+    "recursive": RecursiveChunker,
+    "fixed_token": FixedTokenChunker,
+}
+
+
+def create_chunker(strategy: str = "recursive", chunk_size: int = 1000, chunk_overlap: int = 0) -> ChunkingStrategy:
+    """Build a chunker by name ("recursive" sizes are characters, "fixed_token" sizes are tokens)"""
+    try:
+        chunker_class = CHUNKING_STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown chunking strategy: {strategy}")
+    return chunker_class(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
@@ -28,8 +28,8 @@ class ChatMessage:
         if not self.content.strip():
             raise ValueError("Message content connot be empty")
         
-        if isinstance(self.role , str):
-            self.role = MessageRole.USER
+        # MessageRole is a str enum - convert plain strings, keep the role
+        self.role = MessageRole(self.role)
 
     def is_from_user(self) -> bool:
         """Check if message is from user"""
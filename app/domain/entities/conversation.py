@@ -20,6 +20,9 @@ class Conversation:
     created_at:datetime = field(default_factory=datetime.utcnow)
     updated_at:datetime=field(default_factory=datetime.utcnow)
     metadata:dict = field(default_factory=dict)
+    # Running summary of the messages up to (and including) summarized_until_id
+    summary:Optional[str] = None
+    summarized_until_id:Optional[str] = None
     
 
 
@@ -54,4 +57,25 @@ class Conversation:
             if message.is_from_user():
                 return message
             
-        return None
\ No newline at end of file
+        return None
+
+
+@dataclass
+class ConversationWindow:
+    """
+    What a chat turn needs from its conversation: the most recent messages
+    (oldest first) and the running summary of the messages before them
+    """
+
+    messages:List[ChatMessage] = field(default_factory=list)
+    summary:Optional[str] = None
+    summarized_until_id:Optional[str] = None
+    # Owner - checked against the caller on every turn, cached or not
+    user_id:Optional[str] = None
+
+    def unsummarized_messages(self) -> List[ChatMessage]:
+        """Messages after summarized_until_id - all of them when it is not in the window"""
+        for position , message in enumerate(self.messages):
+            if message.id == self.summarized_until_id:
+                return self.messages[position + 1:]
+        return list(self.messages)
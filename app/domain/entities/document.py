@@ -1,6 +1,10 @@
 from dataclasses import dataclass , field
 from datetime import datetime
-from typing import List
+from typing import List, Optional
+from app.domain.chunking import ChunkingStrategy, RecursiveChunker
+
+
+CONTENT_PREVIEW_LENGTH = 200
 
 
 @dataclass
@@ -8,31 +12,25 @@ class Document:
     """
     Domain Entity - Pure business object
     No framework dependencies!
+    content is None when the document was loaded without it (load_content=False)
+    id is None until the document is saved - the database assigns it
     """
-    id:str
+    id:Optional[str]
     filename:str
-    content:str
+    content:Optional[str]
     created_at:datetime
     user_id:str
     chunks: List[str]= field(default_factory=list)
-    
-    def split_into_chunks(self, chunk_size : int = 1000) -> list[str]:
-        words = self.content.split()
-        chunks = []
-        current_chunk = []
-        current_size = 0
-        for word in words:
-            current_chunk.append(word)
-            current_size += len(word) + 1
-
-            if current_size >= chunk_size:
-                chunks.append(" ".join(current_chunk))
-                current_chunk = []
-                current_size = 0
-
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
+    content_preview: Optional[str] = None
 
+    def __post_init__(self):
+        if self.content_preview is None and self.content is not None:
+            self.content_preview = self.content[:CONTENT_PREVIEW_LENGTH]
+    
+    def split_into_chunks(self, chunk_size : int = 1000, chunk_overlap : int = 0,
+                          chunker : Optional[ChunkingStrategy] = None) -> list[str]:
+        """Split content with the given chunker (recursive, character based by default)"""
+        chunker = chunker or RecursiveChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        chunks = [chunk.text for chunk in chunker.iter_chunks(self.content)]
         self.chunks = chunks
         return chunks
-
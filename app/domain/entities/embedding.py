@@ -1,11 +1,28 @@
 from dataclasses import dataclass
-from typing import List
+import numpy as np
 
-@dataclass
+
+# Vector dtypes kept as they are; anything else is converted to float32
+EMBEDDING_DTYPES = ("float32", "float16")
+
+
+@dataclass(slots=True, eq=False)
 class Embedding:
-    vector: List[float]
+    """
+    Embedding of a text - vector is a 1-d NumPy array (4 bytes per dimension,
+    2 with float16). Arrays of an accepted dtype are used without copying, so
+    rows of a batch matrix are handed through as views
+    """
+    vector: np.ndarray
     model:str
     text:str
 
     def __post_init__(self):
-        object.__setattr__(self, 'vector', tuple(self.vector))
+        vector = self.vector
+        if not (isinstance(vector, np.ndarray) and vector.dtype.name in EMBEDDING_DTYPES):
+            vector = np.asarray(vector, dtype=np.float32)
+        self.vector = vector if vector.ndim == 1 else vector.reshape(-1)
+
+    @property
+    def dimension(self) -> int:
+        return self.vector.shape[0]
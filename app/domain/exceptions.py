@@ -12,4 +12,10 @@ class EmbeddingError(DomainException):
     pass
 
 class ConversationNotFoundError(DomainException):
-    pass
\ No newline at end of file
+    pass
+
+class InvalidCursorError(DomainException):
+    pass
+
+class EmptyAnswerError(DomainException):
+    pass
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional
+
+from app.application.interfaces.conversation_window_cache import IConversationWindowCache
+from app.domain.entities.chat_message import ChatMessage
+from app.domain.entities.conversation import ConversationWindow
+
+
+class _CachedWindow:
+    def __init__(self, window: ConversationWindow, max_messages: int, expires_at: float):
+        self.messages: Deque[ChatMessage] = deque(window.messages, maxlen=max_messages)
+        self.summary = window.summary
+        self.summarized_until_id = window.summarized_until_id
+        self.user_id = window.user_id
+        self.expires_at = expires_at
+
+
+class ConversationWindowCache(IConversationWindowCache):
+    """
+    In-memory window of the last max_messages messages and the running
+    summary per conversation, so a chat turn does not re-read its history
+    from the database
+    - at most max_conversations windows (least recently used evicted first)
+    - a window expires ttl_seconds after it was loaded from the database:
+      messages written by another process show up after at most that long
+    """
+
+    def __init__(self, max_messages: int = 20, max_conversations: int = 10000, ttl_seconds: float = 300):
+        self.max_messages = max_messages
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._windows: "OrderedDict[str, _CachedWindow]" = OrderedDict()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, conversation_id: str) -> Optional[ConversationWindow]:
+        with self._lock:
+            entry = self._windows.get(conversation_id)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._windows[conversation_id]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._windows.move_to_end(conversation_id)
+            self.hits += 1
+            return ConversationWindow(
+                messages=list(entry.messages),
+                summary=entry.summary,
+                summarized_until_id=entry.summarized_until_id,
+                user_id=entry.user_id
+            )
+
+    async def put(self, conversation_id: str, window: ConversationWindow) -> None:
+        entry = _CachedWindow(window, self.max_messages, time.monotonic() + self.ttl_seconds)
+        with self._lock:
+            self._windows[conversation_id] = entry
+            self._windows.move_to_end(conversation_id)
+            while len(self._windows) > self.max_conversations:
+                self._windows.popitem(last=False)
+                self.evictions += 1
+
+    async def append(self, conversation_id: str, messages: List[ChatMessage]) -> None:
+        with self._lock:
+            entry = self._windows.get(conversation_id)
+            if entry is not None:
+                entry.messages.extend(messages)
+
+    async def set_summary(self, conversation_id: str, summary: str, summarized_until_id: str) -> None:
+        with self._lock:
+            entry = self._windows.get(conversation_id)
+            if entry is not None:
+                entry.summary = summary
+                entry.summarized_until_id = summarized_until_id
+
+    async def invalidate(self, conversation_id: str) -> None:
+        with self._lock:
+            self._windows.pop(conversation_id, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "conversations": len(self._windows),
+            }
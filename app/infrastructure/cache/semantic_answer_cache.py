@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+
+from app.application.interfaces.answer_cache import IAnswerCache
+from app.domain.entities.embedding import Embedding
+
+
+class _UserAnswers:
+    """Cached answers of one user; the question vectors are kept as one matrix"""
+
+    def __init__(self):
+        self.vectors: List[np.ndarray] = []
+        self.answers: List[str] = []
+        self.expires_at: List[float] = []
+        self.last_used: List[float] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            self._matrix = np.stack(self.vectors)
+        return self._matrix
+
+    def append(self, vector: np.ndarray, answer: str, expires_at: float, now: float) -> None:
+        self.vectors.append(vector)
+        self.answers.append(answer)
+        self.expires_at.append(expires_at)
+        self.last_used.append(now)
+        self._matrix = None
+
+    def drop(self, keep: List[int]) -> None:
+        self.vectors = [self.vectors[i] for i in keep]
+        self.answers = [self.answers[i] for i in keep]
+        self.expires_at = [self.expires_at[i] for i in keep]
+        self.last_used = [self.last_used[i] for i in keep]
+        self._matrix = None
+
+
+class SemanticAnswerCache(IAnswerCache):
+    """
+    In-memory semantic answer cache
+    - scoped per user: a question only ever matches the same user's earlier questions
+    - hit when cosine(question, cached question) >= similarity_threshold
+    - entries expire after ttl_seconds; each user keeps at most
+      max_entries_per_user (least recently used evicted first) and at most
+      max_users users are kept (least recently active evicted first)
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.95,
+        ttl_seconds: float = 3600,
+        max_entries_per_user: int = 256,
+        max_users: int = 10000
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_user = max_entries_per_user
+        self.max_users = max_users
+
+        self._lock = threading.Lock()
+        self._users: "OrderedDict[str, _UserAnswers]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get(self, user_id: str, question_embedding: Embedding) -> Optional[str]:
+        query = self._normalize(question_embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            entries = self._users.get(user_id)
+            if entries is not None:
+                self._expire(entries, now)
+
+            if entries is None or not entries.vectors or entries.matrix().shape[1] != query.shape[0]:
+                self.misses += 1
+                return None
+
+            similarities = entries.matrix() @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            entries.last_used[best] = now
+            self._users.move_to_end(user_id)
+            self.hits += 1
+            return entries.answers[best]
+
+    async def put(
+        self,
+        user_id: str,
+        question_embedding: Embedding,
+        answer: str,
+        generation: Optional[int] = None
+    ) -> None:
+        vector = self._normalize(question_embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            if generation is not None and generation != self._generations.get(user_id, 0):
+                # The user's documents changed while this answer was generated
+                return
+
+            entries = self._users.get(user_id)
+            if entries is None:
+                entries = _UserAnswers()
+                self._users[user_id] = entries
+            self._users.move_to_end(user_id)
+
+            self._expire(entries, now)
+            if len(entries.vectors) >= self.max_entries_per_user:
+                # Evict the least recently used entry
+                oldest = int(np.argmin(entries.last_used))
+                entries.drop([i for i in range(len(entries.vectors)) if i != oldest])
+                self.evictions += 1
+            entries.append(vector, answer, now + self.ttl_seconds, now)
+
+            while len(self._users) > self.max_users:
+                _, evicted = self._users.popitem(last=False)
+                self.evictions += len(evicted.vectors)
+
+    async def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+            if self._users.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def generation(self, user_id: str) -> int:
+        with self._lock:
+            return self._generations.get(user_id, 0)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "users": len(self._users),
+                "entries": sum(len(entries.vectors) for entries in self._users.values()),
+            }
+
+    def _expire(self, entries: _UserAnswers, now: float) -> None:
+        keep = [i for i, expires_at in enumerate(entries.expires_at) if expires_at > now]
+        if len(keep) != len(entries.expires_at):
+            self.evictions += len(entries.expires_at) - len(keep)
+            entries.drop(keep)
+
+    @staticmethod
+    def _normalize(embedding: Embedding) -> np.ndarray:
+        vector = np.asarray(embedding.vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
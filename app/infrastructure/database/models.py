@@ -1,9 +1,9 @@
 from __future__ import annotations
 from sqlalchemy.sql.functions import func
 from datetime import datetime
-from sqlalchemy import ForeignKey , Text
+from sqlalchemy import ForeignKey , Index , String , Text
 from sqlalchemy.orm import DeclarativeBase , mapped_column , Mapped , relationship
-from typing import List
+from typing import List , Optional
 
 class Base(DeclarativeBase):
     pass 
@@ -28,11 +28,44 @@ class Document(Base):
     filename: Mapped[str] = mapped_column(nullable=False)
     created_at:Mapped[datetime] = mapped_column(server_default = func.now())
     content:Mapped[str] = mapped_column(Text)
+    # First 200 characters of content - listings read this instead of the full text
+    content_preview:Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
 
     # Relationship 
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
     user:Mapped[User] = relationship(back_populates= "documents")
 
+    __table_args__ = (
+        Index("ix_documents_user_id_created_at", "user_id", "created_at"),
+        Index("ix_documents_user_id_filename", "user_id", "filename"),
+        # Document ids key vectors and chunk registry rows - SQLite must not
+        # hand the id of a deleted document to the next one
+        {"sqlite_autoincrement": True},
+    )
+
+
+class DocumentChunk(Base):
+    """
+    Registry of the vectors written for a document's chunks
+    No FK to documents: rows are written while the document is still being
+    ingested and outlive it until its vectors are deleted
+    """
+    __tablename__ = "document_chunks"
+    id: Mapped[int] = mapped_column(primary_key = True)
+    document_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    user_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    chunk_id: Mapped[str] = mapped_column(String(128), unique=True, nullable=False)
+    chunk_index: Mapped[int] = mapped_column(nullable=False)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # sha256 of the chunk text
+    status: Mapped[str] = mapped_column(String(16), nullable=False)  # "pending", "active", "deleted"
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_document_chunks_document_id", "document_id"),
+        Index("ix_document_chunks_status_updated_at", "status", "updated_at"),
+    )
+
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
@@ -51,6 +84,10 @@ class ChatMessage(Base):
 
     )
 
+    __table_args__ = (
+        Index("ix_chat_messages_conversation_id_created_at", "conversation_id", "created_at"),
+    )
+
 
 class Conversation(Base):
     __tablename__ = "conversations"
@@ -59,6 +96,9 @@ class Conversation(Base):
     title : Mapped[str]= mapped_column(default="New conversation")
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(server_default=func.now() , onupdate= func.now())
+    # Running summary of the messages up to summarized_until_id
+    summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    summarized_until_id: Mapped[Optional[int]] = mapped_column(nullable=True)
 
     # Relation
     user:Mapped[User] = relationship(back_populates = "conversations")
@@ -67,6 +107,10 @@ class Conversation(Base):
         cascade = "all, delete-orphan"
     )
 
+    __table_args__ = (
+        Index("ix_conversations_user_id_created_at", "user_id", "created_at"),
+    )
+
 
 
 
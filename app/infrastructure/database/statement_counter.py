@@ -0,0 +1,37 @@
+from contextlib import contextmanager
+from typing import Iterator, List
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class StatementCounter:
+    """SQL statements sent to the database while a count_statements block is active"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_statements(engine) -> Iterator[StatementCounter]:
+    """
+    Count database round-trips of a block of code
+
+    with count_statements(engine) as counter:
+        await repo.get_messages(conversation_id)
+    assert counter.count == 1
+    """
+    sync_engine: Engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    counter = StatementCounter()
+    event.listen(sync_engine, "before_cursor_execute", counter._before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", counter._before_cursor_execute)
@@ -1,26 +1,54 @@
 # app/infrastructure/dependencies.py
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from functools import lru_cache
+from typing import AsyncIterator, Optional
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import Settings
-from app.infrastructure.database.session import get_db_session
+from app.core.metrics import LatencyRecorder
+from app.domain.chunking import create_chunker
+from app.infrastructure.database.session import SessionLocal, get_db_session
+from app.infrastructure.repositories.document_chunk_repository import DocumentChunkRepository
+from app.infrastructure.repositories.document_repository import DocumentRepository
+from app.infrastructure.repositories.conversation_repository import ConversationRepository
 
 # Adapters
 from app.infrastructure.llm.openai_adapter import OpenAIAdapter
 from app.infrastructure.llm.embedding_sentence_transformers import SentenceTransformerEmbeddingService
+from app.infrastructure.llm.openai_embedding import OpenAIEmbeddingService
+from app.infrastructure.llm.cached_embedding import CachedEmbeddingService, SQLiteEmbeddingStore
 from app.infrastructure.vector_stores.pinecone_adapter import PineconeAdapter
+from app.infrastructure.vector_stores.local_vector_store import LocalVectorStore
+from app.infrastructure.search.bm25_chunk_index import BM25ChunkIndex
+from app.infrastructure.cache.semantic_answer_cache import SemanticAnswerCache
+from app.infrastructure.cache.conversation_window_cache import ConversationWindowCache
+from app.infrastructure.llm.cross_encoder_reranker import CrossEncoderReranker
 
 # Services
 from app.application.services.document_service import DocumentService
 from app.application.services.chat_service import ChatService
+from app.application.services.vector_compaction import VectorCompactionJob
+from app.application.services.keyword_index_loader import KeywordIndexLoader
+from app.application.services.context_builder import ContextBuilder
+from app.application.services.token_counter import TokenCounter
+from app.application.services.reranking import ChainReranker, MMRReranker
+from app.application.services.query_expansion import QueryExpander
+from app.application.services.conversation_summarizer import ConversationSummarizer
 
 # Interfaces
 from app.application.interfaces.llm_services import ILLMService
 from app.application.interfaces.embedding_service import IEmbeddingService
 from app.application.interfaces.vector_store import IvectorStore
+from app.application.interfaces.keyword_index import IKeywordIndex
+from app.application.interfaces.answer_cache import IAnswerCache
+from app.application.interfaces.reranker import IReranker
+from app.application.interfaces.conversation_repository import IConversationRepository
+from app.application.interfaces.conversation_window_cache import IConversationWindowCache
 from app.application.interfaces.storage_service import IStorageService
 from app.application.interfaces.document_repository import IDocumentRepositroy
+from app.application.interfaces.document_chunk_repository import IDocumentChunkRepository
 
 
 @lru_cache()
@@ -44,24 +72,132 @@ def get_llm_service(settings:Settings = Depends(get_settings)) -> ILLMService:
         raise ValueError(f"Unknown LLM provider: {settings.LLM_PROVIDER}")
 
 
+@lru_cache()
+def get_local_embedding_service() -> SentenceTransformerEmbeddingService:
+    """
+    Load the model (and its worker pool) once per process
+    """
+    settings = get_settings()
+    return SentenceTransformerEmbeddingService(
+        model_name=settings.LOCAL_EMBEDDING_MODEL,
+        max_workers=settings.EMBEDDING_THREAD_POOL_SIZE,
+        dtype=settings.EMBEDDING_DTYPE
+    )
+
+
+def _build_embedding_backend(settings: Settings) -> IEmbeddingService:
+    if settings.EMBEDDING_PROVIDER == "local":
+        return get_local_embedding_service()
+
+    return OpenAIEmbeddingService(
+        model_name=settings.OPENAI_EMBEDDING_MODEL,
+        dtype=settings.EMBEDDING_DTYPE
+    )
+
+
+@lru_cache()
+def get_cached_embedding_service() -> CachedEmbeddingService:
+    """
+    Process-wide cache in front of the configured embedding provider
+    """
+    settings = get_settings()
+    disk_store = None
+    if settings.EMBEDDING_CACHE_PATH:
+        disk_store = SQLiteEmbeddingStore(settings.EMBEDDING_CACHE_PATH)
+
+    return CachedEmbeddingService(
+        backend=_build_embedding_backend(settings),
+        memory_size=settings.EMBEDDING_CACHE_MEMORY_SIZE,
+        disk_store=disk_store,
+        dtype=settings.EMBEDDING_DTYPE
+    )
+
+
 def get_embedding_service(
     settings: Settings = Depends(get_settings)
 ) -> IEmbeddingService:
-    return OpenAIEmbeddingService(
-        api_key=settings.OPENAI_API_KEY,
-        model="text-embedding-3-small"
+    if settings.EMBEDDING_CACHE_ENABLED:
+        return get_cached_embedding_service()
+
+    return _build_embedding_backend(settings)
+
+
+@lru_cache()
+def get_local_vector_store() -> LocalVectorStore:
+    """
+    Single in-process store shared by every request
+    (its state lives in memory, so it must not be rebuilt per request)
+    """
+    settings = get_settings()
+    return LocalVectorStore(
+        metric=settings.LOCAL_VECTOR_METRIC,
+        index_type=settings.LOCAL_VECTOR_INDEX_TYPE,
+        nlist=settings.LOCAL_VECTOR_IVF_NLIST,
+        nprobe=settings.LOCAL_VECTOR_IVF_NPROBE,
+        quantization=settings.LOCAL_VECTOR_QUANTIZATION,
+        pq_m=settings.LOCAL_VECTOR_PQ_M,
+        quantization_train_size=settings.LOCAL_VECTOR_QUANTIZATION_TRAIN_SIZE,
+        rerank_path=settings.LOCAL_VECTOR_RERANK_PATH or None,
+        rerank_factor=settings.LOCAL_VECTOR_RERANK_FACTOR
+    )
+
+
+@lru_cache()
+def get_pinecone_vector_store() -> PineconeAdapter:
+    """
+    One client and one thread pool per process, shared by every request
+    """
+    settings = get_settings()
+    return PineconeAdapter(
+        api_key=settings.PINECONE_API_KEY,
+        index_name=settings.PINECONE_INDEX_NAME,
+        batch_size=settings.VECTOR_UPSERT_BATCH_SIZE,
+        max_concurrency=settings.PINECONE_UPSERT_CONCURRENCY,
+        max_workers=settings.PINECONE_THREAD_POOL_SIZE,
+        delete_batch_size=settings.VECTOR_DELETE_BATCH_SIZE
     )
 
 
 def get_vector_store(
     settings: Settings = Depends(get_settings)
 ) -> IvectorStore:
-    return PineconeAdapter(
-        api_key=settings.PINECONE_API_KEY,
-        index_name=settings.PINECONE_INDEX_NAME
+    if settings.VECTOR_STORE_PROVIDER == "pinecone":
+        return get_pinecone_vector_store()
+    elif settings.VECTOR_STORE_PROVIDER == "local":
+        return get_local_vector_store()
+    else:
+        raise ValueError(f"Unknown vector store provider: {settings.VECTOR_STORE_PROVIDER}")
+
+
+@lru_cache()
+def get_keyword_index() -> IKeywordIndex:
+    """
+    In-process BM25 chunk index shared by ingestion and chat
+    (filled incrementally as documents are processed, reloaded on startup
+    by get_keyword_index_loader)
+    """
+    return BM25ChunkIndex()
+
+
+@lru_cache()
+def get_semantic_answer_cache() -> SemanticAnswerCache:
+    """Process-wide answer cache - shared so document changes invalidate chat answers"""
+    settings = get_settings()
+    return SemanticAnswerCache(
+        similarity_threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+        ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+        max_entries_per_user=settings.ANSWER_CACHE_MAX_ENTRIES_PER_USER,
+        max_users=settings.ANSWER_CACHE_MAX_USERS
     )
 
 
+def get_answer_cache(
+    settings: Settings = Depends(get_settings)
+) -> Optional[IAnswerCache]:
+    if settings.ANSWER_CACHE_ENABLED:
+        return get_semantic_answer_cache()
+    return None
+
 
 def get_document_repository(
     session: AsyncSession = Depends(get_db_session)
@@ -69,13 +205,177 @@ def get_document_repository(
     return DocumentRepository(session)
 
 
+def get_document_chunk_repository(
+    session: AsyncSession = Depends(get_db_session)
+) -> IDocumentChunkRepository:
+    return DocumentChunkRepository(session)
+
+
+def get_conversation_repository(
+    session: AsyncSession = Depends(get_db_session)
+) -> IConversationRepository:
+    return ConversationRepository(session)
+
+
+@lru_cache()
+def get_conversation_window_cache() -> ConversationWindowCache:
+    """Process-wide window of recent messages per conversation"""
+    settings = get_settings()
+    return ConversationWindowCache(
+        max_messages=settings.CONVERSATION_HISTORY_MESSAGES,
+        max_conversations=settings.CONVERSATION_WINDOW_CACHE_MAX_CONVERSATIONS,
+        ttl_seconds=settings.CONVERSATION_WINDOW_CACHE_TTL_SECONDS
+    )
+
+
+def get_window_cache(
+    settings: Settings = Depends(get_settings)
+) -> Optional[IConversationWindowCache]:
+    if settings.CONVERSATION_WINDOW_CACHE_ENABLED:
+        return get_conversation_window_cache()
+    return None
+
+
+@asynccontextmanager
+async def _chunk_registry_session() -> AsyncIterator[IDocumentChunkRepository]:
+    """Chunk registry on its own session (background jobs run outside requests)"""
+    async with SessionLocal() as session:
+        yield DocumentChunkRepository(session)
+
+
+@asynccontextmanager
+async def _document_session() -> AsyncIterator[IDocumentRepositroy]:
+    """Document repository on its own session (background jobs run outside requests)"""
+    async with SessionLocal() as session:
+        yield DocumentRepository(session)
+
+
+@asynccontextmanager
+async def _conversation_session() -> AsyncIterator[IConversationRepository]:
+    """Conversation repository on its own session (summaries are written after the response)"""
+    async with SessionLocal() as session:
+        yield ConversationRepository(session)
+
+
+@lru_cache()
+def get_conversation_summarizer() -> ConversationSummarizer:
+    """Process-wide - it tracks which conversations are being summarized"""
+    settings = get_settings()
+    return ConversationSummarizer(
+        llm_service=get_llm_service(settings),
+        repository_factory=_conversation_session,
+        window_cache=get_window_cache(settings),
+        trigger_messages=settings.CONVERSATION_SUMMARY_TRIGGER_MESSAGES,
+        keep_recent_messages=settings.CONVERSATION_SUMMARY_KEEP_RECENT_MESSAGES,
+        max_summary_words=settings.CONVERSATION_SUMMARY_MAX_WORDS
+    )
+
+
+@lru_cache()
+def get_keyword_index_loader() -> KeywordIndexLoader:
+    """
+    Process-wide - reloads the in-memory keyword index from the database
+    start() it on application startup
+    """
+    settings = get_settings()
+    return KeywordIndexLoader(
+        keyword_index=get_keyword_index(),
+        chunker=create_chunker(
+            strategy=settings.CHUNKING_STRATEGY,
+            chunk_size=settings.CHUNK_SIZE,
+            chunk_overlap=settings.CHUNK_OVERLAP
+        ),
+        document_repo_factory=_document_session,
+        registry_factory=_chunk_registry_session,
+        executor=get_extraction_executor()
+    )
+
+
+@lru_cache()
+def get_vector_compaction_job() -> VectorCompactionJob:
+    """
+    Process-wide orphaned-vector compaction
+    start() it on application startup, stop() it on shutdown
+    """
+    settings = get_settings()
+    return VectorCompactionJob(
+        registry_factory=_chunk_registry_session,
+        vector_store=get_vector_store(settings),
+        interval_seconds=settings.VECTOR_COMPACTION_INTERVAL_SECONDS,
+        batch_size=settings.VECTOR_DELETE_BATCH_SIZE,
+        pending_grace_seconds=settings.VECTOR_COMPACTION_GRACE_SECONDS
+    )
+
+
+@lru_cache()
+def get_context_builder() -> ContextBuilder:
+    """
+    Prompt assembly shared by every chat request (the tokenizer is loaded once)
+    Budget defaults to 4 x OPENAI_MAX_TOKENS - the prompt stays proportional to the answer size
+    """
+    settings = get_settings()
+    budget = settings.PROMPT_TOKEN_BUDGET or 4 * settings.OPENAI_MAX_TOKENS
+    history_tokens = int(budget * settings.PROMPT_HISTORY_SHARE)
+    return ContextBuilder(
+        token_counter=TokenCounter(model=settings.OPENAI_MODEL),
+        max_context_tokens=budget - history_tokens,
+        max_history_tokens=history_tokens,
+        dedup_threshold=settings.CONTEXT_DEDUP_THRESHOLD
+    )
+
+
+@lru_cache()
+def get_cross_encoder_reranker() -> CrossEncoderReranker:
+    """Cross-encoder model loaded once, with its own thread pool"""
+    settings = get_settings()
+    return CrossEncoderReranker(
+        model_name=settings.CROSS_ENCODER_MODEL,
+        max_workers=settings.CROSS_ENCODER_THREAD_POOL_SIZE,
+        batch_size=settings.CROSS_ENCODER_BATCH_SIZE
+    )
+
+
+def get_reranker(
+    settings: Settings = Depends(get_settings),
+    embedding_service: IEmbeddingService = Depends(get_embedding_service)
+) -> Optional[IReranker]:
+    """Re-ranking of the over-fetched candidates, None when RERANKER=none"""
+    if settings.RERANKER == "none":
+        return None
+    if settings.RERANKER == "mmr":
+        return MMRReranker(embedding_service, lambda_mult=settings.MMR_LAMBDA)
+    if settings.RERANKER == "cross_encoder":
+        return get_cross_encoder_reranker()
+    if settings.RERANKER == "cross_encoder_mmr":
+        return ChainReranker([
+            get_cross_encoder_reranker(),
+            MMRReranker(embedding_service, lambda_mult=settings.MMR_LAMBDA)
+        ])
+    raise ValueError(f"Unknown reranker: {settings.RERANKER}")
+
+
+@lru_cache()
+def get_latency_recorder() -> LatencyRecorder:
+    """Process-wide latency percentiles (embed / search / generate / TTFT)"""
+    return LatencyRecorder(window=get_settings().LATENCY_WINDOW_SIZE)
+
+
+@lru_cache()
+def get_extraction_executor() -> ProcessPoolExecutor:
+    """Process pool for CPU-bound PDF/DOCX text extraction"""
+    return ProcessPoolExecutor(max_workers=get_settings().EXTRACTION_WORKERS)
+
+
 # --- Application Service Providers ---
 
 def get_document_service(
     document_repo: IDocumentRepository = Depends(get_document_repository),
     embedding_service: IEmbeddingService = Depends(get_embedding_service),
     vector_store: IVectorStore = Depends(get_vector_store),
-    storage_service: IStorageService = Depends(get_storage_service)
+    storage_service: IStorageService = Depends(get_storage_service),
+    answer_cache: Optional[IAnswerCache] = Depends(get_answer_cache),
+    chunk_registry: IDocumentChunkRepository = Depends(get_document_chunk_repository),
+    settings: Settings = Depends(get_settings)
 ) -> DocumentService:
     """
     All dependencies injected automatically!
@@ -85,17 +385,54 @@ def get_document_service(
         document_repo=document_repo,
         embedding_service=embedding_service,
         vector_store=vector_store,
-        storage_service=storage_service
+        storage_service=storage_service,
+        chunker=create_chunker(
+            strategy=settings.CHUNKING_STRATEGY,
+            chunk_size=settings.CHUNK_SIZE,
+            chunk_overlap=settings.CHUNK_OVERLAP
+        ),
+        extraction_executor=get_extraction_executor(),
+        pdf_pages_per_task=settings.PDF_PAGES_PER_TASK,
+        embed_batch_size=settings.EMBEDDING_BATCH_SIZE,
+        ingestion_queue_size=settings.INGESTION_QUEUE_SIZE,
+        embed_concurrency=settings.INGESTION_EMBED_CONCURRENCY,
+        keyword_index=get_keyword_index(),
+        answer_cache=answer_cache,
+        chunk_registry=chunk_registry,
+        vector_delete_batch_size=settings.VECTOR_DELETE_BATCH_SIZE
     )
 
 
 def get_chat_service(
     llm_service: ILLMService = Depends(get_llm_service),
     embedding_service: IEmbeddingService = Depends(get_embedding_service),
-    vector_store: IVectorStore = Depends(get_vector_store)
+    vector_store: IVectorStore = Depends(get_vector_store),
+    answer_cache: Optional[IAnswerCache] = Depends(get_answer_cache),
+    reranker: Optional[IReranker] = Depends(get_reranker),
+    conversation_repo: IConversationRepository = Depends(get_conversation_repository),
+    window_cache: Optional[IConversationWindowCache] = Depends(get_window_cache),
+    settings: Settings = Depends(get_settings)
 ) -> ChatService:
     return ChatService(
         llm_service=llm_service,
         embedding_service=embedding_service,
-        vector_store=vector_store
+        vector_store=vector_store,
+        metrics=get_latency_recorder() if settings.ENABLE_METRICS else None,
+        keyword_index=get_keyword_index(),
+        retrieval_mode=settings.RETRIEVAL_MODE,
+        rrf_k=settings.RRF_K,
+        answer_cache=answer_cache,
+        context_builder=get_context_builder(),
+        reranker=reranker,
+        rerank_candidates=settings.RERANK_CANDIDATES,
+        query_expander=QueryExpander(
+            llm_service,
+            max_variants=settings.QUERY_EXPANSION_MAX_VARIANTS,
+            timeout_seconds=settings.QUERY_EXPANSION_TIMEOUT_SECONDS
+        ) if settings.QUERY_EXPANSION_ENABLED else None,
+        fanout_timeout_seconds=settings.QUERY_FANOUT_TIMEOUT_SECONDS,
+        conversation_repo=conversation_repo,
+        window_cache=window_cache,
+        history_window_messages=settings.CONVERSATION_HISTORY_MESSAGES,
+        summarizer=get_conversation_summarizer() if settings.CONVERSATION_SUMMARY_ENABLED else None
     )
\ No newline at end of file
@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from app.application.interfaces.embedding_service import IEmbeddingService
+from app.domain.entities.embedding import Embedding
+
+
+def content_hash(text: str) -> str:
+    """sha256 of the text - the content address of an embedding"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SQLiteEmbeddingStore:
+    """
+    On-disk embedding tier
+    One row per (model, sha256(text)), vector stored as raw float32 bytes
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    _MAX_PARAMS = 500
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, digest)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, digests: List[str]) -> Dict[str, np.ndarray]:
+        """Look up many digests in as few queries as possible"""
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for start in range(0, len(digests), self._MAX_PARAMS):
+                batch = digests[start:start + self._MAX_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT digest, vector FROM embeddings WHERE model = ? AND digest IN ({placeholders})",
+                    [model, *batch],
+                ).fetchall()
+                for digest, blob in rows:
+                    found[digest] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, items: List[Tuple[str, np.ndarray]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, digest, vector) VALUES (?, ?, ?)",
+                [(model, digest, np.asarray(vector, dtype=np.float32).tobytes()) for digest, vector in items],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddingService(IEmbeddingService):
+    """
+    Caching decorator for any IEmbeddingService
+    - keyed by (model, sha256(text)), so identical text is never embedded twice
+    - in-memory LRU tier in front of an optional SQLite tier on disk
+    - batch-aware: create_embeddings_batch only sends cache misses to the backend
+    """
+
+    def __init__(
+        self,
+        backend: IEmbeddingService,
+        model_name: Optional[str] = None,
+        memory_size: int = 10000,
+        disk_store: Optional[SQLiteEmbeddingStore] = None,
+        dtype: str = "float32"
+    ):
+        self.backend = backend
+        self.model_name = model_name or getattr(backend, "model_name", type(backend).__name__)
+        self.memory_size = memory_size
+        self.disk_store = disk_store
+        # dtype of the vectors held in memory and returned (the disk tier is always float32)
+        self.dtype = np.dtype(dtype)
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+        # Counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def create_embedding(self, text: str) -> Embedding:
+        """Create embedding for a single text (cached)"""
+        embeddings = await self.create_embeddings_batch([text])
+        return embeddings[0]
+
+    async def create_embeddings_batch(self, texts: List[str]) -> List[Embedding]:
+        """
+        1. Look up every text in memory
+        2. Look up the remainder on disk (one query)
+        3. Embed the unique misses with the backend (one batch call)
+        4. Write the new vectors back to both tiers
+        """
+        digests = [content_hash(text) for text in texts]
+        vectors: Dict[str, np.ndarray] = {}
+
+        # 1. memory tier
+        for digest in digests:
+            if digest in vectors:
+                continue
+            vector = self._memory.get(digest)
+            if vector is not None:
+                self._memory.move_to_end(digest)
+                vectors[digest] = vector
+                self.memory_hits += 1
+
+        # 2. disk tier
+        pending = [digest for digest in dict.fromkeys(digests) if digest not in vectors]
+        if pending and self.disk_store is not None:
+            from_disk = await asyncio.to_thread(self.disk_store.get_many, self.model_name, pending)
+            self.disk_hits += len(from_disk)
+            for digest, vector in from_disk.items():
+                vectors[digest] = self._remember(digest, vector)
+            pending = [digest for digest in pending if digest not in from_disk]
+
+        # 3. backend, only for unique misses
+        if pending:
+            self.misses += len(pending)
+            text_by_digest = dict(zip(digests, texts))
+            computed = await self.backend.create_embeddings_batch(
+                [text_by_digest[digest] for digest in pending]
+            )
+
+            new_items = []
+            for digest, embedding in zip(pending, computed):
+                vector = self._remember(digest, embedding.vector)
+                vectors[digest] = vector
+                new_items.append((digest, vector))
+
+            # 4. persist
+            if self.disk_store is not None:
+                await asyncio.to_thread(self.disk_store.put_many, self.model_name, new_items)
+
+        # The cached arrays themselves, not copies
+        return [
+            Embedding(vector=vectors[digest], model=self.model_name, text=text)
+            for digest, text in zip(digests, texts)
+        ]
+
+    def stats(self) -> Dict:
+        """Hit/miss counters for monitoring"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def _remember(self, digest: str, vector) -> np.ndarray:
+        """
+        Insert a copy into the LRU tier, evicting the least recently used entry.
+        Backends often return rows of one batch matrix (and the disk tier a view
+        of the blob) - a cached view would keep the whole buffer alive
+        """
+        vector = np.array(vector, dtype=self.dtype, copy=True)
+        # Shared by every Embedding returned for this text from now on
+        vector.flags.writeable = False
+        self._memory[digest] = vector
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+        return vector
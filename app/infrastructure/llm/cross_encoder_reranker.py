@@ -0,0 +1,62 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional
+from sentence_transformers import CrossEncoder
+from app.application.interfaces.reranker import IReranker
+from app.core.metrics import StageTimer
+from app.domain.entities.embedding import Embedding
+
+
+class CrossEncoderReranker(IReranker):
+    """
+    Local cross-encoder re-ranking: the model reads question and chunk
+    together, which ranks far better than comparing two embeddings but costs
+    one forward pass per candidate - so it only sees the over-fetched candidates
+    """
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        max_workers: int = 1,
+        batch_size: int = 32,
+        executor: Optional[Executor] = None
+    ):
+        """
+        max_workers: predict() calls allowed to run at the same time
+        executor: share an existing pool instead of creating one
+        """
+        self.model = CrossEncoder(model_name)
+        self.model_name = model_name
+        self.batch_size = batch_size
+        # predict() is CPU/GPU bound and blocking; torch releases the GIL
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="cross-encoder"
+        )
+
+    async def rerank(
+        self,
+        question: str,
+        question_embedding: Optional[Embedding],
+        candidates: List[Dict],
+        top_k: int,
+        timer: Optional[StageTimer] = None
+    ) -> List[Dict]:
+        if not candidates:
+            return []
+        timer = timer or StageTimer()
+
+        pairs = [(question, candidate["metadata"]["text"]) for candidate in candidates]
+        loop = asyncio.get_running_loop()
+        with timer.stage("cross_encoder"):
+            scores = await loop.run_in_executor(
+                self.executor,
+                partial(self.model.predict, pairs, batch_size=self.batch_size, convert_to_numpy=True)
+            )
+
+        ranked = sorted(zip(candidates, scores), key=lambda item: item[1], reverse=True)[:top_k]
+        return [
+            {**candidate, "score": float(score), "retrieval_score": candidate["score"]}
+            for candidate, score in ranked
+        ]
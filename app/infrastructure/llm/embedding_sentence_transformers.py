@@ -1,4 +1,8 @@
-from typing import List
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import List, Optional
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from app.application.interfaces.embedding_service import IEmbeddingService
 from app.domain.entities.embedding import Embedding
@@ -10,36 +14,64 @@ class SentenceTransformerEmbeddingService(IEmbeddingService):
     Free, runs on your hardware, no API costs!
     """
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        max_workers: int = 2,
+        executor: Optional[Executor] = None,
+        dtype: str = "float32"
+    ):
         """
         Popular models:
         - all-MiniLM-L6-v2: Fast, 384 dimensions
         - all-mpnet-base-v2: Better quality, 768 dimensions
         - multi-qa-mpnet-base-dot-v1: Good for Q&A
+
+        max_workers: encode() calls allowed to run at the same time
+        executor: share an existing pool instead of creating one
+        dtype: float32, or float16 to halve the memory of every vector
         """
         self.model = SentenceTransformer(model_name)
         self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        # encode() is CPU/GPU bound and blocking. Torch releases the GIL while
+        # it runs, so a small thread pool keeps the event loop free without
+        # loading a copy of the model into every worker process
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="sentence-transformers"
+        )
 
     async def create_embedding(self, text: str) -> Embedding:
         """Create embedding for a single text"""
-        vector = self.model.encode(text , convert_to_numpy = True)
+        vector = await self._encode(text)
 
         return Embedding(
-            vector=vector.tolist(),
+            vector=vector,
             model=self.model_name,
             text=text
         )
     
     async def create_embeddings_batch(self, texts: List[str]) -> List[Embedding]:
         """Create embeddings for multiple texts"""
-        # Batch encoding is more efficient
-        vectors = self.model.encode(texts, convert_to_numpy=True)
+        # Batch encoding is more efficient. Every Embedding gets a row view
+        # of the (n, dim) matrix - no per-vector copy
+        vectors = await self._encode(texts)
         
         return [
             Embedding(
-                vector=vector.tolist(),
+                vector=vector,
                 model=self.model_name,
                 text=texts[i]
             )
             for i, vector in enumerate(vectors)
-        ]
\ No newline at end of file
+        ]
+
+    async def _encode(self, texts):
+        """Run model.encode on the worker pool"""
+        loop = asyncio.get_running_loop()
+        vectors = await loop.run_in_executor(
+            self.executor,
+            partial(self.model.encode, texts, convert_to_numpy=True)
+        )
+        return vectors.astype(self.dtype, copy=False)
\ No newline at end of file
@@ -1,13 +1,15 @@
 from app.domain.entities.embedding import Embedding
 from typing import List
+import numpy as np
 from openai import AsyncOpenAI
 from app.application.interfaces.embedding_service import IEmbeddingService
 from app.domain.exceptions import EmbeddingError
 class OpenAIEmbeddingService(IEmbeddingService):
     """OpenAI embedding serice """
 
-    def __init__(self , model_name:str = "text-embedding-3-small"):
+    def __init__(self , model_name:str = "text-embedding-3-small" , dtype:str = "float32"):
         self.model_name = model_name
+        self.dtype = np.dtype(dtype)
         self.client = AsyncOpenAI()
         
 
@@ -16,7 +18,7 @@ class OpenAIEmbeddingService(IEmbeddingService):
             input= text , 
             model = self.model_name
         )
-        vector =  response.data[0].embedding
+        vector =  np.asarray(response.data[0].embedding , dtype=self.dtype)
         return Embedding(
             vector=vector , 
             model = self.model_name , 
@@ -25,21 +27,21 @@ class OpenAIEmbeddingService(IEmbeddingService):
 
     async def create_embeddings_batch(self ,texts:List[str]) -> List[Embedding]:
         """Create embedding for multiple texts"""
-        vectors = []
-
         response = await self.client.embeddings.create(
                     input=texts ,
                     model=self.model_name
                 )
 
-        for i , embedding_data in enumerate(response.data):
-                vectors.append(
-                    Embedding(
-                        vector=embedding_data.embedding,
-                        model= self.model_name,
-                        text=texts[i]
-                    )
-                ) 
-
-
-        return vectors
\ No newline at end of file
+        # One (n, dim) matrix for the batch; every Embedding holds a row view of it
+        matrix = np.array(
+            [embedding_data.embedding for embedding_data in response.data],
+            dtype=self.dtype
+        )
+        return [
+            Embedding(
+                vector=matrix[i],
+                model= self.model_name,
+                text=texts[i]
+            )
+            for i in range(len(texts))
+        ]
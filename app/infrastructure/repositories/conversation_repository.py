@@ -1,10 +1,13 @@
 from typing import List , Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select , delete as sql_delete ,func
+from sqlalchemy.orm import aliased , selectinload
+from sqlalchemy import insert , literal , select , delete as sql_delete ,func , true , tuple_ , update
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
 from app.domain.exceptions import ConversationNotFoundError
+from app.domain.pagination import Page
+from app.infrastructure.repositories.keyset import check_page_limit , decode_keyset_cursor , keyset_page
 
 
 from app.application.interfaces.conversation_repository import IConversationRepository
@@ -82,21 +85,18 @@ class ConversationRepository(IConversationRepository):
     async def exists(self , conversation_id:str) -> bool :
         """Check if conversation exists"""
         result = await self.session.execute(
-            select(DBConversation)
+            select(literal(1))
             .where(DBConversation.id == int(conversation_id))
+            .limit(1)
         )
-        db_conversation  = result.scalar_one_or_none()
-
-        if db_conversation is None:
-            return False
-
-        return True
+        return result.first() is not None
 
     async def list_by_user(self, user_id: str, limit: int = 50, offset: int = 0) -> List[DomainConversation]:
-        """List conversations for a user with pagination (without messages)"""
+        """List conversations for a user with pagination (without messages, newest first)"""
         result = await self.session.execute(
             select(DBConversation)
             .where(DBConversation.user_id == int(user_id))
+            .order_by(DBConversation.created_at.desc(), DBConversation.id.desc())
             .offset(offset)
             .limit(limit)
         )
@@ -106,6 +106,25 @@ class ConversationRepository(IConversationRepository):
             return []
 
         return [self._to_domain(con , include_messages=False) for con in db_conversations]
+
+    async def list_page_by_user(self, user_id: str, limit: int = 50, cursor: Optional[str] = None) -> Page[DomainConversation]:
+        """Keyset pagination over a user's conversations (without messages, newest first)"""
+        check_page_limit(limit)
+        query = (
+            select(DBConversation)
+            .where(DBConversation.user_id == int(user_id))
+            .order_by(DBConversation.created_at.desc(), DBConversation.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            created_at, conversation_id = decode_keyset_cursor(cursor)
+            query = query.where(
+                tuple_(DBConversation.created_at, DBConversation.id) < tuple_(created_at, conversation_id)
+            )
+
+        db_conversations = (await self.session.execute(query)).scalars().all()
+        return keyset_page(db_conversations, limit,
+                           lambda con: self._to_domain(con, include_messages=False))
         
     async def count_by_user(self, user_id: str) -> int:
         """Count total conversations for a user"""
@@ -117,56 +136,169 @@ class ConversationRepository(IConversationRepository):
         return count
 
     async def add_message(self, conversation_id: str, message: DomainChatMessage) -> DomainChatMessage:
-        """Add a single message to a conversation"""
-        is_exist = await self.exists(conversation_id)
-        if not is_exist:
-            raise ConversationNotFoundError()
-            
-        db_message = DBChatMessage(
-            conversation_id = int(conversation_id),
-            role = MessageRole(message.role) ,
-            content = message.content,
-            created_at = message.created_at
+        """
+        Add a single message to a conversation
+        INSERT ... SELECT FROM conversations: the row is only inserted when the
+        conversation exists, so the check and the write are one statement
+        """
+        values = {
+            "conversation_id": DBConversation.id,
+            "role": literal(MessageRole(message.role).value),
+            "content": literal(message.content),
+        }
+        if message.created_at is not None:
+            values["created_at"] = literal(message.created_at)
+
+        result = await self.session.execute(
+            insert(DBChatMessage)
+            .from_select(
+                list(values),
+                select(*values.values()).where(DBConversation.id == int(conversation_id))
+            )
+            .returning(DBChatMessage.id, DBChatMessage.created_at)
         )
-        self.session.add(db_message)
+        row = result.first()
+        if row is None:
+            await self.session.rollback()
+            raise ConversationNotFoundError()
+
         await self.session.commit()
-        await self.session.refresh(db_message)
-        return self._message_to_domain(db_message)
+        return DomainChatMessage(
+            role=MessageRole(message.role),
+            content=message.content,
+            id=str(row.id),
+            created_at=row.created_at
+        )
         
 
-    async def get_messages(self, conversation_id: str, limit: int = 100, offset: int = 0) -> List[DomainChatMessage]:
-        """Get messages for a conversation with pagination"""
-        is_exist = await self.exists(conversation_id)
-        if not is_exist:
+    async def add_messages(self, conversation_id: str, messages: List[DomainChatMessage]) -> List[DomainChatMessage]:
+        """
+        Add several messages to a conversation in one transaction
+        One multi-row INSERT whose conversation_id is a scalar subquery: a
+        missing conversation yields NULL, which the NOT NULL column rejects,
+        so either every message is inserted or none
+        """
+        if not messages:
+            return []
+
+        conversation = (
+            select(DBConversation.id)
+            .where(DBConversation.id == int(conversation_id))
+            .scalar_subquery()
+        )
+        try:
+            result = await self.session.execute(
+                insert(DBChatMessage)
+                .values([
+                    {
+                        "conversation_id": conversation,
+                        "role": MessageRole(message.role).value,
+                        "content": message.content,
+                        "created_at": message.created_at if message.created_at is not None else func.now(),
+                    }
+                    for message in messages
+                ])
+                .returning(DBChatMessage.id, DBChatMessage.created_at)
+            )
+            # Ids are assigned in VALUES order, i.e. in the order of messages
+            rows = sorted(result.all(), key=lambda row: row.id)
+        except IntegrityError:
+            await self.session.rollback()
             raise ConversationNotFoundError()
 
-        result = await self.session.execute(
+        if len(rows) != len(messages):
+            await self.session.rollback()
+            raise ConversationNotFoundError()
+
+        await self.session.commit()
+        return [
+            DomainChatMessage(
+                role=MessageRole(message.role),
+                content=message.content,
+                id=str(row.id),
+                created_at=row.created_at
+            )
+            for message, row in zip(messages, rows)
+        ]
+
+    async def update_summary(self, conversation_id: str, summary: str, summarized_until_id: str) -> None:
+        """
+        Store the running summary of every message up to summarized_until_id
+        Never moves backwards: a slower, older summarization run is ignored
+        """
+        await self.session.execute(
+            update(DBConversation)
+            .where(DBConversation.id == int(conversation_id))
+            .where(
+                (DBConversation.summarized_until_id.is_(None))
+                | (DBConversation.summarized_until_id < int(summarized_until_id))
+            )
+            .values(summary=summary, summarized_until_id=int(summarized_until_id))
+        )
+        await self.session.commit()
+
+    async def get_messages(self, conversation_id: str, limit: int = 100, offset: int = 0) -> List[DomainChatMessage]:
+        """Get messages for a conversation with pagination"""
+        page = (
             select(DBChatMessage)
             .where(DBChatMessage.conversation_id == int(conversation_id))
-            .order_by(DBChatMessage.created_at.asc())
+            .order_by(DBChatMessage.created_at.asc(), DBChatMessage.id.asc())
             .offset(offset)
             .limit(limit)
         )
+        return await self._fetch_page(conversation_id, page)
 
-        db_messages = result.scalars().all()
-        return [self._message_to_domain(msg) for msg in db_messages]
+    async def get_messages_page(self, conversation_id: str, limit: int = 100, cursor: Optional[str] = None) -> Page[DomainChatMessage]:
+        """Keyset pagination over a conversation's messages (chronological)"""
+        check_page_limit(limit)
+        page = (
+            select(DBChatMessage)
+            .where(DBChatMessage.conversation_id == int(conversation_id))
+            .order_by(DBChatMessage.created_at.asc(), DBChatMessage.id.asc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            created_at, message_id = decode_keyset_cursor(cursor)
+            page = page.where(tuple_(DBChatMessage.created_at, DBChatMessage.id) > tuple_(created_at, message_id))
+
+        db_messages = await self._fetch_page(conversation_id, page, to_domain=False)
+        return keyset_page(db_messages, limit, self._message_to_domain)
 
     async def get_recent_messages(self, conversation_id: str, limit: int = 50) -> List[DomainChatMessage]:
         """Get the most recent N messages from a conversation"""
-        is_exist = await self.exists(conversation_id)
-        if not is_exist:
-            raise ConversationNotFoundError()
-
-        result = await self.session.execute(
+        page = (
             select(DBChatMessage)
             .where(DBChatMessage.conversation_id == int(conversation_id))
-            .order_by(DBChatMessage.created_at.desc())
+            .order_by(DBChatMessage.created_at.desc(), DBChatMessage.id.desc())
             .limit(limit)
         )
+        # Returned in chronological order (oldest to newest)
+        return await self._fetch_page(conversation_id, page)
+
+    async def _fetch_page(self, conversation_id: str, page, to_domain: bool = True) -> List:
+        """
+        Run a page of messages in the same round-trip as the existence check:
+        conversations LEFT JOIN (page) - no row at all means no conversation,
+        a single row with NULL message columns means an empty page
+        """
+        page = page.subquery()
+        message = aliased(DBChatMessage, page)
+        result = await self.session.execute(
+            select(DBConversation.id, message)
+            .select_from(DBConversation)
+            .outerjoin(page, true())
+            .where(DBConversation.id == int(conversation_id))
+            .order_by(page.c.created_at.asc(), page.c.id.asc())
+        )
 
-        db_messages = result.scalars().all()
-        # Reverse to get chronological order (oldest to newest)
-        return [self._message_to_domain(msg) for msg in reversed(db_messages)]
+        rows = result.all()
+        if not rows:
+            raise ConversationNotFoundError()
+
+        db_messages = [row[1] for row in rows if row[1] is not None]
+        if not to_domain:
+            return db_messages
+        return [self._message_to_domain(msg) for msg in db_messages]
 
 
 
@@ -210,7 +342,12 @@ class ConversationRepository(IConversationRepository):
             title=db_conversation.title,
             created_at=db_conversation.created_at,
             updated_at = db_conversation.updated_at,
-            messages = messages
+            messages = messages,
+            summary = db_conversation.summary,
+            summarized_until_id = (
+                str(db_conversation.summarized_until_id)
+                if db_conversation.summarized_until_id is not None else None
+            )
             
 
         )
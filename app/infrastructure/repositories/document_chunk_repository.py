@@ -0,0 +1,145 @@
+from datetime import timedelta
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_ , delete as sql_delete , func , insert , or_ , select , update
+
+from app.application.interfaces.document_chunk_repository import IDocumentChunkRepository
+from app.infrastructure.database.models import DocumentChunk as DBDocumentChunk
+
+
+PENDING = "pending"
+ACTIVE = "active"
+DELETED = "deleted"
+
+
+class DocumentChunkRepository(IDocumentChunkRepository):
+    """
+    SQLAlchemy implementation of the chunk registry
+    """
+
+    # Bound parameters per IN (...) list
+    _MAX_PARAMS = 500
+
+    def __init__(self , session:AsyncSession):
+        self.session = session
+
+    async def add_pending(self, chunks: List[Dict]) -> None:
+        """One bulk INSERT for the whole batch"""
+        if not chunks:
+            return
+
+        # Chunk ids are content addressed: text that was removed from a document
+        # and comes back reuses the id of a row that may not be purged yet
+        chunk_ids = [chunk["id"] for chunk in chunks]
+        for start in range(0, len(chunk_ids), self._MAX_PARAMS):
+            await self.session.execute(
+                sql_delete(DBDocumentChunk)
+                .where(
+                    DBDocumentChunk.chunk_id.in_(chunk_ids[start:start + self._MAX_PARAMS]),
+                    DBDocumentChunk.status != ACTIVE
+                )
+            )
+
+        await self.session.execute(
+            insert(DBDocumentChunk),
+            [
+                {
+                    "document_id": chunk["metadata"]["document_id"],
+                    "user_id": str(chunk["metadata"]["user_id"]),
+                    "chunk_id": chunk["id"],
+                    "chunk_index": chunk["metadata"]["chunk_index"],
+                    "content_hash": chunk["metadata"].get("content_hash"),
+                    "status": PENDING,
+                }
+                for chunk in chunks
+            ]
+        )
+        await self.session.commit()
+
+    async def activate(self, document_id: str) -> None:
+        await self._set_status(document_id, ACTIVE, only=PENDING)
+
+    async def mark_deleted(self, document_id: str) -> None:
+        await self._set_status(document_id, DELETED)
+
+    async def mark_chunks_deleted(self, chunk_ids: List[str]) -> None:
+        for start in range(0, len(chunk_ids), self._MAX_PARAMS):
+            await self.session.execute(
+                update(DBDocumentChunk)
+                .where(DBDocumentChunk.chunk_id.in_(chunk_ids[start:start + self._MAX_PARAMS]))
+                .values(status=DELETED, updated_at=func.now())
+            )
+        await self.session.commit()
+
+    async def discard_pending(self, document_id: str) -> List[str]:
+        result = await self.session.execute(
+            update(DBDocumentChunk)
+            .where(DBDocumentChunk.document_id == document_id, DBDocumentChunk.status == PENDING)
+            .values(status=DELETED, updated_at=func.now())
+            .returning(DBDocumentChunk.chunk_id)
+        )
+        chunk_ids = list(result.scalars().all())
+        await self.session.commit()
+        return chunk_ids
+
+    async def get_chunk_hashes(self, document_id: str) -> Dict[str, Optional[str]]:
+        result = await self.session.execute(
+            select(DBDocumentChunk.chunk_id, DBDocumentChunk.content_hash)
+            .where(DBDocumentChunk.document_id == document_id, DBDocumentChunk.status == ACTIVE)
+        )
+        return {chunk_id: content_hash for chunk_id, content_hash in result.all()}
+
+    async def get_chunk_ids(self, document_id: str) -> List[str]:
+        result = await self.session.execute(
+            select(DBDocumentChunk.chunk_id)
+            .where(DBDocumentChunk.document_id == document_id)
+            .order_by(DBDocumentChunk.chunk_index)
+        )
+        return list(result.scalars().all())
+
+    async def count_by_document(self, document_id: str) -> int:
+        result = await self.session.execute(
+            select(func.count(DBDocumentChunk.id)).where(DBDocumentChunk.document_id == document_id)
+        )
+        return result.scalar_one()
+
+    async def list_reclaimable(self, pending_grace_seconds: float, limit: int = 1000) -> List[str]:
+        result = await self.session.execute(
+            select(DBDocumentChunk.chunk_id)
+            .where(or_(
+                DBDocumentChunk.status == DELETED,
+                and_(DBDocumentChunk.status == PENDING,
+                     DBDocumentChunk.updated_at < self._seconds_ago(pending_grace_seconds))
+            ))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def purge(self, chunk_ids: List[str]) -> None:
+        for start in range(0, len(chunk_ids), self._MAX_PARAMS):
+            await self.session.execute(
+                sql_delete(DBDocumentChunk)
+                .where(DBDocumentChunk.chunk_id.in_(chunk_ids[start:start + self._MAX_PARAMS]))
+            )
+        await self.session.commit()
+
+    def _seconds_ago(self, seconds: float):
+        """
+        now() - seconds on the database clock: updated_at is written by the database
+        (naive, in the server's time zone on PostgreSQL), so the cutoff must be too
+        """
+        if self.session.get_bind().dialect.name == "sqlite":
+            return func.datetime("now", f"{-seconds} seconds")
+        return func.now() - timedelta(seconds=seconds)
+
+    async def _set_status(self, document_id: str, status: str, only: str = None) -> None:
+        query = (
+            update(DBDocumentChunk)
+            .where(DBDocumentChunk.document_id == document_id)
+            .values(status=status, updated_at=func.now())
+        )
+        if only is not None:
+            query = query.where(DBDocumentChunk.status == only)
+        await self.session.execute(query)
+        await self.session.commit()
+
@@ -1,45 +1,105 @@
-from typing import List , Optional
+from typing import List , Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select , delete  as sql_delete , func
+from sqlalchemy import inspect , select , delete  as sql_delete , func , literal_column , tuple_
+from sqlalchemy.orm import defer
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from datetime import datetime
 
 
 from app.domain.exceptions import DocumentNotFoundError
+from app.domain.pagination import Page
 
 from app.application.interfaces.document_repository import IDocumentRepositroy
-from app.domain.entities.document import Document as DomainDocument
+from app.domain.entities.document import CONTENT_PREVIEW_LENGTH , Document as DomainDocument
 from app.infrastructure.database.models import Document as DBDocument 
+from app.infrastructure.search.inverted_index import InvertedIndex
+from app.infrastructure.repositories.keyset import check_page_limit , decode_keyset_cursor , keyset_page
+
+
+# Generated tsvector column (GIN indexed) that only exists on PostgreSQL - see the
+# add_document_search_vector migration. Not mapped on the model so create_all
+# still works on SQLite
+_search_vector = literal_column("documents.search_vector", type_=TSVECTOR)
+
+# Keyword index used when the database has no full-text search (SQLite/tests).
+# Shared by every repository instance: a user's documents are loaded into it on
+# their first search and kept in sync by save/save_many/delete afterwards
+_keyword_index = InvertedIndex()
+_indexed_users: Set[int] = set()
 
 
 class DocumentRepository(IDocumentRepositroy):
     """
     SQLAlchemy implementation of document repositroy
     """
-    def __init__(self , session:AsyncSession):
+    def __init__(self , session:AsyncSession , keyword_index:Optional[InvertedIndex] = None):
         self.session = session
+        self.keyword_index = keyword_index or _keyword_index
+        self._indexed_users = _indexed_users if keyword_index is None else set()
 
     async def save(self , document :DomainDocument) -> DomainDocument:
-        """Save or update a document"""
-        # Convert domain entity to database model
-        db_document = DBDocument(
-            id = int(document.id) if document.id else None,
-            filename = document.filename ,
-            content = document.content , 
-            user_id = int(document.user_id),
-            created_at = document.created_at
-        )
-
-        self.session.add(db_document)
+        """
+        Save or update a document
+        id None inserts a new row (the database assigns the id); otherwise the
+        existing row is updated in place - a document keeps its id across versions
+        """
+        if document.id is None:
+            db_document = DBDocument(
+                filename = document.filename ,
+                content = document.content , 
+                content_preview = document.content[:CONTENT_PREVIEW_LENGTH],
+                user_id = int(document.user_id),
+                created_at = document.created_at
+            )
+            self.session.add(db_document)
+        else:
+            # Re-upload of an existing document - UPDATE the row instead of inserting it again
+            db_document = await self.session.get(DBDocument, int(document.id))
+            if db_document is None:
+                raise DocumentNotFoundError(f"Document {document.id} not found")
+            db_document.filename = document.filename
+            db_document.content = document.content
+            db_document.content_preview = document.content[:CONTENT_PREVIEW_LENGTH]
         await self.session.commit()
         await self.session.refresh(db_document)
+        self._index_document(db_document)
 
         return self._to_domain(db_document)
 
 
-    async def get_by_id(self , document_id :str) -> Optional[DomainDocument]:
+    async def save_many(self, documents: List[DomainDocument]) -> List[DomainDocument]:
+        """Insert many new documents (id None) in a single transaction (one commit)"""
+        db_documents = [
+            DBDocument(
+                filename = document.filename ,
+                content = document.content , 
+                content_preview = document.content[:CONTENT_PREVIEW_LENGTH],
+                user_id = int(document.user_id),
+                created_at = document.created_at
+            )
+            for document in documents
+        ]
+
+        self.session.add_all(db_documents)
+        try:
+            # flush sends the batched INSERTs and assigns primary keys
+            await self.session.flush()
+            saved = [self._to_domain(db_document) for db_document in db_documents]
+            await self.session.commit()
+        except Exception:
+            await self.session.rollback()
+            raise
+
+        for db_document in db_documents:
+            self._index_document(db_document)
+
+        return saved
+
+
+    async def get_by_id(self , document_id :str , load_content:bool = True) -> Optional[DomainDocument]:
         """Get document by ID"""
         result = await self.session.execute(
-            select(DBDocument).where(DBDocument.id == int(document_id))
+            self._select(load_content).where(DBDocument.id == int(document_id))
         )
 
         db_document = result.scalar_one_or_none()
@@ -48,25 +108,30 @@ class DocumentRepository(IDocumentRepositroy):
 
         return self._to_domain(db_document)
 
-    async def get_by_filename(self, filename: str, user_id: str) -> Optional[DomainDocument]:
-        """Get document by filename for a specific user"""
+    async def get_by_filename(self, filename: str, user_id: str, load_content: bool = True) -> Optional[DomainDocument]:
+        """Get document by filename for a specific user (the newest one if uploaded more than once)"""
         result = await self.session.execute(
-            select(DBDocument).where(
+            self._select(load_content).where(
                 DBDocument.user_id == int(user_id),
                 DBDocument.filename == filename)
+            .order_by(DBDocument.created_at.desc(), DBDocument.id.desc())
+            .limit(1)
         )
-        db_document = result.scalar_one_or_none()
+        db_document = result.scalars().first()
         if db_document is None:
             return None
         return self._to_domain(db_document)
         
 
-    async def list_by_user(self, user_id: str, limit: int = 50, offset: int = 0) -> List[DomainDocument]:
-        """List documents for a user with pagination"""
+    async def list_by_user(self, user_id: str, limit: int = 50, offset: int = 0,
+                           load_content: bool = False) -> List[DomainDocument]:
+        """List documents for a user with pagination (newest first)"""
         result = await self.session.execute(
-            select(DBDocument).where(
+            self._select(load_content).where(
                 DBDocument.user_id == int(user_id)
-            ).offset(offset).limit(limit)
+            )
+            .order_by(DBDocument.created_at.desc(), DBDocument.id.desc())
+            .offset(offset).limit(limit)
         )
         db_documents = result.scalars().all()
         if db_documents is None:
@@ -74,13 +139,38 @@ class DocumentRepository(IDocumentRepositroy):
 
         return [self._to_domain(doc) for doc in db_documents]
 
-
-        
+    async def list_page_by_user(self, user_id: str, limit: int = 50, cursor: Optional[str] = None,
+                                load_content: bool = False) -> Page[DomainDocument]:
+        """
+        Keyset pagination (newest first): the cursor is the (created_at, id)
+        of the last row of the previous page, so every page is an index seek
+        """
+        check_page_limit(limit)
+        query = (
+            self._select(load_content)
+            .where(DBDocument.user_id == int(user_id))
+            .order_by(DBDocument.created_at.desc(), DBDocument.id.desc())
+            .limit(limit + 1)
+        )
+        if cursor:
+            created_at, document_id = decode_keyset_cursor(cursor)
+            query = query.where(tuple_(DBDocument.created_at, DBDocument.id) < tuple_(created_at, document_id))
+
+        db_documents = (await self.session.execute(query)).scalars().all()
+        return keyset_page(db_documents, limit, self._to_domain)
+
+    async def list_after(self, after_id: Optional[str] = None, limit: int = 100) -> List[DomainDocument]:
+        """Keyset walk over the whole table by primary key"""
+        query = self._select().order_by(DBDocument.id.asc()).limit(limit)
+        if after_id is not None:
+            query = query.where(DBDocument.id > int(after_id))
+        db_documents = (await self.session.execute(query)).scalars().all()
+        return [self._to_domain(doc) for doc in db_documents]
 
     async def delete(self, document_id: str) -> None:
         """Delete a document"""
         result = await self.session.execute(
-            select(DBDocument).where(DBDocument.id == int(document_id))
+            self._select(load_content=False).where(DBDocument.id == int(document_id))
         )
 
         db_document = result.scalar_one_or_none()
@@ -90,6 +180,7 @@ class DocumentRepository(IDocumentRepositroy):
 
         await self.session.delete(db_document)
         await self.session.commit()
+        self.keyword_index.remove(db_document.id)
    
         
 
@@ -122,28 +213,79 @@ class DocumentRepository(IDocumentRepositroy):
     async def search_by_user(self,
                              user_id:str,
                              query:str,
-                             limit:int =10) -> List[DomainDocument]:
-        """Search documents by content for a user"""
-        pattern = f"%{query}%"
+                             limit:int =10,
+                             load_content:bool = False) -> List[DomainDocument]:
+        """Full-text search over a user's documents, best matches first"""
+        if self.session.get_bind().dialect.name == "postgresql":
+            return await self._search_postgres(int(user_id), query, limit, load_content)
+        return await self._search_keyword_index(int(user_id), query, limit, load_content)
+
+    async def _search_postgres(self, user_id: int, query: str, limit: int, load_content: bool) -> List[DomainDocument]:
+        """Ranked match against the GIN-indexed search_vector column"""
+        ts_query = func.websearch_to_tsquery("english", query)
         result = await self.session.execute(
-            select(DBDocument)
-            .where(DBDocument.user_id == int(user_id))
-            .where(DBDocument.content.ilike(pattern))
+            self._select(load_content)
+            .where(DBDocument.user_id == user_id)
+            .where(_search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(_search_vector, ts_query).desc())
             .limit(limit)
          )
         documents = result.scalars().all()
 
         return [self._to_domain(doc) for doc in documents]
 
-    
+    async def _search_keyword_index(self, user_id: int, query: str, limit: int, load_content: bool) -> List[DomainDocument]:
+        """BM25 search through the in-process inverted index"""
+        if user_id not in self._indexed_users:
+            result = await self.session.execute(
+                select(DBDocument).where(DBDocument.user_id == user_id)
+            )
+            for db_document in result.scalars().all():
+                self.keyword_index.add(db_document.id, self._search_text(db_document), owner=user_id)
+            self._indexed_users.add(user_id)
+
+        ranked = [doc_id for doc_id, _ in self.keyword_index.search(query, owner=user_id, limit=limit)]
+        if not ranked:
+            return []
+
+        result = await self.session.execute(
+            self._select(load_content).where(DBDocument.id.in_(ranked))
+        )
+        by_id = {doc.id: doc for doc in result.scalars().all()}
+
+        # Keep the BM25 order
+        return [self._to_domain(by_id[doc_id]) for doc_id in ranked if doc_id in by_id]
+
+    def _index_document(self, db_document: DBDocument) -> None:
+        """Keep the keyword index current for users already loaded into it"""
+        if db_document.user_id in self._indexed_users:
+            self.keyword_index.add(db_document.id, self._search_text(db_document), owner=db_document.user_id)
+
+    @staticmethod
+    def _search_text(db_document: DBDocument) -> str:
+        return f"{db_document.filename}\n{db_document.content}"
+
+    @staticmethod
+    def _select(load_content: bool = True):
+        """
+        SELECT documents - without load_content the (potentially multi-megabyte)
+        content column is deferred and reading it raises instead of lazy loading
+        """
+        query = select(DBDocument)
+        if not load_content:
+            query = query.options(defer(DBDocument.content, raiseload=True))
+        return query
 
     def _to_domain(self, db_document: DBDocument) -> DomainDocument:
         """Convert database model to domain entity"""
+        content_loaded = "content" not in inspect(db_document).unloaded
         return DomainDocument(
             id=str(db_document.id),
             filename=db_document.filename,
-            content=db_document.content,
+            content=db_document.content if content_loaded else None,
             created_at=db_document.created_at,
             user_id=str(db_document.user_id),
-            chunks=[]  # Chunks are computed on demand, not stored
-        )
\ No newline at end of file
+            chunks=[],  # Chunks are computed on demand, not stored
+            content_preview=db_document.content_preview
+        )
+
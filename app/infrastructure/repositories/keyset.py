@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Callable, List, Sequence, Tuple, TypeVar
+from app.domain.exceptions import InvalidCursorError
+from app.domain.pagination import Page, decode_cursor, encode_cursor
+
+
+T = TypeVar("T")
+
+
+def decode_keyset_cursor(cursor: str) -> Tuple[datetime, int]:
+    """(created_at, integer primary key) of a pagination cursor"""
+    created_at, row_id = decode_cursor(cursor)
+    try:
+        return created_at, int(row_id)
+    except ValueError as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {cursor}") from e
+
+
+def check_page_limit(limit: int) -> None:
+    """A page holds at least one row - otherwise no cursor could point past it"""
+    if limit < 1:
+        raise ValueError(f"limit must be at least 1, got {limit}")
+
+
+def keyset_page(rows: Sequence, limit: int, to_domain: Callable[..., T]) -> Page[T]:
+    """
+    Build a Page from rows fetched with LIMIT limit + 1 - the extra row only
+    tells whether a next page exists. Rows need created_at and id.
+    """
+    rows: List = list(rows)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return Page(items=[to_domain(row) for row in rows], next_cursor=next_cursor)
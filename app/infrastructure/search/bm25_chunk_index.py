@@ -0,0 +1,63 @@
+import threading
+from typing import Dict, List, Set
+from app.application.interfaces.keyword_index import IKeywordIndex
+from app.infrastructure.search.inverted_index import InvertedIndex
+
+
+class BM25ChunkIndex(IKeywordIndex):
+    """
+    In-process BM25 index over document chunks, partitioned by user_id
+    Chunks are added as they are ingested, so the index is maintained
+    incrementally; it only lives in memory and is reloaded from the
+    database on startup (KeywordIndexLoader)
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self._index = InvertedIndex(k1=k1, b=b)
+        self._lock = threading.Lock()
+        self._metadata: Dict[str, Dict] = {}
+        self._document_chunks: Dict[str, Set[str]] = {}
+        self._loading = False
+
+    async def add_many(self, chunks: List[Dict]) -> None:
+        for chunk in chunks:
+            metadata = chunk["metadata"]
+            self._index.add(chunk["id"], metadata["text"], owner=metadata["user_id"])
+            with self._lock:
+                self._metadata[chunk["id"]] = metadata
+                self._document_chunks.setdefault(metadata["document_id"], set()).add(chunk["id"])
+
+    async def search(self, query: str, user_id: str, top_k: int = 5) -> List[Dict]:
+        matches = self._index.search(query, owner=user_id, limit=top_k)
+        with self._lock:
+            return [
+                {"id": chunk_id, "score": score, "metadata": self._metadata[chunk_id]}
+                for chunk_id, score in matches
+                if chunk_id in self._metadata
+            ]
+
+    async def is_complete(self, user_id: str) -> bool:
+        return not self._loading
+
+    def start_loading(self) -> None:
+        self._loading = True
+
+    def finish_loading(self) -> None:
+        self._loading = False
+
+    async def delete_document(self, document_id: str) -> None:
+        with self._lock:
+            chunk_ids = self._document_chunks.pop(document_id, set())
+            for chunk_id in chunk_ids:
+                self._metadata.pop(chunk_id, None)
+        for chunk_id in chunk_ids:
+            self._index.remove(chunk_id)
+
+    async def delete_chunks(self, chunk_ids: List[str]) -> None:
+        with self._lock:
+            for chunk_id in chunk_ids:
+                metadata = self._metadata.pop(chunk_id, None)
+                if metadata is not None:
+                    self._document_chunks.get(metadata["document_id"], set()).discard(chunk_id)
+        for chunk_id in chunk_ids:
+            self._index.remove(chunk_id)
@@ -0,0 +1,102 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Hashable, List, Tuple
+
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens"""
+    return _WORD.findall(text.lower())
+
+
+class _Partition:
+    """Postings of one owner (user) - BM25 statistics are per owner"""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[Hashable, int]] = {}
+        self.lengths: Dict[Hashable, int] = {}
+        self.terms: Dict[Hashable, Tuple[str, ...]] = {}
+        self.total_length = 0
+
+
+class InvertedIndex:
+    """
+    Pure-Python inverted index with BM25 ranking
+    Entries are partitioned by owner, so a query for one user never
+    touches another user's postings.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._partitions: Dict[Any, _Partition] = {}
+        self._owner_of: Dict[Hashable, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._owner_of)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._owner_of
+
+    def add(self, key: Hashable, text: str, owner: Any = None) -> None:
+        """Index (or re-index) a text under key"""
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self._remove(key)
+
+            partition = self._partitions.setdefault(owner, _Partition())
+            for term, frequency in counts.items():
+                partition.postings.setdefault(term, {})[key] = frequency
+
+            length = sum(counts.values())
+            partition.lengths[key] = length
+            partition.terms[key] = tuple(counts)
+            partition.total_length += length
+            self._owner_of[key] = owner
+
+    def remove(self, key: Hashable) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def search(self, query: str, owner: Any = None, limit: int = 10) -> List[Tuple[Hashable, float]]:
+        """(key, score) pairs of the best BM25 matches, best first"""
+        terms = set(tokenize(query))
+        with self._lock:
+            partition = self._partitions.get(owner)
+            if partition is None or not partition.lengths:
+                return []
+
+            document_count = len(partition.lengths)
+            average_length = partition.total_length / document_count
+            scores: Dict[Hashable, float] = {}
+
+            for term in terms:
+                postings = partition.postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * partition.lengths[key] / average_length)
+                    scores[key] = scores.get(key, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:limit]
+
+    def _remove(self, key: Hashable) -> None:
+        if key not in self._owner_of:
+            return
+
+        owner = self._owner_of.pop(key)
+        partition = self._partitions[owner]
+        for term in partition.terms.pop(key):
+            postings = partition.postings[term]
+            del postings[key]
+            if not postings:
+                del partition.postings[term]
+        partition.total_length -= partition.lengths.pop(key)
@@ -0,0 +1,57 @@
+from typing import Optional
+import numpy as np
+
+
+def squared_distances(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """
+    Pairwise squared L2 distances between rows of data and centroids
+    ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2 (one matrix product, no python loops)
+    """
+    data_norms = np.einsum("ij,ij->i", data, data)[:, None]
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)[None, :]
+    distances = data_norms - 2.0 * (data @ centroids.T) + centroid_norms
+    np.maximum(distances, 0.0, out=distances)
+    return distances
+
+
+def kmeans(
+    data: np.ndarray,
+    k: int,
+    iterations: int = 20,
+    seed: Optional[int] = 0,
+) -> np.ndarray:
+    """
+    Lloyd's k-means on float32 rows
+    Returns a (k, dim) float32 centroid matrix
+    """
+    if data.shape[0] == 0:
+        raise ValueError("Cannot train k-means on an empty matrix")
+
+    data = np.ascontiguousarray(data, dtype=np.float32)
+    rng = np.random.default_rng(seed)
+    k = min(k, data.shape[0])
+
+    centroids = data[rng.choice(data.shape[0], size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = squared_distances(data, centroids).argmin(axis=1)
+
+        # Vectorized centroid update: sum rows per cluster then divide by counts
+        counts = np.bincount(assignments, minlength=k).astype(np.float32)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, data)
+
+        empty = counts == 0
+        counts[empty] = 1.0
+        new_centroids = sums / counts[:, None]
+
+        # Re-seed empty clusters with random points so every list stays usable
+        if empty.any():
+            new_centroids[empty] = data[rng.choice(data.shape[0], size=int(empty.sum()))]
+
+        if np.allclose(new_centroids, centroids, atol=1e-6):
+            centroids = new_centroids
+            break
+        centroids = new_centroids
+
+    return centroids.astype(np.float32, copy=False)
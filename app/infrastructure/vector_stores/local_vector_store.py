@@ -0,0 +1,695 @@
+import asyncio
+from typing import Any, Coroutine, Dict, Iterable, List, Optional, Set, Tuple
+import numpy as np
+
+from app.application.interfaces.vector_store import IvectorStore
+from app.domain.entities.embedding import Embedding
+from app.infrastructure.vector_stores.kmeans import kmeans, squared_distances
+from app.infrastructure.vector_stores.quantization import (
+    QUANTIZATION_TYPES, FloatCodec, VectorCodec, VectorFile, create_codec
+)
+
+
+# Sentinel for "no user_id condition in the filter"
+_ANY_TENANT = object()
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (argpartition, not a full sort)"""
+    if k <= 0 or scores.size == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= scores.size:
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _matches_condition(value: Any, condition: Any) -> bool:
+    """Evaluate a single Pinecone-style metadata condition"""
+    if not isinstance(condition, dict):
+        return value == condition
+
+    for operator, operand in condition.items():
+        if operator == "$eq" and value != operand:
+            return False
+        if operator == "$ne" and value == operand:
+            return False
+        if operator == "$in" and value not in operand:
+            return False
+        if operator == "$nin" and value in operand:
+            return False
+    return True
+
+
+def matches_filter(metadata: Dict, filter: Dict) -> bool:
+    """Check metadata against a Pinecone-style filter (implicit AND of keys)"""
+    return all(
+        _matches_condition(metadata.get(key), condition)
+        for key, condition in filter.items()
+    )
+
+
+def _fit_ivf(codes: np.ndarray, codec: VectorCodec, nlist: int) -> Tuple[np.ndarray, np.ndarray]:
+    """k-means centroids of the rows and the inverted list of every row (runs in a worker thread)"""
+    data = codec.decode(codes)
+    rng = np.random.default_rng(0)
+    sample_size = min(data.shape[0], nlist * 256)
+    sample = data[rng.choice(data.shape[0], size=sample_size, replace=False)]
+
+    centroids = kmeans(sample, nlist)
+    return centroids, squared_distances(data, centroids).argmin(axis=1)
+
+
+# Rows encoded ahead of a codec switch: (id -> row of the code matrix, code matrix)
+_Encoded = Tuple[Dict[str, int], np.ndarray]
+
+
+def _fit_quantizer(
+    quantization: str,
+    dimension: int,
+    pq_m: int,
+    train_size: int,
+    codec: VectorCodec,
+    blocks: List[np.ndarray]
+) -> Tuple[VectorCodec, np.ndarray]:
+    """Train a quantizer on a sample of the blocks and re-encode all their rows (runs in a worker thread)"""
+    data = codec.decode(np.concatenate(blocks))
+    rng = np.random.default_rng(0)
+    sample = data[rng.choice(data.shape[0], size=min(data.shape[0], train_size), replace=False)]
+
+    quantizer = create_codec(quantization, dimension, pq_m=pq_m)
+    quantizer.train(sample)
+    return quantizer, quantizer.encode(data)
+
+
+class _VectorBlock:
+    """
+    Contiguous matrix of vectors (float32, or codes of a quantizer) plus their ids and metadata
+    Rows are removed with swap-with-last so the matrix never has holes
+    """
+
+    def __init__(self, width: int, dtype: np.dtype = np.float32, capacity: int = 64):
+        self.vectors = np.empty((capacity, width), dtype=dtype)
+        self.ids: List[str] = []
+        self.metadata: List[Dict] = []
+        self.rows: Dict[str, int] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    def view(self) -> np.ndarray:
+        """Live rows only (no copy)"""
+        return self.vectors[: self.size]
+
+    def add(self, id: str, vector: np.ndarray, metadata: Dict) -> None:
+        row = self.rows.get(id)
+        if row is not None:
+            self.vectors[row] = vector
+            self.metadata[row] = metadata
+            return
+
+        if self.size == self.vectors.shape[0]:
+            self._resize(self.vectors.shape[0] * 2)
+
+        row = self.size
+        self.vectors[row] = vector
+        self.ids.append(id)
+        self.metadata.append(metadata)
+        self.rows[id] = row
+
+    def extend(self, ids: List[str], vectors: np.ndarray, metadata: List[Dict]) -> None:
+        """Append rows whose ids are not in the block yet"""
+        needed = self.size + len(ids)
+        if needed > self.vectors.shape[0]:
+            capacity = self.vectors.shape[0]
+            while capacity < needed:
+                capacity *= 2
+            self._resize(capacity)
+
+        self.vectors[self.size:needed] = vectors
+        self.rows.update(zip(ids, range(self.size, needed)))
+        self.ids.extend(ids)
+        self.metadata.extend(metadata)
+
+    def remove(self, id: str) -> bool:
+        row = self.rows.pop(id, None)
+        if row is None:
+            return False
+
+        last = self.size - 1
+        if row != last:
+            moved_id = self.ids[last]
+            self.vectors[row] = self.vectors[last]
+            self.ids[row] = moved_id
+            self.metadata[row] = self.metadata[last]
+            self.rows[moved_id] = row
+
+        self.ids.pop()
+        self.metadata.pop()
+
+        capacity = self.vectors.shape[0]
+        if capacity > 64 and self.size < capacity // 4:
+            self._resize(capacity // 2)
+        return True
+
+    def recode(self, old: VectorCodec, new: VectorCodec, encoded: Optional[_Encoded] = None) -> None:
+        """Re-encode every row with another codec - rows of ids in encoded take their code from there"""
+        recoded = np.empty((self.vectors.shape[0], new.code_size), dtype=new.code_dtype)
+        rows = recoded[: self.size]
+        missing = np.ones(self.size, dtype=bool)
+        if encoded is not None:
+            index, codes = encoded
+            positions = np.fromiter((index.get(id, -1) for id in self.ids), dtype=np.int64, count=self.size)
+            missing = positions < 0
+            rows[~missing] = codes[positions[~missing]]
+        if missing.any():
+            rows[missing] = new.encode(old.decode(self.view()[missing]))
+        self.vectors = recoded
+
+    def _resize(self, capacity: int) -> None:
+        resized = np.empty((capacity, self.vectors.shape[1]), dtype=self.vectors.dtype)
+        resized[: self.size] = self.vectors[: self.size]
+        self.vectors = resized
+
+
+class _TenantPartition:
+    """
+    All vectors of one tenant (user_id)
+    Starts as a single flat block and, in IVF mode, is re-organised into
+    k-means inverted lists once it holds enough vectors to train on.
+    Training itself is driven by the store: start_training() snapshots the
+    flat rows, k-means runs on the snapshot off the event loop, and
+    finish_training() moves the rows - adds keep going to the flat block meanwhile
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        index_type: str,
+        nlist: int,
+        nprobe: int,
+        train_size: int,
+        codec: VectorCodec,
+    ):
+        self.dimension = dimension
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self.codec = codec
+
+        self.flat = self._block()
+        self.centroids: Optional[np.ndarray] = None
+        self.lists: List[_VectorBlock] = []
+        self.locations: Dict[str, _VectorBlock] = {}
+        self.training = False
+        # Ids added or replaced while k-means runs - their snapshot assignment is stale
+        self._changed: Set[str] = set()
+
+    @property
+    def size(self) -> int:
+        return len(self.locations)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def needs_training(self) -> bool:
+        return (
+            self.index_type == "ivf"
+            and not self.is_trained
+            and not self.training
+            and self.flat.size >= self.train_size
+        )
+
+    def add(self, id: str, vector: np.ndarray, metadata: Dict, code: Optional[np.ndarray] = None) -> None:
+        """Add a float32 vector - code is its encoding when the caller already has it"""
+        if code is None:
+            code = self.codec.encode(vector[None, :])[0]
+
+        if self.is_trained:
+            list_no = int(squared_distances(vector[None, :], self.centroids).argmin())
+            block = self.lists[list_no]
+        else:
+            block = self.flat
+
+        previous = self.locations.get(id)
+        if previous is not None and previous is not block:
+            previous.remove(id)
+
+        block.add(id, code, metadata)
+        self.locations[id] = block
+        if self.training:
+            self._changed.add(id)
+
+    def remove(self, id: str) -> bool:
+        block = self.locations.pop(id, None)
+        if block is None:
+            return False
+        return block.remove(id)
+
+    def blocks(self) -> List[_VectorBlock]:
+        """Every block of the partition"""
+        return [self.flat, *self.lists]
+
+    def recode(self, codec: VectorCodec, encoded: Optional[_Encoded] = None) -> None:
+        """Switch to another codec (the quantizer was trained), reusing the codes in encoded"""
+        for block in self.blocks():
+            block.recode(self.codec, codec, encoded)
+        self.codec = codec
+
+    def candidate_blocks(self, query: np.ndarray) -> List[_VectorBlock]:
+        """Blocks to scan for a query: everything when flat, nprobe lists when IVF"""
+        if not self.is_trained:
+            return [self.flat]
+
+        distances = squared_distances(query[None, :], self.centroids)[0]
+        probes = _top_k(-distances, self.nprobe)
+        return [self.lists[i] for i in probes if self.lists[i].size]
+
+    def start_training(self) -> Tuple[List[str], np.ndarray, VectorCodec]:
+        """Snapshot of the flat rows to train on: (ids, codes, codec of the codes)"""
+        self.training = True
+        self._changed = set()
+        return list(self.flat.ids), self.flat.view().copy(), self.codec
+
+    def finish_training(self, ids: List[str], centroids: np.ndarray, assignments: np.ndarray) -> None:
+        """
+        Install the coarse quantizer and move the flat rows into inverted lists
+        Rows added or replaced since the snapshot are assigned here
+        """
+        list_of = dict(zip(ids, assignments.tolist()))
+        for id in self._changed:
+            list_of.pop(id, None)
+
+        flat = self.flat
+        list_nos = np.fromiter((list_of.get(id, -1) for id in flat.ids), dtype=np.int64, count=flat.size)
+        missing = np.flatnonzero(list_nos < 0)
+        if missing.size:
+            vectors = self.codec.decode(flat.view()[missing])
+            list_nos[missing] = squared_distances(vectors, centroids).argmin(axis=1)
+
+        self.centroids = centroids
+        self.lists = [self._block() for _ in range(centroids.shape[0])]
+        order = np.argsort(list_nos, kind="stable")
+        bounds = np.searchsorted(list_nos[order], np.arange(1, centroids.shape[0]))
+        for block, rows in zip(self.lists, np.split(order, bounds)):
+            if not rows.size:
+                continue
+            block_ids = [flat.ids[row] for row in rows]
+            block.extend(block_ids, flat.vectors[rows], [flat.metadata[row] for row in rows])
+            for id in block_ids:
+                self.locations[id] = block
+
+        self.flat = self._block()
+        self.training = False
+        self._changed = set()
+
+    def abort_training(self) -> None:
+        self.training = False
+        self._changed = set()
+
+    def _block(self) -> _VectorBlock:
+        return _VectorBlock(self.codec.code_size, self.codec.code_dtype)
+
+
+class LocalVectorStore(IvectorStore):
+    """
+    In-process vector store backed by NumPy
+    - vectors live in contiguous float32 matrices, scored with one matrix-vector product
+    - top-k uses argpartition instead of sorting every score
+    - rows are partitioned by metadata["user_id"], so a user_id filter only
+      ever touches that tenant's rows
+    - index_type="ivf" adds a k-means coarse quantizer per tenant for
+      sub-linear search on large partitions, trained in a worker thread once
+      the tenant holds train_size vectors (search stays flat until then)
+    - quantization="sq8" (int8 per dimension, 4x smaller) or "pq" (pq_m bytes
+      per vector) compresses the stored vectors; queries are scored against
+      the codes directly. Vectors are kept as float32 until quantization_train_size
+      of them are stored, then the quantizer is trained and every block re-encoded
+      in a worker thread; upserts keep using float32 until the new codec is swapped in
+    - rerank_path keeps full-precision vectors in a memory-mapped file, and the
+      rerank_factor * top_k best approximate candidates are re-scored exactly
+    """
+
+    def __init__(
+        self,
+        dimension: Optional[int] = None,
+        metric: str = "cosine",
+        index_type: str = "flat",
+        nlist: int = 256,
+        nprobe: int = 8,
+        train_size: Optional[int] = None,
+        quantization: str = "none",
+        pq_m: int = 16,
+        quantization_train_size: int = 20000,
+        rerank_path: Optional[str] = None,
+        rerank_factor: int = 4,
+    ):
+        if metric not in ("cosine", "dot"):
+            raise ValueError(f"Unknown metric: {metric}")
+        if index_type not in ("flat", "ivf"):
+            raise ValueError(f"Unknown index type: {index_type}")
+        if quantization not in QUANTIZATION_TYPES:
+            raise ValueError(f"Unknown quantization: {quantization}")
+
+        self.dimension = dimension
+        self.metric = metric
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        # k-means needs a few dozen points per centroid to be meaningful
+        self.train_size = train_size or nlist * 39
+        self.quantization = quantization
+        self.pq_m = pq_m
+        self.quantization_train_size = quantization_train_size
+        self.rerank_path = rerank_path
+        self.rerank_factor = rerank_factor
+
+        self._partitions: Dict[Any, _TenantPartition] = {}
+        self._tenant_of: Dict[str, Any] = {}
+        # Created once the dimension is known (first vector)
+        self._codec: Optional[VectorCodec] = None
+        self._full_precision: Optional[VectorFile] = None
+        # Background training runs - the event loop only keeps weak references to tasks
+        self._training_tasks: Set[asyncio.Task] = set()
+        # Ids upserted while the quantizer trains (None when it is not training)
+        self._changed_while_quantizing: Optional[Set[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._tenant_of)
+
+    async def upsert(
+        self,
+        id: str,
+        embedding: Embedding,
+        metadata: Dict
+    ) -> None:
+        """Insert or replace a vector"""
+        vector = self._prepare(embedding.vector)
+        self._add(id, vector, metadata)
+        self._store_full_precision([id], vector[None, :])
+        self._schedule_training()
+
+    async def upsert_many(
+        self,
+        vectors: List[Dict],
+        batch_size: Optional[int] = None
+    ) -> None:
+        """Bulk upsert - vectors are converted and normalised as one matrix"""
+        if not vectors:
+            return
+
+        matrix = self._prepare_many([item["embedding"].vector for item in vectors])
+        codes = self._get_codec().encode(matrix)
+        for item, vector, code in zip(vectors, matrix, codes):
+            self._add(item["id"], vector, item["metadata"], code)
+        self._store_full_precision([item["id"] for item in vectors], matrix)
+        self._schedule_training()
+
+    async def train(self) -> None:
+        """
+        Start the training that is due and wait for every training run to finish
+        (without it, training runs in the background after the upsert that made it due)
+        """
+        self._schedule_training()
+        if self._training_tasks:
+            await asyncio.gather(*self._training_tasks)
+
+    async def search(
+        self,
+        query_embedding: Embedding,
+        top_k: int = 5,
+        filter: Dict = {},
+        include_vectors: bool = False
+    ) -> List[Dict]:
+        """Vectorized top-k search, restricted to the filtered tenant(s)"""
+        if not self._partitions or top_k <= 0:
+            return []
+
+        query = self._prepare(query_embedding.vector)
+        residual_filter = dict(filter or {})
+        partitions = self._partitions_for(residual_filter)
+        score = self._get_codec().scorer(query)
+
+        # Quantized scores are approximate: over-fetch, then re-score exactly
+        rerank = self._full_precision is not None and self._codec.lossy
+        final_k = top_k
+        if rerank:
+            top_k = top_k * self.rerank_factor
+
+        best_scores: List[np.ndarray] = []
+        best_hits: List[Tuple[_VectorBlock, np.ndarray]] = []
+
+        for partition in partitions:
+            for block in partition.candidate_blocks(query):
+                scores = score(block.view())
+
+                if residual_filter:
+                    mask = np.fromiter(
+                        (matches_filter(meta, residual_filter) for meta in block.metadata),
+                        dtype=bool,
+                        count=block.size,
+                    )
+                    rows = np.flatnonzero(mask)
+                    scores = scores[rows]
+                else:
+                    rows = None
+
+                local = _top_k(scores, top_k)
+                best_scores.append(scores[local])
+                best_hits.append((block, local if rows is None else rows[local]))
+
+        if not best_scores:
+            return []
+
+        # Merge per-block winners into the global top-k
+        all_scores = np.concatenate(best_scores)
+        owners = np.concatenate([
+            np.full(len(rows), i, dtype=np.int64) for i, (_, rows) in enumerate(best_hits)
+        ])
+        all_rows = np.concatenate([rows for _, rows in best_hits])
+
+        results = []
+        for position in _top_k(all_scores, top_k):
+            block = best_hits[owners[position]][0]
+            row = int(all_rows[position])
+            results.append({
+                "id": block.ids[row],
+                "score": float(all_scores[position]),
+                "metadata": dict(block.metadata[row]),
+            })
+
+        if rerank and results:
+            exact = self._full_precision.get_many([result["id"] for result in results]) @ query
+            for result, exact_score in zip(results, exact):
+                result["score"] = float(exact_score)
+            results = [results[i] for i in _top_k(exact, final_k)]
+
+        if include_vectors:
+            for result in results:
+                result["vector"] = self._stored_vector(result["id"])
+        return results
+
+    async def delete(self, id: str) -> None:
+        """Delete vector"""
+        tenant = self._tenant_of.pop(id, _ANY_TENANT)
+        if tenant is _ANY_TENANT:
+            return
+        self._partitions[tenant].remove(id)
+        if self._full_precision is not None:
+            self._full_precision.remove(id)
+
+    async def delete_many(
+        self,
+        ids: List[str],
+        batch_size: Optional[int] = None
+    ) -> None:
+        """Delete many vectors (in-process, so no batching is needed)"""
+        for id in ids:
+            await self.delete(id)
+
+    async def delete_by_filter(self, filter: Dict) -> None:
+        """Delete every vector whose metadata matches the filter"""
+        residual_filter = dict(filter or {})
+        matched = [
+            id
+            for partition in self._partitions_for(residual_filter)
+            for block in partition.blocks()
+            for id, metadata in zip(block.ids, block.metadata)
+            if matches_filter(metadata, residual_filter)
+        ]
+        await self.delete_many(matched)
+
+    def _add(self, id: str, vector: np.ndarray, metadata: Dict, code: Optional[np.ndarray] = None) -> None:
+        """Place a prepared vector in its tenant partition (moving it if the tenant changed)"""
+        tenant = metadata.get("user_id")
+
+        previous_tenant = self._tenant_of.get(id, tenant)
+        if previous_tenant != tenant:
+            self._partitions[previous_tenant].remove(id)
+
+        self._partition(tenant).add(id, vector, dict(metadata), code)
+        self._tenant_of[id] = tenant
+        if self._changed_while_quantizing is not None:
+            self._changed_while_quantizing.add(id)
+
+    def _partition(self, tenant: Any) -> _TenantPartition:
+        partition = self._partitions.get(tenant)
+        if partition is None:
+            partition = _TenantPartition(
+                dimension=self.dimension,
+                index_type=self.index_type,
+                nlist=self.nlist,
+                nprobe=self.nprobe,
+                train_size=self.train_size,
+                codec=self._get_codec(),
+            )
+            self._partitions[tenant] = partition
+        return partition
+
+    def _get_codec(self) -> VectorCodec:
+        if self._codec is None:
+            self._codec = FloatCodec(self.dimension)
+        return self._codec
+
+    def _schedule_training(self) -> None:
+        """
+        Start training the quantizer and the IVF partitions that crossed their
+        thresholds - the work never runs on the request's path
+        """
+        if (
+            self.quantization != "none"
+            and self._changed_while_quantizing is None
+            and not self._codec.lossy
+            and len(self) >= self.quantization_train_size
+        ):
+            self._start(self._train_quantizer())
+            # Marks the quantizer as training until the task ends
+            self._changed_while_quantizing = set()
+
+        for partition in self._partitions.values():
+            if partition.needs_training:
+                # Snapshot now, so the partition is marked as training before the task runs
+                self._start(self._train_partition(partition, *partition.start_training()))
+
+    def _start(self, training: Coroutine) -> None:
+        task = asyncio.create_task(training)
+        self._training_tasks.add(task)
+        task.add_done_callback(self._training_tasks.discard)
+
+    async def _train_quantizer(self) -> None:
+        """Train the quantizer on a snapshot of every block, then re-encode the partitions with it"""
+        snapshot = [
+            (list(block.ids), block.view().copy())
+            for partition in self._partitions.values()
+            for block in partition.blocks()
+        ]
+        try:
+            codec, codes = await asyncio.to_thread(
+                _fit_quantizer, self.quantization, self.dimension, self.pq_m,
+                self.quantization_train_size, self._codec, [vectors for _, vectors in snapshot]
+            )
+        except Exception as e:
+            print(f"Warning: quantizer training failed: {e}")
+            self._changed_while_quantizing = None
+            return
+
+        index = {id: row for row, id in enumerate(id for ids, _ in snapshot for id in ids)}
+        for id in self._changed_while_quantizing:
+            index.pop(id, None)
+        for partition in self._partitions.values():
+            partition.recode(codec, (index, codes))
+        self._codec = codec
+        self._changed_while_quantizing = None
+
+    async def _train_partition(
+        self,
+        partition: _TenantPartition,
+        ids: List[str],
+        codes: np.ndarray,
+        codec: VectorCodec
+    ) -> None:
+        try:
+            centroids, assignments = await asyncio.to_thread(_fit_ivf, codes, codec, self.nlist)
+        except Exception as e:
+            partition.abort_training()
+            print(f"Warning: IVF training failed: {e}")
+            return
+        partition.finish_training(ids, centroids, assignments)
+
+    def _stored_vector(self, id: str) -> np.ndarray:
+        """Float32 vector of an id - exact from the re-rank file, else decoded from its block"""
+        if self._full_precision is not None and id in self._full_precision:
+            return self._full_precision.get_many([id])[0]
+        block = self._partitions[self._tenant_of[id]].locations[id]
+        row = block.rows[id]
+        return self._codec.decode(block.vectors[row:row + 1])[0].copy()
+
+    def _store_full_precision(self, ids: List[str], matrix: np.ndarray) -> None:
+        if self.rerank_path is None or self.quantization == "none":
+            return
+        if self._full_precision is None:
+            self._full_precision = VectorFile(self.rerank_path, self.dimension)
+        self._full_precision.put_many(ids, matrix)
+
+    def _partitions_for(self, filter: Dict) -> Iterable[_TenantPartition]:
+        """
+        Resolve the user_id condition to tenant partitions
+        The condition is consumed from the filter when partitioning fully answers it
+        """
+        condition = filter.get("user_id", _ANY_TENANT)
+        if condition is _ANY_TENANT:
+            return list(self._partitions.values())
+
+        if isinstance(condition, dict):
+            if set(condition) == {"$eq"}:
+                tenants = [condition["$eq"]]
+            elif set(condition) == {"$in"}:
+                tenants = list(condition["$in"])
+            else:
+                # $ne / $nin / mixed operators: scan everything and post-filter
+                return list(self._partitions.values())
+        else:
+            tenants = [condition]
+
+        del filter["user_id"]
+        return [self._partitions[t] for t in tenants if t in self._partitions]
+
+    def _prepare(self, vector) -> np.ndarray:
+        """Convert to float32 and L2-normalise for cosine"""
+        array = np.asarray(vector, dtype=np.float32).reshape(-1)
+
+        if self.dimension is None:
+            self.dimension = array.shape[0]
+        elif array.shape[0] != self.dimension:
+            raise ValueError(
+                f"Vector dimension {array.shape[0]} does not match store dimension {self.dimension}"
+            )
+
+        if self.metric == "cosine":
+            norm = float(np.linalg.norm(array))
+            if norm > 0:
+                array = array / norm
+        return array
+
+    def _prepare_many(self, vectors: List) -> np.ndarray:
+        """Batch version of _prepare: one (n, dim) float32 matrix"""
+        matrix = np.asarray(vectors, dtype=np.float32)
+        if matrix.ndim != 2:
+            raise ValueError("Expected a list of equally sized vectors")
+
+        if self.dimension is None:
+            self.dimension = matrix.shape[1]
+        elif matrix.shape[1] != self.dimension:
+            raise ValueError(
+                f"Vector dimension {matrix.shape[1]} does not match store dimension {self.dimension}"
+            )
+
+        if self.metric == "cosine":
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            matrix = matrix / norms
+        return matrix
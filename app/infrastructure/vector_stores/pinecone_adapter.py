@@ -1,16 +1,45 @@
 # app/infrastructure/vector_stores/pinecone_adapter.py
-from typing import List, Dict
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Dict, Optional
 from pinecone import Pinecone, ServerlessSpec
-from app.application.interfaces.vector_store import IVectorStore
+import numpy as np
+from app.application.interfaces.vector_store import IvectorStore
 from app.domain.entities.embedding import Embedding
 
-class PineconeAdapter(IVectorStore):
+class PineconeAdapter(IvectorStore):
     """Pinecone implementation"""
     
-    def __init__(self, api_key: str, index_name: str):
+    def __init__(
+        self,
+        api_key: str,
+        index_name: str,
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        max_workers: int = 8,
+        executor: Optional[Executor] = None,
+        delete_batch_size: int = 1000
+    ):
+        """
+        batch_size: vectors per upsert request (Pinecone recommends <= 100)
+        max_concurrency: upsert requests in flight at the same time
+        max_workers: size of the dedicated thread pool for blocking SDK calls
+        executor: share an existing pool instead of creating one
+        delete_batch_size: ids per delete request (Pinecone allows <= 1000)
+        """
         self.pc = Pinecone(api_key=api_key)
         self.index_name = index_name
         self.index = self.pc.Index(index_name)
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.delete_batch_size = delete_batch_size
+        # The Pinecone SDK is synchronous - every call runs in this pool so
+        # the event loop keeps serving other requests while HTTP is in flight
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="pinecone"
+        )
     
     async def upsert(
         self,
@@ -19,27 +48,58 @@ class PineconeAdapter(IVectorStore):
         metadata: Dict
     ) -> None:
         """Pinecone-specific upsert"""
-        self.index.upsert(vectors=[{
+        await self._run(self.index.upsert, vectors=[{
             "id": id,
-            "values": list(embedding.vector),
+            "values": embedding.vector.tolist(),
             "metadata": metadata
         }])
     
+    async def upsert_many(
+        self,
+        vectors: List[Dict],
+        batch_size: Optional[int] = None
+    ) -> None:
+        """Upsert in batches, with at most max_concurrency requests in flight"""
+        batch_size = batch_size or self.batch_size
+        records = [
+            {
+                "id": item["id"],
+                "values": item["embedding"].vector.tolist(),
+                "metadata": item["metadata"]
+            }
+            for item in vectors
+        ]
+        batches = [
+            records[start:start + batch_size]
+            for start in range(0, len(records), batch_size)
+        ]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def send(batch: List[Dict]) -> None:
+            async with semaphore:
+                await self._run(self.index.upsert, vectors=batch)
+
+        await asyncio.gather(*(send(batch) for batch in batches))
+    
     async def search(
         self,
         query_embedding: Embedding,
         top_k: int = 5,
-        filter: Dict = None
+        filter: Dict = None,
+        include_vectors: bool = False
     ) -> List[Dict]:
         """Pinecone-specific search"""
-        results = self.index.query(
-            vector=list(query_embedding.vector),
+        results = await self._run(
+            self.index.query,
+            vector=query_embedding.vector.tolist(),
             top_k=top_k,
             include_metadata=True,
+            include_values=include_vectors,
             filter=filter
         )
         
-        return [
+        matches = [
             {
                 "id": match.id,
                 "score": match.score,
@@ -47,7 +107,37 @@ class PineconeAdapter(IVectorStore):
             }
             for match in results.matches
         ]
+        if include_vectors:
+            for result, match in zip(matches, results.matches):
+                result["vector"] = np.asarray(match.values, dtype=np.float32)
+        return matches
     
     async def delete(self, id: str) -> None:
         """Delete vector"""
-        self.index.delete(ids=[id])
\ No newline at end of file
+        await self._run(self.index.delete, ids=[id])
+
+    async def delete_many(
+        self,
+        ids: List[str],
+        batch_size: Optional[int] = None
+    ) -> None:
+        """Delete in batches (Pinecone accepts up to 1000 ids per request)"""
+        batch_size = min(batch_size or self.delete_batch_size, 1000)
+        batches = [ids[start:start + batch_size] for start in range(0, len(ids), batch_size)]
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def send(batch: List[str]) -> None:
+            async with semaphore:
+                await self._run(self.index.delete, ids=batch)
+
+        await asyncio.gather(*(send(batch) for batch in batches))
+
+    async def delete_by_filter(self, filter: Dict) -> None:
+        """Metadata-filtered delete (pod-based indexes; serverless indexes only support delete by id)"""
+        await self._run(self.index.delete, filter=filter)
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking SDK call on the adapter's thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
\ No newline at end of file
@@ -0,0 +1,225 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+import numpy as np
+
+from app.infrastructure.vector_stores.kmeans import kmeans, squared_distances
+
+
+QUANTIZATION_TYPES = ("none", "sq8", "pq")
+
+# Rows scored at a time - the float32 temporaries of a chunk stay in CPU
+# cache instead of a float32 copy of the whole block being allocated
+_SCORE_CHUNK_ROWS = 4096
+
+Scorer = Callable[[np.ndarray], np.ndarray]
+
+
+def _chunked(score: Scorer) -> Scorer:
+    def run(codes: np.ndarray) -> np.ndarray:
+        if codes.shape[0] <= _SCORE_CHUNK_ROWS:
+            return score(codes)
+        return np.concatenate([
+            score(codes[start:start + _SCORE_CHUNK_ROWS])
+            for start in range(0, codes.shape[0], _SCORE_CHUNK_ROWS)
+        ])
+    return run
+
+
+class VectorCodec(ABC):
+    """
+    How vectors are stored in a block: encode/decode between float32 vectors
+    and codes, and score a float32 query against codes without decoding them
+    (asymmetric distance computation)
+    """
+
+    code_size: int
+    code_dtype: np.dtype
+    # Scores against the codes are approximate
+    lossy: bool = True
+
+    @abstractmethod
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """(n, dim) float32 -> (n, code_size) codes"""
+        pass
+
+    @abstractmethod
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """(n, code_size) codes -> (n, dim) float32 reconstruction"""
+        pass
+
+    @abstractmethod
+    def scorer(self, query: np.ndarray) -> Scorer:
+        """Function returning the inner product of query with every row of a code matrix"""
+        pass
+
+
+class FloatCodec(VectorCodec):
+    """Full precision float32 - codes are the vectors themselves"""
+
+    lossy = False
+
+    def __init__(self, dimension: int):
+        self.code_size = dimension
+        self.code_dtype = np.dtype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        return np.asarray(vectors, dtype=np.float32)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return codes
+
+    def scorer(self, query: np.ndarray) -> Scorer:
+        return lambda codes: codes @ query
+
+
+class ScalarQuantizer(VectorCodec):
+    """
+    int8 scalar quantization: every dimension is mapped linearly onto 256
+    levels between its trained minimum and maximum (4x smaller than float32)
+    """
+
+    def __init__(self, dimension: int):
+        self.code_size = dimension
+        self.code_dtype = np.dtype(np.uint8)
+        self.minimum: Optional[np.ndarray] = None
+        self.step: Optional[np.ndarray] = None
+
+    def train(self, sample: np.ndarray) -> None:
+        self.minimum = sample.min(axis=0).astype(np.float32)
+        span = sample.max(axis=0).astype(np.float32) - self.minimum
+        span[span == 0] = 1.0
+        self.step = span / 255.0
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        levels = np.rint((vectors - self.minimum) / self.step)
+        return np.clip(levels, 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return self.minimum + codes.astype(np.float32) * self.step
+
+    def scorer(self, query: np.ndarray) -> Scorer:
+        # q . (min + code * step) = q . min + code . (q * step)
+        weights = (query * self.step).astype(np.float32)
+        offset = float(query @ self.minimum)
+        return _chunked(lambda codes: codes.astype(np.float32) @ weights + offset)
+
+
+class ProductQuantizer(VectorCodec):
+    """
+    Product quantization: the vector is split into m sub-vectors, each
+    replaced by the index of its nearest centroid (256 per sub-space), so a
+    vector costs m bytes. Queries are scored with per-query lookup tables
+    """
+
+    def __init__(self, dimension: int, m: int = 16, centroids: int = 256):
+        if dimension % m:
+            raise ValueError(f"Dimension {dimension} is not divisible by {m} sub-quantizers")
+        self.dimension = dimension
+        self.m = m
+        self.sub_dimension = dimension // m
+        self.centroids = centroids
+        self.code_size = m
+        self.code_dtype = np.dtype(np.uint8)
+        self.codebooks: Optional[np.ndarray] = None  # (m, centroids, sub_dimension)
+
+    def train(self, sample: np.ndarray) -> None:
+        codebooks = np.zeros((self.m, self.centroids, self.sub_dimension), dtype=np.float32)
+        for j, sub_sample in enumerate(self._split(sample)):
+            trained = kmeans(sub_sample, self.centroids)
+            codebooks[j, : trained.shape[0]] = trained
+            # Fewer samples than centroids: repeat the first one (never the nearest twice)
+            codebooks[j, trained.shape[0]:] = trained[0]
+        self.codebooks = codebooks
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        codes = np.empty((vectors.shape[0], self.m), dtype=np.uint8)
+        for j, sub_vectors in enumerate(self._split(vectors)):
+            codes[:, j] = squared_distances(sub_vectors, self.codebooks[j]).argmin(axis=1)
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        parts = [self.codebooks[j][codes[:, j]] for j in range(self.m)]
+        return np.concatenate(parts, axis=1)
+
+    def scorer(self, query: np.ndarray) -> Scorer:
+        # table[j, c] = q_j . centroid_jc, then a vector's score is the sum of
+        # its m table entries
+        table = np.einsum("jcd,jd->jc", self.codebooks, query.reshape(self.m, self.sub_dimension))
+
+        def score(codes: np.ndarray) -> np.ndarray:
+            scores = np.zeros(codes.shape[0], dtype=np.float32)
+            for j in range(self.m):
+                scores += table[j].take(codes[:, j])
+            return scores
+        return _chunked(score)
+
+    def _split(self, vectors: np.ndarray) -> List[np.ndarray]:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        return [
+            vectors[:, j * self.sub_dimension:(j + 1) * self.sub_dimension]
+            for j in range(self.m)
+        ]
+
+
+def create_codec(quantization: str, dimension: int, pq_m: int = 16) -> VectorCodec:
+    """Untrained codec for a quantization type"""
+    if quantization == "sq8":
+        return ScalarQuantizer(dimension)
+    if quantization == "pq":
+        return ProductQuantizer(dimension, m=pq_m)
+    raise ValueError(f"Unknown quantization: {quantization}")
+
+
+class VectorFile:
+    """
+    Full-precision float32 vectors in a memory-mapped file on disk, used to
+    re-score the candidates of a quantized search exactly. Only the pages of
+    the rows that are read are brought into memory
+    """
+
+    def __init__(self, path: str, dimension: int, capacity: int = 1024):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.dimension = dimension
+        self.slots: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._vectors = self._open(capacity, "w+")
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __contains__(self, id: str) -> bool:
+        return id in self.slots
+
+    def put_many(self, ids: List[str], vectors: np.ndarray) -> None:
+        for id, vector in zip(ids, vectors):
+            slot = self.slots.get(id)
+            if slot is None:
+                slot = self._free.pop() if self._free else len(self.slots)
+                if slot >= self._vectors.shape[0]:
+                    self._grow(self._vectors.shape[0] * 2)
+                self.slots[id] = slot
+            self._vectors[slot] = vector
+
+    def get_many(self, ids: List[str]) -> np.ndarray:
+        """(len(ids), dim) vectors; every id must be stored"""
+        return self._vectors[[self.slots[id] for id in ids]]
+
+    def remove(self, id: str) -> None:
+        slot = self.slots.pop(id, None)
+        if slot is not None:
+            self._free.append(slot)
+
+    def _grow(self, capacity: int) -> None:
+        self._vectors.flush()
+        del self._vectors
+        with open(self.path, "r+b") as file:
+            file.truncate(capacity * self.dimension * 4)
+        self._vectors = self._open(capacity, "r+")
+
+    def _open(self, capacity: int, mode: str) -> np.memmap:
+        return np.memmap(self.path, dtype=np.float32, mode=mode, shape=(capacity, self.dimension))
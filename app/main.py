@@ -0,0 +1,24 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+
+from app.infrastructure.dependencies import (
+    get_keyword_index_loader,
+    get_settings,
+    get_vector_compaction_job,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Process-wide background work: started before the first request, stopped on shutdown"""
+    # In-memory keyword index - searches use vectors until it is reloaded
+    get_keyword_index_loader().start()
+    # Vectors of deleted documents and failed ingestions
+    compaction = get_vector_compaction_job()
+    compaction.start()
+    yield
+    await compaction.stop()
+
+
+settings = get_settings()
+app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan)
@@ -0,0 +1,93 @@
+# Micro-benchmark: legacy whitespace chunker vs the pluggable chunking engine
+#
+#   python -m benchmarks.chunking_benchmark [--size-mb 5] [--repeat 3]
+#
+# Reports wall time and peak Python memory (tracemalloc) per strategy.
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List
+
+from app.domain.chunking import FixedTokenChunker, RecursiveChunker
+
+
+def legacy_split_into_chunks(text: str, chunk_size: int = 1000) -> List[str]:
+    """The original Document.split_into_chunks implementation"""
+    words = text.split()
+    chunks = []
+    current_chunk = []
+    current_size = 0
+    for word in words:
+        current_chunk.append(word)
+        current_size += len(word) + 1
+
+        if current_size >= chunk_size:
+            chunks.append(" ".join(current_chunk))
+            current_chunk = []
+            current_size = 0
+
+    if current_chunk:
+        chunks.append(" ".join(current_chunk))
+
+    return chunks
+
+
+def make_text(size_bytes: int, seed: int = 0) -> str:
+    """Synthetic prose: words, sentences and paragraphs"""
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 11))) for _ in range(5000)]
+    parts = []
+    size = 0
+    while size < size_bytes:
+        sentence = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 24))) + ". "
+        if rng.random() < 0.15:
+            sentence += "\n\n"
+        parts.append(sentence)
+        size += len(sentence)
+    return "".join(parts)
+
+
+def measure(name: str, func: Callable[[], list], repeat: int) -> None:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    chunks = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<28} chunks={len(chunks):>7}  "
+        f"best={min(timings) * 1000:>9.1f} ms  "
+        f"peak_mem={peak / 1024 / 1024:>8.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chunking micro-benchmark")
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--overlap", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = make_text(int(args.size_mb * 1024 * 1024))
+    print(f"text: {len(text) / 1024 / 1024:.1f} MiB, chunk_size={args.chunk_size}, overlap={args.overlap}\n")
+
+    recursive = RecursiveChunker(chunk_size=args.chunk_size, chunk_overlap=args.overlap)
+    recursive_no_overlap = RecursiveChunker(chunk_size=args.chunk_size)
+    # ~6 characters per token in the synthetic text
+    fixed_token = FixedTokenChunker(chunk_size=args.chunk_size // 6, chunk_overlap=args.overlap // 6)
+
+    measure("legacy (whitespace)", lambda: legacy_split_into_chunks(text, args.chunk_size), args.repeat)
+    measure("recursive, no overlap", lambda: recursive_no_overlap.split(text), args.repeat)
+    measure("recursive, overlap", lambda: recursive.split(text), args.repeat)
+    measure("fixed_token, overlap", lambda: fixed_token.split(text), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Memory benchmark: per-chunk footprint of an Embedding
+#
+#   python -m benchmarks.embedding_memory [--chunks 20000] [--dimension 1536]
+#
+# Builds the embeddings of --chunks chunks from (batch, dim) float32 matrices,
+# the way the embedding services return them, and reports the memory retained
+# per chunk (tracemalloc) and the construction time for
+#   - the previous representation: .tolist() and a tuple of Python floats
+#   - the NumPy-backed Embedding (float32 and float16 row views)
+import argparse
+import time
+import tracemalloc
+from typing import Callable, List
+
+import numpy as np
+
+from app.domain.entities.embedding import Embedding
+
+
+def legacy_embeddings(matrix: np.ndarray, texts: List[str]) -> List[tuple]:
+    """What the services produced before: vector.tolist(), then tuple() in __post_init__"""
+    return [(tuple(vector.tolist()), "model", text) for vector, text in zip(matrix, texts)]
+
+
+def array_embeddings(dtype: str) -> Callable[[np.ndarray, List[str]], List[Embedding]]:
+    def build(matrix: np.ndarray, texts: List[str]) -> List[Embedding]:
+        matrix = matrix.astype(dtype, copy=False)
+        return [Embedding(vector=matrix[i], model="model", text=texts[i]) for i in range(len(texts))]
+    return build
+
+
+def measure(build, args: argparse.Namespace, texts: List[str]):
+    rng = np.random.default_rng(0)
+    tracemalloc.start()
+    elapsed = 0.0
+    kept = []
+    for i in range(args.chunks // args.batch_size):
+        # The batch matrix an embedding service returns; once it goes out of
+        # scope only what the embeddings keep alive is counted
+        matrix = rng.standard_normal((args.batch_size, args.dimension), dtype=np.float32)
+        started = time.perf_counter()
+        kept.extend(build(matrix, texts[i * args.batch_size:(i + 1) * args.batch_size]))
+        elapsed += time.perf_counter() - started
+    del matrix
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(kept), retained, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Embedding memory benchmark")
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+    args.chunks -= args.chunks % args.batch_size
+
+    # Chunk texts are shared by every variant, so they are not part of the footprint
+    texts = [f"chunk {i}" for i in range(args.chunks)]
+    variants = {
+        "tuple of floats (before)": legacy_embeddings,
+        "float32 array": array_embeddings("float32"),
+        "float16 array": array_embeddings("float16"),
+    }
+
+    print(f"{args.chunks} chunks x {args.dimension} dimensions\n")
+    print(f"{'representation':<26}{'bytes/chunk':>14}{'retained':>12}{'peak':>12}{'build':>10}")
+    baseline = None
+    for name, build in variants.items():
+        count, retained, peak, elapsed = measure(build, args, texts)
+        per_chunk = retained / count
+        baseline = baseline or per_chunk
+        print(
+            f"{name:<26}{per_chunk:>14,.0f}{retained / 2**20:>10.1f}MB{peak / 2**20:>10.1f}MB"
+            f"{elapsed:>9.2f}s   {baseline / per_chunk:.1f}x smaller"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# Recall / latency / memory of the LocalVectorStore quantization options
+#
+#   python -m benchmarks.quantization_benchmark [--vectors 50000] [--dimension 384] [--pq-m 48]
+#
+# Loads the same clustered synthetic vectors into a full-precision store and
+# into sq8 / pq stores (with and without exact re-ranking from the on-disk
+# float32 file), then reports recall@k against the exact results, query
+# latency percentiles and the memory held by the stored vectors/codes.
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.domain.entities.embedding import Embedding
+from app.infrastructure.vector_stores.local_vector_store import LocalVectorStore
+
+
+def make_vectors(
+    count: int,
+    args: argparse.Namespace,
+    rng: np.random.Generator,
+    projection: np.ndarray,
+    centres: np.ndarray
+) -> np.ndarray:
+    """
+    Clustered points in a low-dimensional latent space projected up to the
+    embedding dimension, plus a little isotropic noise - real embeddings are
+    neither uniform nor full rank
+    """
+    assignment = rng.integers(0, centres.shape[0], size=count)
+    latent = centres[assignment] + 0.5 * rng.standard_normal((count, centres.shape[1]), dtype=np.float32)
+    noise = 0.05 * rng.standard_normal((count, args.dimension), dtype=np.float32)
+    return latent @ projection + noise
+
+
+def stored_bytes(store: LocalVectorStore) -> int:
+    """Bytes of the in-memory vector / code matrices (allocated capacity)"""
+    return sum(
+        block.vectors.nbytes
+        for partition in store._partitions.values()
+        for block in partition.blocks()
+    )
+
+
+async def load(store: LocalVectorStore, vectors: np.ndarray, batch_size: int = 1000) -> float:
+    started = time.perf_counter()
+    for start in range(0, vectors.shape[0], batch_size):
+        await store.upsert_many([
+            {
+                "id": f"chunk_{i}",
+                "embedding": Embedding(vector=vectors[i], model="benchmark", text=""),
+                "metadata": {"user_id": "benchmark"},
+            }
+            for i in range(start, min(start + batch_size, vectors.shape[0]))
+        ])
+    # The quantizer trains in the background - measure the store once it is quantized
+    await store.train()
+    return time.perf_counter() - started
+
+
+async def run_queries(store: LocalVectorStore, queries: np.ndarray, k: int):
+    results: List[List[str]] = []
+    timings = []
+    for query in queries:
+        embedding = Embedding(vector=query, model="benchmark", text="")
+        started = time.perf_counter()
+        hits = await store.search(embedding, top_k=k, filter={"user_id": "benchmark"})
+        timings.append(time.perf_counter() - started)
+        results.append([hit["id"] for hit in hits])
+    return results, np.array(timings) * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Vector quantization benchmark")
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--intrinsic-dimension", type=int, default=64)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--pq-m", type=int, default=48)
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    projection = rng.standard_normal((args.intrinsic_dimension, args.dimension), dtype=np.float32)
+    projection /= np.sqrt(args.intrinsic_dimension)
+    centres = rng.standard_normal((args.clusters, args.intrinsic_dimension), dtype=np.float32)
+    vectors = make_vectors(args.vectors, args, rng, projection, centres)
+    queries = make_vectors(args.queries, args, rng, projection, centres)
+    train_size = min(args.vectors, 20000)
+
+    with tempfile.TemporaryDirectory() as directory:
+        variants: Dict[str, LocalVectorStore] = {
+            "float32": LocalVectorStore(),
+            "sq8": LocalVectorStore(quantization="sq8", quantization_train_size=train_size),
+            "sq8 + rerank": LocalVectorStore(
+                quantization="sq8", quantization_train_size=train_size,
+                rerank_path=os.path.join(directory, "sq8.f32"), rerank_factor=args.rerank_factor),
+            "pq": LocalVectorStore(
+                quantization="pq", pq_m=args.pq_m, quantization_train_size=train_size),
+            "pq + rerank": LocalVectorStore(
+                quantization="pq", pq_m=args.pq_m, quantization_train_size=train_size,
+                rerank_path=os.path.join(directory, "pq.f32"), rerank_factor=args.rerank_factor),
+        }
+
+        print(f"{args.vectors} vectors x {args.dimension} dimensions, {args.queries} queries, recall@{args.k}\n")
+        print(f"{'store':<16}{'load':>9}{'recall':>9}{'p50':>10}{'p95':>10}{'memory':>11}{'bytes/vec':>11}")
+
+        exact = None
+        for name, store in variants.items():
+            load_seconds = await load(store, vectors)
+            results, latencies = await run_queries(store, queries, args.k)
+            if exact is None:
+                exact = results
+
+            recall = np.mean([
+                len(set(found) & set(truth)) / len(truth)
+                for found, truth in zip(results, exact)
+            ])
+            p50, p95 = np.percentile(latencies, [50, 95])
+            memory = stored_bytes(store)
+            print(
+                f"{name:<16}{load_seconds:>8.1f}s{recall:>9.3f}{p50:>8.2f}ms{p95:>8.2f}ms"
+                f"{memory / 2**20:>9.1f}MB{store._codec.code_size * store._codec.code_dtype.itemsize:>11}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
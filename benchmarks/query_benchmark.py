@@ -0,0 +1,190 @@
+# Query benchmark for the hot repository lookups, without and with the
+# lookup indexes (migration b7d1e3f5a902)
+#
+#   python -m benchmarks.query_benchmark [--url sqlite+aiosqlite:///./storage/query_benchmark.sqlite3]
+#
+# Seeds users, documents, conversations and messages, then for every query
+# prints the plan (EXPLAIN QUERY PLAN on SQLite, EXPLAIN ANALYZE on PostgreSQL)
+# and the latency of the repository method, first with the indexes dropped and
+# then with them created. Point --url at a scratch database: tables are recreated.
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.infrastructure.database.models import Base, ChatMessage, Conversation, Document, User
+from app.infrastructure.repositories.conversation_repository import ConversationRepository
+from app.infrastructure.repositories.document_repository import DocumentRepository
+
+
+LOOKUP_INDEXES = [
+    index
+    for table in (Document.__table__, Conversation.__table__, ChatMessage.__table__)
+    for index in table.indexes
+]
+
+
+async def seed(engine: AsyncEngine, args: argparse.Namespace) -> None:
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+        await conn.execute(insert(User), [
+            {"id": user_id, "name": f"user {user_id}", "email": f"user{user_id}@example.com"}
+            for user_id in range(1, args.users + 1)
+        ])
+
+        documents = [
+            {
+                "user_id": rng.randint(1, args.users),
+                "filename": f"file_{i}.txt",
+                "content": "lorem ipsum " * 20,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(args.users * args.documents_per_user)
+        ]
+        for offset in range(0, len(documents), 5000):
+            await conn.execute(insert(Document), documents[offset:offset + 5000])
+
+        conversation_count = args.users * args.conversations_per_user
+        await conn.execute(insert(Conversation), [
+            {"id": i, "user_id": rng.randint(1, args.users), "title": f"conversation {i}",
+             "created_at": start + timedelta(seconds=i), "updated_at": start + timedelta(seconds=i)}
+            for i in range(1, conversation_count + 1)
+        ])
+
+        messages = [
+            {
+                "conversation_id": rng.randint(1, conversation_count),
+                "role": rng.choice(["user", "assistant"]),
+                "content": "message body " * 10,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(conversation_count * args.messages_per_conversation)
+        ]
+        for offset in range(0, len(messages), 5000):
+            await conn.execute(insert(ChatMessage), messages[offset:offset + 5000])
+
+
+async def set_indexes(engine: AsyncEngine, enabled: bool) -> None:
+    async with engine.begin() as conn:
+        for index in LOOKUP_INDEXES:
+            if enabled:
+                await conn.run_sync(lambda sync_conn: index.create(sync_conn, checkfirst=True))
+            else:
+                await conn.run_sync(lambda sync_conn: index.drop(sync_conn, checkfirst=True))
+        # Refresh planner statistics
+        await conn.execute(text("ANALYZE"))
+
+
+def query_plans(args: argparse.Namespace) -> Dict[str, object]:
+    """Statements equivalent to the benchmarked repository methods"""
+    user_id, conversation_id = 1, 1
+    return {
+        "documents.list_by_user": select(Document).where(Document.user_id == user_id)
+            .order_by(Document.created_at.desc(), Document.id.desc()).limit(50),
+        "documents.count_by_user": select(func.count(Document.id)).where(Document.user_id == user_id),
+        "documents.get_by_filename": select(Document).where(
+            Document.user_id == user_id, Document.filename == "file_1.txt"),
+        "conversations.list_by_user": select(Conversation).where(Conversation.user_id == user_id)
+            .order_by(Conversation.created_at.desc(), Conversation.id.desc()).limit(50),
+        "messages.get_messages": select(ChatMessage)
+            .where(ChatMessage.conversation_id == conversation_id)
+            .order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc()).limit(100),
+        "messages.get_recent_messages": select(ChatMessage)
+            .where(ChatMessage.conversation_id == conversation_id)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(50),
+    }
+
+
+def repository_calls(args: argparse.Namespace) -> Dict[str, Callable[..., Awaitable]]:
+    rng = random.Random(1)
+    users = lambda: str(rng.randint(1, args.users))
+    conversations = lambda: str(rng.randint(1, args.users * args.conversations_per_user))
+    return {
+        "documents.list_by_user": lambda session: DocumentRepository(session).list_by_user(users()),
+        "documents.count_by_user": lambda session: DocumentRepository(session).count_by_user(users()),
+        "documents.get_by_filename": lambda session: DocumentRepository(session).get_by_filename(
+            f"file_{rng.randint(0, args.users * args.documents_per_user - 1)}.txt", users()),
+        "conversations.list_by_user": lambda session: ConversationRepository(session).list_by_user(users()),
+        "messages.get_messages": lambda session: ConversationRepository(session).get_messages(conversations()),
+        "messages.get_recent_messages": lambda session: ConversationRepository(session).get_recent_messages(conversations()),
+    }
+
+
+async def explain(engine: AsyncEngine, statement) -> List[str]:
+    compiled = statement.compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN ANALYZE " if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text(prefix + str(compiled)))).all()
+    return [" ".join(str(value) for value in row) for row in rows]
+
+
+async def measure(engine: AsyncEngine, args: argparse.Namespace, label: str) -> Dict[str, Tuple[float, float]]:
+    print(f"\n=== {label} ===")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    plans = query_plans(args)
+    latencies: Dict[str, Tuple[float, float]] = {}
+
+    for name, call in repository_calls(args).items():
+        print(f"\n{name}")
+        for line in await explain(engine, plans[name]):
+            print(f"    {line}")
+
+        timings = []
+        async with session_factory() as session:
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                await call(session)
+                timings.append(time.perf_counter() - started)
+
+        p50, p95 = np.percentile(np.array(timings) * 1000, [50, 95])
+        latencies[name] = (p50, p95)
+        print(f"    p50={p50:.2f} ms  p95={p95:.2f} ms")
+
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Repository query benchmark")
+    parser.add_argument("--url", default="sqlite+aiosqlite:///./storage/query_benchmark.sqlite3")
+    # Defaults: 2.5k documents, 1k conversations, 50k messages
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--documents-per-user", type=int, default=50)
+    parser.add_argument("--conversations-per-user", type=int, default=20)
+    parser.add_argument("--messages-per-conversation", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.url)
+    try:
+        started = time.perf_counter()
+        await seed(engine, args)
+        conversations = args.users * args.conversations_per_user
+        print(f"seeded {args.users * args.documents_per_user} documents, {conversations} conversations and "
+              f"{conversations * args.messages_per_conversation} messages in {time.perf_counter() - started:.1f} s")
+
+        await set_indexes(engine, enabled=False)
+        before = await measure(engine, args, "without lookup indexes")
+        await set_indexes(engine, enabled=True)
+        after = await measure(engine, args, "with lookup indexes")
+
+        print(f"\n{'query':<32}{'p50 before':>12}{'p50 after':>12}{'speedup':>10}")
+        for name, (p50_before, _) in before.items():
+            p50_after = after[name][0]
+            print(f"{name:<32}{p50_before:>10.2f}ms{p50_after:>10.2f}ms{p50_before / p50_after:>9.1f}x")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
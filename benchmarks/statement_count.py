@@ -0,0 +1,90 @@
+# SQL statements (round-trips) per ConversationRepository operation
+#
+#   python -m benchmarks.statement_count [--url sqlite+aiosqlite://]
+#
+# Seeds one conversation with messages in a scratch database and counts the
+# statements each operation sends. COMMIT is not a cursor statement and is not counted.
+# Every operation must take a single statement - the script exits with status 1
+# when one takes more, so it can run as a regression check.
+import argparse
+import asyncio
+import sys
+from typing import Awaitable, Callable, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.domain.entities.chat_message import ChatMessage, MessageRole
+from app.domain.exceptions import ConversationNotFoundError
+from app.infrastructure.database.models import Base, ChatMessage as DBChatMessage, Conversation, User
+from app.infrastructure.database.statement_counter import count_statements
+from app.infrastructure.repositories.conversation_repository import ConversationRepository
+
+
+MISSING = "999999"
+# Statements allowed per operation
+EXPECTED_STATEMENTS = 1
+
+
+async def seed(engine, messages: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(User), [{"id": 1, "name": "user", "email": "user@example.com"}])
+        await conn.execute(insert(Conversation), [{"id": 1, "user_id": 1, "title": "benchmark"}])
+        await conn.execute(insert(DBChatMessage), [
+            {"conversation_id": 1, "role": "user", "content": f"message {i}"}
+            for i in range(messages)
+        ])
+
+
+def operations() -> List[Tuple[str, Callable[[ConversationRepository], Awaitable]]]:
+    message = lambda: ChatMessage(role=MessageRole.USER, content="hello")
+    return [
+        ("exists", lambda repo: repo.exists("1")),
+        ("add_message", lambda repo: repo.add_message("1", message())),
+        ("add_message (missing conversation)", lambda repo: repo.add_message(MISSING, message())),
+        ("get_messages", lambda repo: repo.get_messages("1", limit=20)),
+        ("get_messages (missing conversation)", lambda repo: repo.get_messages(MISSING)),
+        ("get_recent_messages", lambda repo: repo.get_recent_messages("1", limit=20)),
+    ]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Statements per conversation repository operation")
+    parser.add_argument("--url", default="sqlite+aiosqlite://")
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--verbose", action="store_true", help="print every statement")
+    args = parser.parse_args()
+
+    regressions = []
+    engine = create_async_engine(args.url)
+    try:
+        await seed(engine, args.messages)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        for name, operation in operations():
+            async with session_factory() as session:
+                with count_statements(engine) as counter:
+                    try:
+                        await operation(ConversationRepository(session))
+                    except ConversationNotFoundError:
+                        pass
+            status = "ok" if counter.count <= EXPECTED_STATEMENTS else f"expected {EXPECTED_STATEMENTS}"
+            print(f"{name:<40} statements={counter.count}  {status}")
+            if counter.count > EXPECTED_STATEMENTS:
+                regressions.append(name)
+            if args.verbose:
+                for statement in counter.statements:
+                    print("    " + " ".join(statement.split()))
+    finally:
+        await engine.dispose()
+
+    if regressions:
+        print(f"\n{len(regressions)} operation(s) take more than {EXPECTED_STATEMENTS} statement: "
+              + ", ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())